@@ -3,6 +3,7 @@ Application configuration settings
 """
 
 from pydantic_settings import BaseSettings
+from pathlib import Path
 from typing import List
 import os
 
@@ -31,6 +32,18 @@ class Settings(BaseSettings):
     ALLOWED_EXTENSIONS: List[str] = ["jpg", "jpeg", "png", "webp"]
     IMAGE_SIZE: tuple = (224, 224)
     
+    # Catalog live reload
+    CATALOG_RELOAD_ENABLED: bool = True
+    CATALOG_RELOAD_INTERVAL: float = 2.0  # seconds between file checks
+    
+    # Catalog response cache
+    RESPONSE_CACHE_MAX_ENTRIES: int = 512
+    RESPONSE_CACHE_MAX_AGE: int = 3600  # seconds, sent as Cache-Control max-age
+    
+    # Delta sync change log, persisted so client tokens survive restarts
+    # Anchored to the repo data dir so it does not follow the working directory
+    SYNC_LOG_PATH: str = str(Path(__file__).parent.parent.parent / "data" / "sync_log.json")
+    
     # Supabase Settings (optional)
     SUPABASE_URL: str = ""
     SUPABASE_KEY: str = ""
@@ -0,0 +1,200 @@
+"""
+Static API Snapshot Exporter
+Renders every catalog response into precompressed static JSON files
+
+Usage (from the backend directory):
+    python -m app.export_snapshot --output ../frontend/public/api-snapshot
+
+Breed, state, scheme, comparison and ranking responses are pure functions
+of breed_info.json, so they can be served from any static file server or
+bundled into the frontend. manifest.json maps each API route to its file.
+"""
+
+import argparse
+import json
+import re
+import shutil
+import sys
+from datetime import datetime, timezone
+from itertools import product
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlencode
+
+from app.services.catalog_service import ANIMAL_TYPES, BreedCatalog
+from app.services.breed_parsing import NUMERIC_FIELDS
+from app.services.response_cache import CachedResponse
+from app.routers.breeds import (
+    breed_list_payload,
+    government_schemes_payload,
+    state_breeds_payload,
+    states_payload,
+)
+from app.routers.compare import comparison_presets_payload, sustainability_ranking_payload
+
+API_PREFIX = "/api/v1"
+DEFAULT_DATA_PATH = Path(__file__).parent.parent.parent / "data" / "breed_info.json"
+
+# (route, relative file path without extension, payload builder)
+Entry = Tuple[str, str, Callable[[], Any]]
+
+
+def _slug(value: str) -> str:
+    """File-system safe name for a state or breed label"""
+    return re.sub(r"[^a-z0-9]+", "-", value.casefold()).strip("-")
+
+
+def _route(path: str, **params: Any) -> str:
+    query = urlencode({k: v for k, v in params.items() if v is not None})
+    return f"{API_PREFIX}{path}" + (f"?{query}" if query else "")
+
+
+def iter_entries(catalog: BreedCatalog) -> Iterator[Entry]:
+    """Every static catalog response as (route, file stem, builder)"""
+    yield _route("/breeds"), "breeds", lambda: breed_list_payload(catalog)
+    for atype in ANIMAL_TYPES:
+        yield (
+            _route("/breeds", animal_type=atype),
+            f"breeds/type/{atype}",
+            lambda atype=atype: breed_list_payload(catalog, animal_type=atype)
+        )
+
+    for record in catalog:
+        yield _route(f"/breeds/{record.id}"), f"breeds/{record.id}", record.detail
+
+    for state in catalog.state_mapping:
+        yield (
+            _route(f"/breeds/state/{state}"),
+            f"breeds/state/{_slug(state)}",
+            lambda state=state: state_breeds_payload(catalog, state)
+        )
+
+    yield _route("/states"), "states", lambda: states_payload(catalog)
+    yield _route("/government-schemes"), "government-schemes", lambda: government_schemes_payload(catalog)
+
+    # Complete rankings; clients slice them instead of passing limit
+    for atype, sort_by in product((None,) + ANIMAL_TYPES, NUMERIC_FIELDS):
+        stem = "sustainability-ranking/" + (atype or "all") + f"/{sort_by}"
+        yield (
+            _route("/sustainability-ranking", animal_type=atype, sort_by=sort_by, limit=len(catalog)),
+            stem,
+            lambda atype=atype, sort_by=sort_by: sustainability_ranking_payload(
+                catalog, atype, len(catalog), sort_by
+            )
+        )
+
+    yield _route("/compare/presets"), "compare/presets", lambda: comparison_presets_payload(catalog)
+    for preset_id, preset in catalog.comparisons.presets.items():
+        yield _route(f"/compare/presets/{preset_id}"), f"compare/presets/{preset_id}", lambda preset=preset: preset
+
+    for first, second in product(catalog.records, repeat=2):
+        if first.id == second.id:
+            continue
+        yield (
+            _route("/compare", breed1=first.id, breed2=second.id),
+            f"compare/{first.id}/{second.id}",
+            lambda a=first.id, b=second.id: catalog.comparisons.pair(a, b)
+        )
+
+
+class SnapshotError(ValueError):
+    """Raised when the output path cannot safely receive a snapshot"""
+
+
+def export_snapshot(catalog: BreedCatalog, output: Path, force: bool = False) -> Dict[str, Any]:
+    """
+    Write the snapshot into output and return its manifest
+
+    Files are rendered into a sibling staging directory that replaces
+    output only once complete, so a static server never sees half a snapshot.
+    An existing output is replaced only if it holds a previous snapshot
+    (a manifest.json), unless force is set.
+    """
+    if output.exists() and not force:
+        if not output.is_dir() or not (output / "manifest.json").is_file():
+            raise SnapshotError(
+                f"{output} exists and is not a previous snapshot (no manifest.json); "
+                "pass --force to replace it"
+            )
+
+    staging = output.with_name(output.name + ".staging")
+    if staging.exists():
+        shutil.rmtree(staging)
+    staging.mkdir(parents=True)
+
+    files: Dict[str, Dict[str, Any]] = {}
+    for route, stem, build in iter_entries(catalog):
+        cached = CachedResponse.from_content(build())
+        target = staging / f"{stem}.json"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(cached.body)
+
+        encodings: Dict[str, int] = {}
+        for encoding, body, suffix in (("gzip", cached.gzip_body, ".gz"), ("br", cached.br_body, ".br")):
+            if body is not None:
+                target.with_name(target.name + suffix).write_bytes(body)
+                encodings[encoding] = len(body)
+
+        files[route] = {
+            "path": f"{stem}.json",
+            "etag": cached.etag,
+            "bytes": len(cached.body),
+            "encodings": encodings
+        }
+
+    manifest = {
+        "catalog_version": catalog.version,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "breeds": len(catalog),
+        "files": files
+    }
+    (staging / "manifest.json").write_text(
+        json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8"
+    )
+
+    if output.exists():
+        retired = output.with_name(output.name + ".old")
+        if retired.exists():
+            shutil.rmtree(retired)
+        output.rename(retired)
+        staging.rename(output)
+        shutil.rmtree(retired)
+    else:
+        staging.rename(output)
+    return manifest
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export catalog API responses as static JSON files")
+    parser.add_argument("--data", type=Path, default=DEFAULT_DATA_PATH, help="Path to breed_info.json")
+    parser.add_argument("--output", type=Path, required=True, help="Snapshot directory to (re)create")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Replace --output even if it does not hold a previous snapshot"
+    )
+    args = parser.parse_args(argv)
+
+    if not args.data.exists():
+        print(f"Breed data file not found: {args.data}")
+        return 1
+
+    catalog = BreedCatalog.from_file(args.data)
+    try:
+        manifest = export_snapshot(catalog, args.output, force=args.force)
+    except SnapshotError as e:
+        print(e)
+        return 1
+
+    files = manifest["files"].values()
+    raw = sum(f["bytes"] for f in files)
+    gzipped = sum(f["encodings"].get("gzip", f["bytes"]) for f in files)
+    print(
+        f"Exported {len(manifest['files'])} responses for catalog {catalog.version} "
+        f"to {args.output} ({raw / 1024:.0f} KiB, {gzipped / 1024:.0f} KiB gzipped)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
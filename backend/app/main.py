@@ -15,8 +15,12 @@ import json
 import os
 from pathlib import Path
 
-from app.routers import predict, breeds, compare
+from app.routers import predict, breeds, compare, query, search, recommend, geo, sync
 from app.services.model_service import ModelService
+from app.services.catalog_service import BreedCatalog
+from app.services.response_cache import ResponseCache
+from app.services.catalog_watcher import CatalogWatcher
+from app.services.sync_log import SyncLog
 from app.config import settings
 
 # Initialize FastAPI app
@@ -51,6 +55,11 @@ app.add_middleware(
 app.include_router(predict.router, prefix="/api/v1", tags=["Prediction"])
 app.include_router(breeds.router, prefix="/api/v1", tags=["Breeds"])
 app.include_router(compare.router, prefix="/api/v1", tags=["Comparison"])
+app.include_router(query.router, prefix="/api/v1", tags=["Query"])
+app.include_router(search.router, prefix="/api/v1", tags=["Search"])
+app.include_router(recommend.router, prefix="/api/v1", tags=["Recommendations"])
+app.include_router(geo.router, prefix="/api/v1", tags=["Geo"])
+app.include_router(sync.router, prefix="/api/v1", tags=["Sync"])
 
 # Load breed data
 DATA_PATH = Path(__file__).parent.parent.parent / "data" / "breed_info.json"
@@ -60,14 +69,26 @@ async def startup_event():
     """Initialize services on startup"""
     print("Starting Indian Breed Recognition API...")
     
-    # Load breed metadata
+    # Load breed metadata and build the indexed catalog
     if DATA_PATH.exists():
-        with open(DATA_PATH, "r", encoding="utf-8") as f:
-            app.state.breed_data = json.load(f)
-        print("Breed metadata loaded")
+        app.state.catalog = BreedCatalog.from_file(DATA_PATH)
+        print(f"Breed metadata loaded ({len(app.state.catalog)} breeds)")
     else:
         print("Breed metadata file not found")
-        app.state.breed_data = {}
+        app.state.catalog = BreedCatalog({})
+    
+    # Encoded catalog responses, keyed by catalog version
+    app.state.response_cache = ResponseCache()
+    
+    # Per-record change log for delta sync clients
+    app.state.sync_log = SyncLog(Path(settings.SYNC_LOG_PATH))
+    changed = app.state.sync_log.update(app.state.catalog)
+    print(f"Sync log at {app.state.sync_log.token} ({changed} records changed)")
+    
+    # Pick up edits to breed_info.json without a restart
+    if settings.CATALOG_RELOAD_ENABLED:
+        app.state.catalog_watcher = CatalogWatcher(app, DATA_PATH, settings.CATALOG_RELOAD_INTERVAL)
+        app.state.catalog_watcher.start()
     
     # Initialize ML model service (lazy loading)
     app.state.model_service = ModelService()
@@ -77,6 +98,10 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown"""
     print("Shutting down API...")
+    
+    watcher = getattr(app.state, "catalog_watcher", None)
+    if watcher is not None:
+        await watcher.stop()
 
 @app.get("/", tags=["Health"])
 async def root():
@@ -89,7 +114,12 @@ async def root():
             "docs": "/docs",
             "predict": "/api/v1/predict",
             "breeds": "/api/v1/breeds",
-            "compare": "/api/v1/compare"
+            "compare": "/api/v1/compare",
+            "query": "/api/v1/breeds/query",
+            "search": "/api/v1/search",
+            "recommendations": "/api/v1/recommendations",
+            "geo": "/api/v1/geo/nearby",
+            "sync": "/api/v1/sync"
         }
     }
 
@@ -99,7 +129,8 @@ async def health_check():
     return {
         "status": "healthy",
         "model_loaded": hasattr(app.state, 'model_service') and app.state.model_service.is_loaded,
-        "breed_data_loaded": hasattr(app.state, 'breed_data') and bool(app.state.breed_data)
+        "breed_data_loaded": hasattr(app.state, 'catalog') and len(app.state.catalog) > 0,
+        "catalog_version": app.state.catalog.version if hasattr(app.state, 'catalog') else None
     }
 
 # Error handlers
@@ -1,4 +1,4 @@
 # Router exports
-from app.routers import predict, breeds, compare
+from app.routers import predict, breeds, compare, query, search, recommend, geo, sync
 
-__all__ = ["predict", "breeds", "compare"]
+__all__ = ["predict", "breeds", "compare", "query", "search", "recommend", "geo", "sync"]
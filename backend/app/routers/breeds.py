@@ -3,10 +3,13 @@ Breeds API Router
 Handles breed information and metadata
 """
 
-from fastapi import APIRouter, HTTPException, Request, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Query
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 
+from app.services.catalog_service import ANIMAL_TYPES, BreedCatalog, get_catalog
+from app.services.response_cache import ResponseCache, get_response_cache
+
 router = APIRouter()
 
 class BreedSummary(BaseModel):
@@ -24,12 +27,35 @@ class BreedDetail(BaseModel):
     id: str
     data: Dict[str, Any]
 
+def breed_list_payload(
+    catalog: BreedCatalog,
+    animal_type: Optional[str] = None,
+    state: Optional[str] = None,
+    conservation_status: Optional[str] = None
+) -> Dict[str, Any]:
+    """Response body for /breeds"""
+    results = [
+        record.summary
+        for record in catalog.filter(
+            animal_type=animal_type,
+            state=state,
+            conservation_status=conservation_status
+        )
+    ]
+    
+    return {
+        "total": len(results),
+        "breeds": results
+    }
+
 @router.get("/breeds")
 async def list_breeds(
     request: Request,
     animal_type: Optional[str] = Query(None, description="Filter by animal type: cattle or buffalo"),
     state: Optional[str] = Query(None, description="Filter by native state"),
-    conservation_status: Optional[str] = Query(None, description="Filter by conservation status")
+    conservation_status: Optional[str] = Query(None, description="Filter by conservation status"),
+    catalog: BreedCatalog = Depends(get_catalog),
+    cache: ResponseCache = Depends(get_response_cache)
 ):
     """
     List all breeds with optional filtering
@@ -38,159 +64,76 @@ async def list_breeds(
     - **state**: Filter by native state name
     - **conservation_status**: Filter by status (e.g., 'Endangered', 'Vulnerable')
     """
-    if not hasattr(request.app.state, 'breed_data'):
-        raise HTTPException(status_code=500, detail="Breed data not loaded")
-    
-    breed_data = request.app.state.breed_data
-    results = []
-    
-    # Determine which animal types to include
-    animal_types = []
     if animal_type:
-        if animal_type.lower() not in ["cattle", "buffalo"]:
+        if animal_type.lower() not in ANIMAL_TYPES:
             raise HTTPException(status_code=400, detail="animal_type must be 'cattle' or 'buffalo'")
-        animal_types = [animal_type.lower()]
-    else:
-        animal_types = ["cattle", "buffalo"]
+        animal_type = animal_type.lower()
     
-    # Iterate through breeds
-    for atype in animal_types:
-        if atype not in breed_data:
-            continue
-            
-        for breed_id, breed_info in breed_data[atype].items():
-            # Apply filters
-            if state:
-                native_states = breed_info.get("nativeState", [])
-                if state not in native_states:
-                    continue
-            
-            if conservation_status:
-                breed_status = breed_info.get("population", {}).get("conservationStatus", "")
-                if conservation_status.lower() not in breed_status.lower():
-                    continue
-            
-            results.append({
-                "id": breed_id,
-                "name": breed_info.get("name", breed_id),
-                "name_hindi": breed_info.get("nameHindi", ""),
-                "type": atype,
-                "native_states": breed_info.get("nativeState", []),
-                "milk_yield": breed_info.get("productivity", {}).get("milkYieldPerDay", "N/A"),
-                "conservation_status": breed_info.get("population", {}).get("conservationStatus", "Unknown"),
-                "carbon_score": breed_info.get("sustainability", {}).get("carbonScore", 0),
-                "image": breed_info.get("image", "")
-            })
+    # Filters are case-insensitive, so fold them into the cache key
+    state = state.strip().casefold() if state else None
+    conservation_status = conservation_status.strip().casefold() if conservation_status else None
     
-    return {
-        "total": len(results),
-        "breeds": results
-    }
+    return cache.respond(
+        request,
+        (catalog.version, "breeds", animal_type, state, conservation_status),
+        lambda: breed_list_payload(catalog, animal_type, state, conservation_status)
+    )
 
 @router.get("/breeds/{breed_id}")
 async def get_breed(
-    request: Request,
-    breed_id: str
+    breed_id: str,
+    catalog: BreedCatalog = Depends(get_catalog)
 ):
     """
     Get detailed information about a specific breed
     
-    - **breed_id**: Breed identifier (e.g., 'gir', 'murrah')
+    - **breed_id**: Breed identifier (e.g., 'gir', 'murrah'); English or Hindi names also resolve
     """
-    if not hasattr(request.app.state, 'breed_data'):
-        raise HTTPException(status_code=500, detail="Breed data not loaded")
+    record = catalog.resolve(breed_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Breed '{breed_id}' not found")
     
-    breed_data = request.app.state.breed_data
-    
-    # Search in both cattle and buffalo
-    for animal_type in ["cattle", "buffalo"]:
-        if animal_type in breed_data and breed_id in breed_data[animal_type]:
-            return {
-                "id": breed_id,
-                "animal_type": animal_type,
-                "data": breed_data[animal_type][breed_id]
-            }
-    
-    raise HTTPException(status_code=404, detail=f"Breed '{breed_id}' not found")
+    return record.detail()
 
 @router.get("/breeds/state/{state_name}")
 async def get_breeds_by_state(
-    request: Request,
-    state_name: str
+    state_name: str,
+    catalog: BreedCatalog = Depends(get_catalog)
 ):
     """
     Get all breeds native to a specific state
     
     - **state_name**: Indian state name (e.g., 'Gujarat', 'Punjab')
     """
-    if not hasattr(request.app.state, 'breed_data'):
-        raise HTTPException(status_code=500, detail="Breed data not loaded")
-    
-    breed_data = request.app.state.breed_data
-    
-    # Check state mapping
-    state_mapping = breed_data.get("stateBreedMapping", {})
-    
     # Find exact or partial match
-    matching_state = None
-    for state in state_mapping.keys():
-        if state.lower() == state_name.lower():
-            matching_state = state
-            break
-    
-    if not matching_state:
-        # Try partial match
-        for state in state_mapping.keys():
-            if state_name.lower() in state.lower():
-                matching_state = state
-                break
+    matching_state = catalog.match_state(state_name)
     
     if not matching_state:
         raise HTTPException(
             status_code=404,
-            detail=f"State '{state_name}' not found. Available states: {list(state_mapping.keys())}"
+            detail=f"State '{state_name}' not found. Available states: {list(catalog.state_mapping.keys())}"
         )
     
-    breed_ids = state_mapping.get(matching_state, [])
-    results = []
-    
-    for breed_id in breed_ids:
-        for animal_type in ["cattle", "buffalo"]:
-            if animal_type in breed_data and breed_id in breed_data[animal_type]:
-                breed_info = breed_data[animal_type][breed_id]
-                results.append({
-                    "id": breed_id,
-                    "name": breed_info.get("name", breed_id),
-                    "name_hindi": breed_info.get("nameHindi", ""),
-                    "type": animal_type,
-                    "milk_yield": breed_info.get("productivity", {}).get("milkYieldPerDay", "N/A"),
-                    "conservation_status": breed_info.get("population", {}).get("conservationStatus", "Unknown")
-                })
-                break
+    return state_breeds_payload(catalog, matching_state)
+
+def state_breeds_payload(catalog: BreedCatalog, state: str) -> Dict[str, Any]:
+    """Response body for /breeds/state/{state_name} once the state is resolved"""
+    results = [record.state_summary for record in catalog.state_breeds(state)]
     
     return {
-        "state": matching_state,
+        "state": state,
         "total": len(results),
         "breeds": results
     }
 
-@router.get("/states")
-async def list_states(request: Request):
-    """
-    Get all Indian states with their native breeds
-    """
-    if not hasattr(request.app.state, 'breed_data'):
-        raise HTTPException(status_code=500, detail="Breed data not loaded")
-    
-    breed_data = request.app.state.breed_data
-    state_mapping = breed_data.get("stateBreedMapping", {})
-    
+def states_payload(catalog: BreedCatalog) -> Dict[str, Any]:
+    """Response body for /states"""
     results = []
-    for state, breed_ids in state_mapping.items():
+    for state, breed_ids in catalog.state_mapping.items():
         results.append({
             "state": state,
             "breed_count": len(breed_ids),
-            "breed_ids": breed_ids
+            "breed_ids": list(breed_ids)
         })
     
     return {
@@ -198,19 +141,21 @@ async def list_states(request: Request):
         "states": sorted(results, key=lambda x: x["state"])
     }
 
-@router.get("/government-schemes")
-async def list_government_schemes(request: Request):
+@router.get("/states")
+async def list_states(
+    request: Request,
+    catalog: BreedCatalog = Depends(get_catalog),
+    cache: ResponseCache = Depends(get_response_cache)
+):
     """
-    Get all government schemes for cattle and buffalo farmers
+    Get all Indian states with their native breeds
     """
-    if not hasattr(request.app.state, 'breed_data'):
-        raise HTTPException(status_code=500, detail="Breed data not loaded")
-    
-    breed_data = request.app.state.breed_data
-    schemes = breed_data.get("governmentSchemes", {})
-    
+    return cache.respond(request, (catalog.version, "states"), lambda: states_payload(catalog))
+
+def government_schemes_payload(catalog: BreedCatalog) -> Dict[str, Any]:
+    """Response body for /government-schemes"""
     results = []
-    for scheme_id, scheme_info in schemes.items():
+    for scheme_id, scheme_info in catalog.schemes.items():
         results.append({
             "id": scheme_id,
             "name": scheme_info.get("name", ""),
@@ -225,3 +170,18 @@ async def list_government_schemes(request: Request):
         "total": len(results),
         "schemes": results
     }
+
+@router.get("/government-schemes")
+async def list_government_schemes(
+    request: Request,
+    catalog: BreedCatalog = Depends(get_catalog),
+    cache: ResponseCache = Depends(get_response_cache)
+):
+    """
+    Get all government schemes for cattle and buffalo farmers
+    """
+    return cache.respond(
+        request,
+        (catalog.version, "government-schemes"),
+        lambda: government_schemes_payload(catalog)
+    )
@@ -3,10 +3,14 @@ Comparison API Router
 Handles breed comparison functionality
 """
 
-from fastapi import APIRouter, HTTPException, Request, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Query
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 
+from app.services.catalog_service import BreedCatalog, get_catalog
+from app.services.response_cache import ResponseCache, get_response_cache
+from app.services.breed_parsing import NUMERIC_FIELDS
+
 router = APIRouter()
 
 class ComparisonResult(BaseModel):
@@ -19,7 +23,9 @@ class ComparisonResult(BaseModel):
 async def compare_breeds(
     request: Request,
     breed1: str = Query(..., description="First breed ID"),
-    breed2: str = Query(..., description="Second breed ID")
+    breed2: str = Query(..., description="Second breed ID"),
+    catalog: BreedCatalog = Depends(get_catalog),
+    cache: ResponseCache = Depends(get_response_cache)
 ):
     """
     Compare two breeds side by side
@@ -29,104 +35,32 @@ async def compare_breeds(
     - Sustainability scores
     - Economic factors
     - Climate adaptability
-    """
-    if not hasattr(request.app.state, 'breed_data'):
-        raise HTTPException(status_code=500, detail="Breed data not loaded")
-    
-    breed_data = request.app.state.breed_data
+    - Per-attribute deltas and category winners
     
+    Every pair is precomputed when the catalog loads.
+    """
     # Find both breeds
-    def find_breed(breed_id: str):
-        for animal_type in ["cattle", "buffalo"]:
-            if animal_type in breed_data and breed_id in breed_data[animal_type]:
-                return {
-                    "id": breed_id,
-                    "animal_type": animal_type,
-                    "data": breed_data[animal_type][breed_id]
-                }
-        return None
-    
-    breed1_data = find_breed(breed1)
-    breed2_data = find_breed(breed2)
-    
-    if not breed1_data:
+    if not catalog.get(breed1):
         raise HTTPException(status_code=404, detail=f"Breed '{breed1}' not found")
-    if not breed2_data:
+    if not catalog.get(breed2):
         raise HTTPException(status_code=404, detail=f"Breed '{breed2}' not found")
     
-    # Extract comparison data
-    def extract_metrics(breed_info: dict) -> dict:
-        data = breed_info["data"]
-        return {
-            "id": breed_info["id"],
-            "name": data.get("name", ""),
-            "name_hindi": data.get("nameHindi", ""),
-            "type": breed_info["animal_type"],
-            "native_states": data.get("nativeState", []),
-            "productivity": {
-                "milk_yield_per_day": data.get("productivity", {}).get("milkYieldPerDay", "N/A"),
-                "lactation_yield": data.get("productivity", {}).get("lactationYield", "N/A"),
-                "fat_content": data.get("productivity", {}).get("fatContent", "N/A"),
-                "lactation_period": data.get("productivity", {}).get("lactationPeriod", "N/A")
-            },
-            "sustainability": {
-                "carbon_score": data.get("sustainability", {}).get("carbonScore", 0),
-                "carbon_footprint": data.get("sustainability", {}).get("carbonFootprint", "Unknown"),
-                "heat_tolerance": data.get("sustainability", {}).get("heatTolerance", "Unknown"),
-                "disease_resistance": data.get("sustainability", {}).get("diseaseResistance", "Unknown"),
-                "feed_efficiency": data.get("sustainability", {}).get("feedEfficiency", "Unknown"),
-                "climate_adaptability": data.get("sustainability", {}).get("climateAdaptability", "Unknown")
-            },
-            "economic": {
-                "purchase_cost": data.get("economicValue", {}).get("purchaseCost", "N/A"),
-                "maintenance_cost": data.get("economicValue", {}).get("maintenanceCost", "N/A"),
-                "market_demand": data.get("economicValue", {}).get("marketDemand", "Unknown")
-            },
-            "population": {
-                "status": data.get("population", {}).get("status", "Unknown"),
-                "trend": data.get("population", {}).get("trend", "unknown"),
-                "conservation_status": data.get("population", {}).get("conservationStatus", "Unknown")
-            },
-            "best_for": data.get("bestFor", []),
-            "government_schemes": data.get("governmentSchemes", [])
-        }
-    
-    breed1_metrics = extract_metrics(breed1_data)
-    breed2_metrics = extract_metrics(breed2_data)
-    
-    # Calculate comparison insights
-    comparison_metrics = {
-        "carbon_score_difference": breed1_metrics["sustainability"]["carbon_score"] - breed2_metrics["sustainability"]["carbon_score"],
-        "better_carbon_score": breed1 if breed1_metrics["sustainability"]["carbon_score"] > breed2_metrics["sustainability"]["carbon_score"] else breed2,
-        "same_animal_type": breed1_data["animal_type"] == breed2_data["animal_type"]
-    }
-    
-    # Generate recommendation
-    recommendation = None
-    if breed1_metrics["sustainability"]["carbon_score"] > breed2_metrics["sustainability"]["carbon_score"]:
-        recommendation = f"{breed1_metrics['name']} has better sustainability score ({breed1_metrics['sustainability']['carbon_score']} vs {breed2_metrics['sustainability']['carbon_score']})"
-    else:
-        recommendation = f"{breed2_metrics['name']} has better sustainability score ({breed2_metrics['sustainability']['carbon_score']} vs {breed1_metrics['sustainability']['carbon_score']})"
-    
-    return {
-        "breeds": [breed1_metrics, breed2_metrics],
-        "comparison_metrics": comparison_metrics,
-        "recommendation": recommendation
-    }
+    return cache.respond(
+        request,
+        (catalog.version, "compare", breed1, breed2),
+        lambda: catalog.comparisons.pair(breed1, breed2)
+    )
 
 @router.get("/compare/multi")
 async def compare_multiple_breeds(
-    request: Request,
-    breeds: str = Query(..., description="Comma-separated breed IDs (max 4)")
+    breeds: str = Query(..., description="Comma-separated breed IDs (max 4)"),
+    catalog: BreedCatalog = Depends(get_catalog)
 ):
     """
     Compare multiple breeds (up to 4)
     
     - **breeds**: Comma-separated breed IDs (e.g., 'gir,sahiwal,murrah')
     """
-    if not hasattr(request.app.state, 'breed_data'):
-        raise HTTPException(status_code=500, detail="Breed data not loaded")
-    
     breed_ids = [b.strip() for b in breeds.split(",")]
     
     if len(breed_ids) < 2:
@@ -134,86 +68,114 @@ async def compare_multiple_breeds(
     if len(breed_ids) > 4:
         raise HTTPException(status_code=400, detail="Maximum 4 breeds allowed for comparison")
     
-    breed_data = request.app.state.breed_data
-    
-    def find_breed(breed_id: str):
-        for animal_type in ["cattle", "buffalo"]:
-            if animal_type in breed_data and breed_id in breed_data[animal_type]:
-                return {
-                    "id": breed_id,
-                    "animal_type": animal_type,
-                    "data": breed_data[animal_type][breed_id]
-                }
-        return None
-    
-    results = []
     for breed_id in breed_ids:
-        breed_info = find_breed(breed_id)
-        if not breed_info:
+        if not catalog.get(breed_id):
             raise HTTPException(status_code=404, detail=f"Breed '{breed_id}' not found")
-        
-        data = breed_info["data"]
-        results.append({
-            "id": breed_id,
-            "name": data.get("name", ""),
-            "type": breed_info["animal_type"],
-            "milk_yield": data.get("productivity", {}).get("milkYieldPerDay", "N/A"),
-            "carbon_score": data.get("sustainability", {}).get("carbonScore", 0),
-            "purchase_cost": data.get("economicValue", {}).get("purchaseCost", "N/A"),
-            "conservation_status": data.get("population", {}).get("conservationStatus", "Unknown"),
-            "heat_tolerance": data.get("sustainability", {}).get("heatTolerance", "Unknown")
-        })
-    
-    # Find best in each category
-    best_carbon = max(results, key=lambda x: x["carbon_score"])
     
+    return catalog.comparisons.compare_many(breed_ids)
+
+def comparison_presets_payload(catalog: BreedCatalog) -> Dict[str, Any]:
+    """Response body for /compare/presets"""
     return {
-        "breeds": results,
-        "insights": {
-            "best_sustainability": best_carbon["name"],
-            "total_compared": len(results)
+        "presets": [
+            {
+                "id": preset["id"],
+                "name": preset["name"],
+                "breeds": [row["id"] for row in preset["breeds"]]
+            }
+            for preset in catalog.comparisons.presets.values()
+        ]
+    }
+
+@router.get("/compare/presets")
+async def list_comparison_presets(catalog: BreedCatalog = Depends(get_catalog)):
+    """
+    Quick comparison groups (e.g. 'Best for Dairy') and their breeds
+    """
+    return comparison_presets_payload(catalog)
+
+@router.get("/compare/presets/{preset_id}")
+async def get_comparison_preset(
+    request: Request,
+    preset_id: str,
+    catalog: BreedCatalog = Depends(get_catalog),
+    cache: ResponseCache = Depends(get_response_cache)
+):
+    """
+    Precomputed multi-breed comparison for a quick preset
+    
+    - **preset_id**: 'dairy', 'sustainable', 'budget' or 'heat'
+    """
+    preset = catalog.comparisons.presets.get(preset_id)
+    if preset is None:
+        raise HTTPException(status_code=404, detail=f"Comparison preset '{preset_id}' not found")
+    
+    return cache.respond(
+        request,
+        (catalog.version, "compare-preset", preset_id),
+        lambda: preset
+    )
+
+def sustainability_ranking_payload(
+    catalog: BreedCatalog,
+    animal_type: Optional[str] = None,
+    limit: int = 10,
+    sort_by: str = "carbon_score",
+    descending: bool = True
+) -> Dict[str, Any]:
+    """Response body for /sustainability-ranking"""
+    ranked = catalog.ranked(sort_by, animal_type, descending)
+    
+    results = []
+    for record in ranked[:limit]:
+        sustainability = record.data.get("sustainability", {})
+        row = {
+            "id": record.id,
+            "name": record.name,
+            "type": record.animal_type,
+            "carbon_score": sustainability.get("carbonScore", 0),
+            "carbon_footprint": sustainability.get("carbonFootprint", "Unknown"),
+            "feed_efficiency": sustainability.get("feedEfficiency", "Unknown")
         }
+        if sort_by != "carbon_score":
+            row[sort_by] = catalog.numeric.values(record.id)[sort_by]
+        results.append(row)
+    
+    return {
+        "ranking": results,
+        "total": len(ranked),
+        "sort_by": sort_by
     }
 
 @router.get("/sustainability-ranking")
 async def get_sustainability_ranking(
     request: Request,
     animal_type: Optional[str] = Query(None, description="Filter by animal type"),
-    limit: int = Query(10, description="Number of results")
+    limit: int = Query(10, description="Number of results"),
+    sort_by: str = Query("carbon_score", description=f"Numeric attribute: {', '.join(NUMERIC_FIELDS)}"),
+    descending: bool = Query(True, description="Highest values first"),
+    catalog: BreedCatalog = Depends(get_catalog),
+    cache: ResponseCache = Depends(get_response_cache)
 ):
     """
-    Get breeds ranked by sustainability score
+    Get breeds ranked by sustainability score, or any parsed numeric attribute
+    
+    Preset over the /breeds/query engine with a single sort attribute.
     
     - **animal_type**: Filter by 'cattle' or 'buffalo'
     - **limit**: Number of results to return
+    - **sort_by**: Attribute to rank by (e.g. 'milk_yield', 'purchase_cost')
+    - **descending**: Set to false to rank lowest first (e.g. cheapest)
     """
-    if not hasattr(request.app.state, 'breed_data'):
-        raise HTTPException(status_code=500, detail="Breed data not loaded")
-    
-    breed_data = request.app.state.breed_data
-    results = []
-    
-    animal_types = [animal_type.lower()] if animal_type else ["cattle", "buffalo"]
-    
-    for atype in animal_types:
-        if atype not in breed_data:
-            continue
-            
-        for breed_id, breed_info in breed_data[atype].items():
-            carbon_score = breed_info.get("sustainability", {}).get("carbonScore", 0)
-            results.append({
-                "id": breed_id,
-                "name": breed_info.get("name", breed_id),
-                "type": atype,
-                "carbon_score": carbon_score,
-                "carbon_footprint": breed_info.get("sustainability", {}).get("carbonFootprint", "Unknown"),
-                "feed_efficiency": breed_info.get("sustainability", {}).get("feedEfficiency", "Unknown")
-            })
-    
-    # Sort by carbon score (higher is better)
-    results.sort(key=lambda x: x["carbon_score"], reverse=True)
-    
-    return {
-        "ranking": results[:limit],
-        "total": len(results)
-    }
+    if sort_by not in NUMERIC_FIELDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"sort_by must be one of: {', '.join(NUMERIC_FIELDS)}"
+        )
+    animal_type = animal_type.lower() if animal_type else None
+    
+    return cache.respond(
+        request,
+        (catalog.version, "sustainability-ranking", animal_type, limit, sort_by, descending),
+        lambda: sustainability_ranking_payload(catalog, animal_type, limit, sort_by, descending)
+    )
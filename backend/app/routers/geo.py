@@ -0,0 +1,68 @@
+"""
+Geo API Router
+Breeds native to the regions nearest a location
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+
+from app.services.catalog_service import ANIMAL_TYPES, BreedCatalog, get_catalog
+
+router = APIRouter()
+
+@router.get("/geo/nearby")
+async def get_nearby_breeds(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude in degrees"),
+    lng: float = Query(..., ge=-180, le=180, description="Longitude in degrees"),
+    radius_km: float = Query(300, gt=0, le=3000, description="Search radius in kilometres"),
+    limit: int = Query(10, ge=1, le=50, description="Number of breeds"),
+    animal_type: Optional[str] = Query(None, description="Filter by animal type"),
+    catalog: BreedCatalog = Depends(get_catalog)
+):
+    """
+    Breeds native to the states and regions closest to a location
+    
+    Distances are great-circle kilometres to the nearest state or native-region
+    centroid of each breed; centroids ship in data/region_centroids.json.
+    
+    - **lat**, **lng**: Location, e.g. from the phone's GPS
+    - **radius_km**: Ignore homelands further away than this
+    - **animal_type**: Filter by 'cattle' or 'buffalo'
+    """
+    if animal_type:
+        if animal_type.lower() not in ANIMAL_TYPES:
+            raise HTTPException(status_code=400, detail="animal_type must be 'cattle' or 'buffalo'")
+        animal_type = animal_type.lower()
+    
+    points = catalog.geo.nearest_points(lat, lng, radius_km)
+    rows = catalog.type_rows(animal_type) if animal_type else None
+    nearby = catalog.geo.nearby_breeds(lat, lng, radius_km, rows)
+    
+    breeds = []
+    for match in nearby[:limit]:
+        record = catalog.records[match.row]
+        breeds.append({
+            **record.state_summary,
+            "distance_km": round(match.distance_km, 1),
+            "nearest_region": {"kind": match.point.kind, "name": match.point.name}
+        })
+    
+    regions = [
+        {
+            "kind": point.kind,
+            "name": point.name,
+            "lat": point.lat,
+            "lng": point.lng,
+            "distance_km": round(distance, 1),
+            "breed_ids": [catalog.records[row].id for row in point.rows]
+        }
+        for point, distance in points[:limit]
+    ]
+    
+    return {
+        "location": {"lat": lat, "lng": lng},
+        "radius_km": radius_km,
+        "total": len(nearby),
+        "breeds": breeds,
+        "regions": regions
+    }
@@ -13,6 +13,7 @@ from PIL import Image
 
 from app.services.model_service import ModelService
 from app.services.gradcam_service import GradCAMService
+from app.services.catalog_service import BreedCatalog
 from app.config import settings
 
 router = APIRouter()
@@ -112,13 +113,12 @@ async def predict_breed(
     
     # Get breed info if requested
     breed_info = None
-    if include_breed_info and hasattr(request.app.state, 'breed_data'):
-        breed_data = request.app.state.breed_data
-        animal_type = result["animal_type"]
-        breed_key = result["breed"]
-        
-        if animal_type in breed_data and breed_key in breed_data[animal_type]:
-            breed_info = breed_data[animal_type][breed_key]
+    catalog: Optional[BreedCatalog] = getattr(request.app.state, 'catalog', None)
+    if include_breed_info and catalog is not None:
+        # Model labels ("Gir", "nili-ravi") resolve through the catalog name index
+        record = catalog.resolve(result["breed"])
+        if record is not None and record.animal_type == result["animal_type"]:
+            breed_info = record.data
     
     # Get Hindi name
     breed_hindi = None
@@ -184,13 +184,12 @@ async def predict_breed_base64(
     
     # Get breed info if requested
     breed_info = None
-    if prediction_request.include_breed_info and hasattr(request.app.state, 'breed_data'):
-        breed_data = request.app.state.breed_data
-        animal_type = result["animal_type"]
-        breed_key = result["breed"]
-        
-        if animal_type in breed_data and breed_key in breed_data[animal_type]:
-            breed_info = breed_data[animal_type][breed_key]
+    catalog: Optional[BreedCatalog] = getattr(request.app.state, 'catalog', None)
+    if prediction_request.include_breed_info and catalog is not None:
+        # Model labels ("Gir", "nili-ravi") resolve through the catalog name index
+        record = catalog.resolve(result["breed"])
+        if record is not None and record.animal_type == result["animal_type"]:
+            breed_info = record.data
     
     # Get Hindi name
     breed_hindi = None
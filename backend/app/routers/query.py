@@ -0,0 +1,130 @@
+"""
+Query API Router
+Multi-criteria breed filtering and weighted ranking
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+
+from app.services.catalog_service import BreedCatalog, get_catalog
+from app.services.breed_parsing import NUMERIC_FIELDS
+from app.services.breed_query import (
+    FEATURES,
+    LOWER_IS_BETTER,
+    OPERATORS,
+    ORDINAL_FIELDS,
+    QueryError,
+    QueryFilter,
+    QuerySpec,
+)
+
+router = APIRouter()
+
+class FilterClause(BaseModel):
+    """A single predicate, e.g. {"attribute": "carbon_score", "op": "gte", "value": 70}"""
+    attribute: str
+    op: Literal["eq", "ne", "gt", "gte", "lt", "lte", "between", "in"] = "eq"
+    value: Any
+
+class BreedQueryRequest(BaseModel):
+    """Filter and ranking specification"""
+    animal_type: Optional[Literal["cattle", "buffalo"]] = None
+    filters: List[FilterClause] = []
+    weights: Dict[str, float] = {}
+    sort_by: Optional[str] = None
+    descending: bool = True
+    limit: int = Field(10, ge=1, le=100)
+    offset: int = Field(0, ge=0)
+
+def run_query(catalog: BreedCatalog, spec: QuerySpec) -> Dict[str, Any]:
+    """Evaluate a query and shape the response rows"""
+    engine = catalog.query_engine
+    try:
+        result = engine.run(spec)
+    except QueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    results = []
+    for position, row in enumerate(result.rows):
+        record = catalog.records[row]
+        item = {
+            "id": record.id,
+            "name": record.name,
+            "name_hindi": record.name_hindi,
+            "type": record.animal_type,
+            "values": engine.values(row)
+        }
+        if result.scores is not None:
+            item["score"] = round(float(result.scores[position]), 4)
+            item["contributions"] = {
+                name: round(float(value), 4)
+                for name, value in zip(result.weight_names, result.contributions[position])
+            }
+        results.append(item)
+
+    return {
+        "total": result.total,
+        "results": results
+    }
+
+@router.post("/breeds/query")
+async def query_breeds(
+    query: BreedQueryRequest,
+    catalog: BreedCatalog = Depends(get_catalog)
+):
+    """
+    Filter breeds by arbitrary predicates and rank them by weighted attributes
+
+    Example: carbon score ≥ 70, milk yield 8-15 L/day, Excellent heat tolerance,
+    ranked by yield, cost and disease resistance:
+
+        {
+          "filters": [
+            {"attribute": "carbon_score", "op": "gte", "value": 70},
+            {"attribute": "milk_yield", "op": "between", "value": [8, 15]},
+            {"attribute": "heat_tolerance", "op": "eq", "value": "Excellent"}
+          ],
+          "weights": {"milk_yield": 2, "purchase_cost": 1, "disease_resistance": 1}
+        }
+
+    Weighted scores are 0-1; cost and carbon footprint count lower values as better.
+    """
+    spec = QuerySpec(
+        animal_type=query.animal_type,
+        filters=[QueryFilter(f.attribute, f.op, f.value) for f in query.filters],
+        weights=query.weights,
+        sort_by=query.sort_by,
+        descending=query.descending,
+        limit=query.limit,
+        offset=query.offset
+    )
+    return run_query(catalog, spec)
+
+@router.get("/breeds/query/attributes")
+async def list_query_attributes():
+    """
+    Attributes available to /breeds/query filters, weights and sort_by
+    """
+    attributes = []
+    for name in FEATURES:
+        if name in NUMERIC_FIELDS:
+            attributes.append({
+                "name": name,
+                "kind": "numeric",
+                "unit": NUMERIC_FIELDS[name][2],
+                "lower_is_better": name in LOWER_IS_BETTER
+            })
+        else:
+            scale = ORDINAL_FIELDS[name][2]
+            attributes.append({
+                "name": name,
+                "kind": "ordinal",
+                "levels": sorted(scale, key=scale.get),
+                "lower_is_better": name in LOWER_IS_BETTER
+            })
+
+    return {
+        "operators": list(OPERATORS),
+        "attributes": attributes
+    }
@@ -0,0 +1,101 @@
+"""
+Recommendation API Router
+Similar-breed lookup and farm-profile recommendations
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+
+from app.services.catalog_service import BreedCatalog, get_catalog
+from app.services.breed_query import QueryError
+from app.services.similarity_service import CLIMATE_TAGS, PURPOSE_TAGS, FarmProfile, Neighbour
+
+router = APIRouter()
+
+class FarmProfileRequest(BaseModel):
+    """Farm conditions and priorities for breed recommendations"""
+    animal_type: Optional[Literal["cattle", "buffalo"]] = None
+    climate: List[str] = Field([], description=f"Any of: {', '.join(CLIMATE_TAGS)}")
+    purpose: List[str] = Field([], description=f"Any of: {', '.join(PURPOSE_TAGS)}")
+    max_purchase_cost: Optional[float] = Field(None, ge=0, description="Budget per animal in INR")
+    priorities: Dict[str, float] = Field({}, description="Attribute weights, as in /breeds/query")
+    limit: int = Field(5, ge=1, le=50)
+
+def neighbour_rows(catalog: BreedCatalog, neighbours: List[Neighbour]) -> List[Dict[str, Any]]:
+    """Shape ranked breeds for a response"""
+    results = []
+    for neighbour in neighbours:
+        record = catalog.records[neighbour.row]
+        results.append({
+            "id": record.id,
+            "name": record.name,
+            "name_hindi": record.name_hindi,
+            "type": record.animal_type,
+            "score": neighbour.score,
+            "contributions": neighbour.contributions
+        })
+    return results
+
+@router.get("/breeds/{breed_id}/similar")
+async def get_similar_breeds(
+    breed_id: str,
+    limit: int = Query(5, ge=1, le=50, description="Number of results"),
+    same_type: bool = Query(False, description="Only breeds of the same animal type"),
+    catalog: BreedCatalog = Depends(get_catalog)
+):
+    """
+    Breeds most similar to a given breed
+    
+    Scores are cosine similarities of the breed feature vectors; contributions
+    show how much each attribute group adds to the score.
+    
+    - **breed_id**: Breed identifier (e.g., 'gir', 'murrah')
+    """
+    record = catalog.resolve(breed_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Breed '{breed_id}' not found")
+    
+    neighbours = catalog.embeddings.similar(record.position, k=limit, same_type=same_type)
+    
+    return {
+        "breed_id": record.id,
+        "total": len(neighbours),
+        "similar": neighbour_rows(catalog, neighbours)
+    }
+
+@router.post("/recommendations")
+async def recommend_breeds(
+    profile: FarmProfileRequest,
+    catalog: BreedCatalog = Depends(get_catalog)
+):
+    """
+    Best breeds for a farm profile
+    
+    Example: a hot, dry dairy farm with a ₹80,000 budget that values disease resistance:
+    
+        {
+          "climate": ["hot", "arid"],
+          "purpose": ["dairy"],
+          "max_purchase_cost": 80000,
+          "priorities": {"milk_yield": 2, "disease_resistance": 1}
+        }
+    """
+    try:
+        neighbours = catalog.embeddings.recommend(
+            FarmProfile(
+                animal_type=profile.animal_type,
+                climate=profile.climate,
+                purpose=profile.purpose,
+                max_purchase_cost=profile.max_purchase_cost,
+                priorities=profile.priorities
+            ),
+            k=profile.limit
+        )
+    except QueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        "total": len(neighbours),
+        "recommendations": neighbour_rows(catalog, neighbours)
+    }
@@ -0,0 +1,68 @@
+"""
+Search API Router
+Fuzzy breed search across English and Hindi names, regions and traits
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from typing import Any, Dict, Optional
+
+from app.services.catalog_service import ANIMAL_TYPES, BreedCatalog, get_catalog
+from app.services.response_cache import ResponseCache, get_response_cache
+
+router = APIRouter()
+
+def search_payload(
+    catalog: BreedCatalog,
+    q: str,
+    animal_type: Optional[str] = None,
+    limit: int = 10
+) -> Dict[str, Any]:
+    """Response body for /search"""
+    rows = catalog.type_rows(animal_type) if animal_type else None
+    hits = catalog.search_index.search(q, limit=limit, rows=rows)
+    
+    results = []
+    for hit in hits:
+        record = catalog.records[hit.row]
+        results.append({
+            **record.summary,
+            "score": hit.score,
+            "matched_fields": list(hit.fields)
+        })
+    
+    return {
+        "query": q,
+        "total": len(results),
+        "results": results
+    }
+
+@router.get("/search")
+async def search_breeds(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=100, description="Search text"),
+    animal_type: Optional[str] = Query(None, description="Filter by animal type"),
+    limit: int = Query(10, ge=1, le=50, description="Number of results"),
+    catalog: BreedCatalog = Depends(get_catalog),
+    cache: ResponseCache = Depends(get_response_cache)
+):
+    """
+    Search breeds by name, Hindi name, region, traits or best-for tags
+    
+    Tolerates typos and transliteration variants ('jafrabadi', 'nili ravi', 'गिर').
+    
+    - **q**: Free-text query
+    - **animal_type**: Filter by 'cattle' or 'buffalo'
+    - **limit**: Number of results to return
+    """
+    if animal_type:
+        if animal_type.lower() not in ANIMAL_TYPES:
+            raise HTTPException(status_code=400, detail="animal_type must be 'cattle' or 'buffalo'")
+        animal_type = animal_type.lower()
+    
+    q = " ".join(q.split())
+    
+    return cache.respond(
+        request,
+        (catalog.version, "search", q, animal_type, limit),
+        lambda: search_payload(catalog, q, animal_type, limit)
+    )
@@ -0,0 +1,110 @@
+"""
+Sync API Router
+Delta sync of breeds and government schemes for offline clients
+"""
+
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from fastapi.responses import Response
+from typing import Any, Dict, Optional
+
+from app.services.catalog_service import BreedCatalog, get_catalog
+from app.services.response_cache import encode_json
+from app.services.sync_log import MSGPACK_AVAILABLE, MSGPACK_MEDIA_TYPE, SYNC_KINDS, SyncLog
+
+if MSGPACK_AVAILABLE:
+    import msgpack
+
+router = APIRouter()
+
+# Attempts, and seconds between them, to read a catalog and log of one version
+SYNC_RETRIES = 20
+SYNC_RETRY_DELAY = 0.05
+
+def get_sync_log(request: Request) -> SyncLog:
+    """FastAPI dependency returning the catalog change log"""
+    sync_log = getattr(request.app.state, "sync_log", None)
+    if sync_log is None:
+        raise HTTPException(status_code=500, detail="Sync log not initialized")
+    return sync_log
+
+def sync_payload(
+    catalog: BreedCatalog, sync_log: SyncLog, since: Optional[str], kinds: tuple
+) -> Optional[Dict[str, Any]]:
+    """
+    Records changed after the client's token, or everything for a full sync
+    
+    Returns None while a reload has the catalog and the log on different
+    versions; bodies from one must never go out under the other's token.
+    """
+    sequence = sync_log.parse_token(since)
+    snapshot = sync_log.changes_for(catalog.version, sequence)
+    if snapshot is None:
+        return None
+    token, changes = snapshot
+    
+    breeds, schemes, deleted = [], [], []
+    for kind, record_id, version, is_deleted in changes:
+        if kind not in kinds:
+            continue
+        if is_deleted:
+            deleted.append({"kind": kind, "id": record_id, "version": version})
+        elif kind == "breed":
+            record = catalog.get(record_id)
+            if record is not None:
+                breeds.append({**record.detail(), "version": version})
+        elif kind == "scheme":
+            scheme = catalog.schemes.get(record_id)
+            if scheme is not None:
+                schemes.append({"id": record_id, "data": scheme, "version": version})
+    
+    return {
+        "token": token,
+        "full": sequence is None,
+        "breeds": breeds,
+        "schemes": schemes,
+        "deleted": deleted
+    }
+
+@router.get("/sync")
+async def sync_catalog(
+    request: Request,
+    since: Optional[str] = Query(None, description="Token from the previous sync; omit for a full sync"),
+    kinds: str = Query(",".join(SYNC_KINDS), description="Comma-separated record kinds: breed, scheme"),
+    catalog: BreedCatalog = Depends(get_catalog),
+    sync_log: SyncLog = Depends(get_sync_log)
+):
+    """
+    Breeds and schemes changed since a sync token
+    
+    Store the returned **token** and send it as **since** next time; only
+    records changed after it are returned, plus tombstones for deleted ones.
+    An unknown or outdated token yields a full sync (``"full": true``).
+    
+    Send ``Accept: application/msgpack`` for a compact MessagePack body;
+    JSON is the fallback.
+    """
+    requested = tuple(k.strip() for k in kinds.split(",") if k.strip())
+    unknown = [k for k in requested if k not in SYNC_KINDS]
+    if unknown or not requested:
+        raise HTTPException(status_code=400, detail=f"kinds must be any of: {', '.join(SYNC_KINDS)}")
+    
+    # A reload swaps the catalog and updates the log a moment apart
+    for _ in range(SYNC_RETRIES):
+        payload = sync_payload(catalog, sync_log, since, requested)
+        if payload is not None:
+            break
+        await asyncio.sleep(SYNC_RETRY_DELAY)
+        catalog = get_catalog(request)
+    else:
+        raise HTTPException(status_code=503, detail="Catalog reload in progress, retry shortly")
+    headers = {"Cache-Control": "no-cache", "Vary": "Accept"}
+    
+    if MSGPACK_AVAILABLE and MSGPACK_MEDIA_TYPE in request.headers.get("accept", ""):
+        return Response(
+            content=msgpack.packb(payload, use_bin_type=True),
+            media_type=MSGPACK_MEDIA_TYPE,
+            headers=headers
+        )
+    return Response(content=encode_json(payload), media_type="application/json", headers=headers)
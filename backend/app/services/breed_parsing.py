@@ -0,0 +1,172 @@
+"""
+Breed Parsing Service
+Normalizes free-text productivity and economic fields into numeric columns
+"""
+
+import math
+import re
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Attribute name -> (section, key, canonical unit)
+NUMERIC_FIELDS: Dict[str, Tuple[str, str, str]] = {
+    "milk_yield": ("productivity", "milkYieldPerDay", "L/day"),
+    "lactation_yield": ("productivity", "lactationYield", "L"),
+    "fat_content": ("productivity", "fatContent", "%"),
+    "lactation_period": ("productivity", "lactationPeriod", "days"),
+    "purchase_cost": ("economicValue", "purchaseCost", "INR"),
+    "maintenance_cost": ("economicValue", "maintenanceCost", "INR/day"),
+    "carbon_score": ("sustainability", "carbonScore", "score"),
+}
+
+# Column layout of each attribute array
+STATS = ("min", "max", "mid")
+
+# Indian digit grouping ("1,50,000") and plain decimals; commas are separators only
+_NUMBER = re.compile(r"\d[\d,]*(?:\.\d+)?")
+_MULTIPLIERS = (
+    (re.compile(r"\bcrores?\b|\bcr\b", re.IGNORECASE), 1e7),
+    (re.compile(r"\blakhs?\b|\blacs?\b", re.IGNORECASE), 1e5),
+    (re.compile(r"\bthousand\b", re.IGNORECASE), 1e3),
+)
+
+
+class ParsedQuantity(NamedTuple):
+    """A numeric range parsed from text such as '12-15 liters'"""
+    min: float
+    max: float
+    mid: float
+    unit: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"min": self.min, "max": self.max, "mid": self.mid, "unit": self.unit}
+
+
+def parse_quantity(value: Any, unit: str = "") -> Optional[ParsedQuantity]:
+    """
+    Parse a number or numeric range out of a free-text value
+
+    Handles ranges ("4.5-5.0%"), currency with Indian grouping
+    ("₹50,000 - ₹1,50,000"), single values ("4.5%") and lakh/crore
+    multipliers ("₹3 lakh"). Returns None when no number is present.
+    """
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        if not math.isfinite(value):
+            return None
+        number = float(value)
+        return ParsedQuantity(number, number, number, unit)
+    if not isinstance(value, str):
+        return None
+
+    numbers = [float(m.replace(",", "")) for m in _NUMBER.findall(value)]
+    if not numbers:
+        return None
+
+    for pattern, factor in _MULTIPLIERS:
+        if pattern.search(value):
+            numbers = [n * factor for n in numbers]
+            break
+
+    # Only the first two numbers form the range ("₹200-300/day" has no third)
+    low, high = numbers[0], numbers[1] if len(numbers) > 1 else numbers[0]
+    if low > high:
+        low, high = high, low
+    return ParsedQuantity(low, high, (low + high) / 2, unit)
+
+
+def parse_breed_fields(info: Dict[str, Any]) -> Dict[str, Optional[ParsedQuantity]]:
+    """Parse every registered numeric attribute of one breed"""
+    parsed = {}
+    for name, (section, key, unit) in NUMERIC_FIELDS.items():
+        parsed[name] = parse_quantity(info.get(section, {}).get(key), unit)
+    return parsed
+
+
+class NumericColumns:
+    """
+    Columnar float arrays for numeric breed attributes
+
+    Each attribute is an (n_breeds, 3) array of min/max/mid values aligned
+    with ``ids``; unparseable values are NaN. Sorting and filtering are
+    single NumPy operations over these columns.
+    """
+
+    def __init__(self, ids: Sequence[str], parsed: Sequence[Dict[str, Optional[ParsedQuantity]]]):
+        self.ids: Tuple[str, ...] = tuple(ids)
+        self.positions: Dict[str, int] = {breed_id: i for i, breed_id in enumerate(self.ids)}
+        self.units: Dict[str, str] = {name: unit for name, (_, _, unit) in NUMERIC_FIELDS.items()}
+
+        self._columns: Dict[str, np.ndarray] = {}
+        for name in NUMERIC_FIELDS:
+            column = np.full((len(self.ids), len(STATS)), np.nan, dtype=np.float64)
+            for row, fields in enumerate(parsed):
+                quantity = fields.get(name)
+                if quantity is not None:
+                    column[row] = (quantity.min, quantity.max, quantity.mid)
+            column.flags.writeable = False
+            self._columns[name] = column
+
+    @classmethod
+    def from_records(cls, records: Iterable[Any]) -> "NumericColumns":
+        records = list(records)
+        return cls(
+            [record.id for record in records],
+            [parse_breed_fields(record.data) for record in records]
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return tuple(self._columns)
+
+    def column(self, name: str, stat: str = "mid") -> np.ndarray:
+        """One statistic of one attribute for every breed"""
+        if name not in self._columns:
+            raise KeyError(f"Unknown numeric attribute '{name}'")
+        return self._columns[name][:, STATS.index(stat)]
+
+    def values(self, breed_id: str) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Parsed attributes of one breed as JSON-ready dicts"""
+        row = self.positions[breed_id]
+        result = {}
+        for name, column in self._columns.items():
+            low, high, mid = column[row]
+            result[name] = None if np.isnan(mid) else {
+                "min": float(low), "max": float(high), "mid": float(mid), "unit": self.units[name]
+            }
+        return result
+
+    def order(
+        self,
+        name: str,
+        stat: str = "mid",
+        descending: bool = True,
+        rows: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Row indices sorted by an attribute, missing values last, ties in catalog order"""
+        rows = np.arange(len(self.ids)) if rows is None else np.asarray(rows)
+        values = self.column(name, stat)[rows]
+        keys = -values if descending else values
+        keys = np.where(np.isnan(keys), np.inf, keys)
+        return rows[np.argsort(keys, kind="stable")]
+
+    def mask(
+        self,
+        name: str,
+        minimum: Optional[float] = None,
+        maximum: Optional[float] = None,
+        stat: str = "mid"
+    ) -> np.ndarray:
+        """Boolean mask of breeds whose attribute lies within [minimum, maximum]"""
+        values = self.column(name, stat)
+        result = ~np.isnan(values)
+        if minimum is not None:
+            result &= values >= minimum
+        if maximum is not None:
+            result &= values <= maximum
+        return result
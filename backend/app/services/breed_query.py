@@ -0,0 +1,232 @@
+"""
+Breed Query Service
+Vectorized filtering and weighted multi-attribute ranking over the catalog
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.breed_parsing import NUMERIC_FIELDS, NumericColumns
+
+# Ordinal scales for categorical attributes; parenthetical notes are ignored
+LEVEL_SCALE = {
+    "very low": 1.0, "low": 2.0, "low-medium": 2.5, "medium": 3.0,
+    "medium-high": 3.5, "high": 4.0, "very high": 5.0,
+}
+QUALITY_SCALE = {
+    "poor": 1.0, "low": 1.0, "fair": 2.0, "medium": 2.0, "moderate": 2.0,
+    "good": 3.0, "excellent": 4.0, "exceptional": 5.0,
+}
+
+# Attribute name -> (section, key, scale)
+ORDINAL_FIELDS: Dict[str, Tuple[str, str, Dict[str, float]]] = {
+    "heat_tolerance": ("sustainability", "heatTolerance", QUALITY_SCALE),
+    "disease_resistance": ("sustainability", "diseaseResistance", LEVEL_SCALE),
+    "feed_efficiency": ("sustainability", "feedEfficiency", QUALITY_SCALE),
+    "carbon_footprint": ("sustainability", "carbonFootprint", LEVEL_SCALE),
+    "market_demand": ("economicValue", "marketDemand", LEVEL_SCALE),
+}
+
+# Attributes where a smaller value is the better one
+LOWER_IS_BETTER = frozenset({"purchase_cost", "maintenance_cost", "carbon_footprint"})
+
+FEATURES: Tuple[str, ...] = tuple(NUMERIC_FIELDS) + tuple(ORDINAL_FIELDS)
+
+OPERATORS = ("eq", "ne", "gt", "gte", "lt", "lte", "between", "in")
+
+
+class QueryError(ValueError):
+    """Raised for filters or weights that cannot be evaluated"""
+
+
+def encode_level(label: Any, scale: Dict[str, float]) -> float:
+    """Map a categorical label such as 'Very High (rare breed)' onto its scale"""
+    if isinstance(label, (int, float)) and not isinstance(label, bool):
+        return float(label)
+    if not isinstance(label, str):
+        return np.nan
+    key = label.split("(")[0].strip().casefold()
+    return scale.get(key, np.nan)
+
+
+@dataclass(frozen=True)
+class QueryFilter:
+    """One predicate: ``attribute op value``"""
+    attribute: str
+    op: str
+    value: Any
+
+
+@dataclass
+class QuerySpec:
+    """A full query over the catalog"""
+    animal_type: Optional[str] = None
+    filters: Sequence[QueryFilter] = ()
+    weights: Dict[str, float] = field(default_factory=dict)
+    sort_by: Optional[str] = None
+    descending: bool = True
+    breed_ids: Optional[Sequence[str]] = None
+    limit: Optional[int] = None
+    offset: int = 0
+
+
+@dataclass
+class QueryResult:
+    """Matching row indices in rank order, with their scores"""
+    rows: np.ndarray
+    total: int
+    scores: Optional[np.ndarray] = None
+    contributions: Optional[np.ndarray] = None
+    weight_names: Tuple[str, ...] = ()
+
+
+class BreedQueryEngine:
+    """
+    Feature matrix over every breed plus vectorized query evaluation
+
+    ``matrix`` holds raw attribute values (numeric mids and ordinal levels)
+    with NaN for missing data. ``benefit`` holds the same attributes scaled
+    to 0..1 across the catalog and flipped where lower is better, so a
+    weighted score is one matrix-vector product.
+    """
+
+    def __init__(self, records: Sequence[Any], numeric: NumericColumns):
+        n = len(records)
+        self.ids: Tuple[str, ...] = tuple(r.id for r in records)
+        self.positions: Dict[str, int] = {breed_id: i for i, breed_id in enumerate(self.ids)}
+        self.features = FEATURES
+        self.feature_index = {name: j for j, name in enumerate(FEATURES)}
+        self.animal_types = np.array([r.animal_type for r in records], dtype=object)
+
+        matrix = np.full((n, len(FEATURES)), np.nan, dtype=np.float64)
+        for name in NUMERIC_FIELDS:
+            matrix[:, self.feature_index[name]] = numeric.column(name)
+        for name, (section, key, scale) in ORDINAL_FIELDS.items():
+            j = self.feature_index[name]
+            for i, record in enumerate(records):
+                matrix[i, j] = encode_level(record.data.get(section, {}).get(key), scale)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            low = np.nanmin(matrix, axis=0) if n else np.zeros(len(FEATURES))
+            high = np.nanmax(matrix, axis=0) if n else np.zeros(len(FEATURES))
+            span = np.where(high > low, high - low, 1.0)
+            benefit = (matrix - low) / span
+        flip = np.array([name in LOWER_IS_BETTER for name in FEATURES])
+        benefit[:, flip] = 1.0 - benefit[:, flip]
+        benefit = np.nan_to_num(benefit, nan=0.0)
+
+        matrix.flags.writeable = False
+        benefit.flags.writeable = False
+        self.matrix = matrix
+        self.benefit = benefit
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _column(self, attribute: str) -> np.ndarray:
+        if attribute not in self.feature_index:
+            raise QueryError(f"Unknown attribute '{attribute}'. Available: {', '.join(FEATURES)}")
+        return self.matrix[:, self.feature_index[attribute]]
+
+    def _encode(self, attribute: str, value: Any) -> float:
+        if attribute in ORDINAL_FIELDS:
+            encoded = encode_level(value, ORDINAL_FIELDS[attribute][2])
+        else:
+            try:
+                encoded = float(value)
+            except (TypeError, ValueError):
+                encoded = np.nan
+        if np.isnan(encoded):
+            raise QueryError(f"Invalid value {value!r} for '{attribute}'")
+        return encoded
+
+    def mask(self, spec: QuerySpec) -> np.ndarray:
+        """Boolean mask of breeds satisfying every predicate in spec"""
+        result = np.ones(len(self.ids), dtype=bool)
+
+        if spec.animal_type:
+            result &= self.animal_types == spec.animal_type
+        if spec.breed_ids is not None:
+            rows = [self.positions[b] for b in spec.breed_ids if b in self.positions]
+            selected = np.zeros(len(self.ids), dtype=bool)
+            selected[rows] = True
+            result &= selected
+
+        for predicate in spec.filters:
+            column = self._column(predicate.attribute)
+            op, value = predicate.op, predicate.value
+            with np.errstate(invalid="ignore"):
+                if op == "between":
+                    if not isinstance(value, (list, tuple)) or len(value) != 2:
+                        raise QueryError("'between' expects [minimum, maximum]")
+                    low = self._encode(predicate.attribute, value[0])
+                    high = self._encode(predicate.attribute, value[1])
+                    result &= (column >= low) & (column <= high)
+                elif op == "in":
+                    if not isinstance(value, (list, tuple)):
+                        raise QueryError("'in' expects a list of values")
+                    encoded = [self._encode(predicate.attribute, v) for v in value]
+                    result &= np.isin(column, encoded)
+                else:
+                    target = self._encode(predicate.attribute, value)
+                    if op == "eq":
+                        result &= column == target
+                    elif op == "ne":
+                        result &= column != target
+                    elif op == "gt":
+                        result &= column > target
+                    elif op == "gte":
+                        result &= column >= target
+                    elif op == "lt":
+                        result &= column < target
+                    elif op == "lte":
+                        result &= column <= target
+                    else:
+                        raise QueryError(f"Unknown operator '{op}'. Available: {', '.join(OPERATORS)}")
+        return result
+
+    def run(self, spec: QuerySpec) -> QueryResult:
+        """Filter, rank and page the catalog"""
+        rows = np.flatnonzero(self.mask(spec))
+        scores = contributions = None
+        weight_names: Tuple[str, ...] = ()
+
+        if spec.weights:
+            weight_names = tuple(spec.weights)
+            for name in weight_names:
+                self._column(name)
+            columns = [self.feature_index[name] for name in weight_names]
+            weights = np.array([spec.weights[n] for n in weight_names], dtype=np.float64)
+            total_weight = np.abs(weights).sum()
+            if total_weight == 0:
+                raise QueryError("At least one weight must be non-zero")
+            contributions = self.benefit[np.ix_(rows, columns)] * (weights / total_weight)
+            scores = contributions.sum(axis=1)
+            order = np.argsort(-scores, kind="stable")
+        elif spec.sort_by:
+            keys = self._column(spec.sort_by)[rows]
+            keys = -keys if spec.descending else keys
+            order = np.argsort(np.where(np.isnan(keys), np.inf, keys), kind="stable")
+        else:
+            order = np.arange(len(rows))
+
+        start = max(spec.offset, 0)
+        stop = None if spec.limit is None else start + spec.limit
+        page = order[start:stop]
+
+        return QueryResult(
+            rows=rows[page],
+            total=len(rows),
+            scores=None if scores is None else scores[page],
+            contributions=None if contributions is None else contributions[page],
+            weight_names=weight_names
+        )
+
+    def values(self, row: int) -> Dict[str, Optional[float]]:
+        """Raw attribute values of one breed, None where missing"""
+        return {
+            name: None if np.isnan(value) else float(value)
+            for name, value in zip(self.features, self.matrix[row])
+        }
@@ -0,0 +1,331 @@
+"""
+Breed Catalog Service
+Immutable, indexed view over breed_info.json built once at load time
+"""
+
+import copy
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from fastapi import HTTPException, Request
+
+from app.services.breed_parsing import NumericColumns
+from app.services.breed_query import BreedQueryEngine, QuerySpec
+from app.services.comparison_engine import ComparisonEngine
+from app.services.search_index import BreedSearchIndex
+from app.services.similarity_service import BreedEmbeddings
+from app.services.geo_index import GeoDataError, GeoIndex
+
+ANIMAL_TYPES = ("cattle", "buffalo")
+
+# Offline state and native-region coordinates, looked up next to breed_info.json
+CENTROIDS_FILENAME = "region_centroids.json"
+
+
+class CatalogError(ValueError):
+    """Raised when breed data does not have the expected structure"""
+
+
+def _fold(value: str) -> str:
+    """Normalize a lookup key (case-insensitive, trimmed)"""
+    return value.strip().casefold()
+
+
+def _canonical(value: Any) -> bytes:
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _substrings(value: str) -> Iterable[str]:
+    """Every non-empty substring of a folded key, used for partial-match indexes"""
+    length = len(value)
+    for start in range(length):
+        for end in range(start + 1, length + 1):
+            yield value[start:end]
+
+
+@dataclass(frozen=True)
+class BreedRecord:
+    """A single breed entry with its pre-built response rows"""
+    id: str
+    animal_type: str
+    position: int
+    data: Mapping[str, Any] = field(repr=False)
+    summary: Mapping[str, Any] = field(repr=False)
+    state_summary: Mapping[str, Any] = field(repr=False)
+
+    @property
+    def name(self) -> str:
+        return self.data.get("name", self.id)
+
+    @property
+    def name_hindi(self) -> str:
+        return self.data.get("nameHindi", "")
+
+    def detail(self) -> Dict[str, Any]:
+        """Payload for the breed detail endpoint"""
+        return {
+            "id": self.id,
+            "animal_type": self.animal_type,
+            "data": self.data
+        }
+
+
+class BreedCatalog:
+    """
+    Read-only breed catalog with lookup indexes
+
+    All indexes are built in the constructor so that every route is a
+    handful of dictionary lookups regardless of how many breeds exist.
+    Records and their data must be treated as read-only by callers.
+    """
+
+    def __init__(self, breed_data: Dict[str, Any], centroids: Optional[Dict[str, Any]] = None):
+        if not isinstance(breed_data, dict):
+            raise CatalogError("Breed data must be a JSON object")
+
+        # Own a private copy so later changes to the source dict cannot leak in
+        raw = copy.deepcopy(breed_data)
+
+        # Content version over breeds and centroids: identical data always
+        # yields the same version, and a centroid-only edit still changes it
+        digest = hashlib.sha256(_canonical(raw))
+        if centroids is not None:
+            digest.update(b"\0" + _canonical(centroids))
+        self.version = digest.hexdigest()[:16]
+
+        records: List[BreedRecord] = []
+        by_id: Dict[str, BreedRecord] = {}
+        by_name: Dict[str, str] = {}
+        by_type: Dict[str, List[str]] = {atype: [] for atype in ANIMAL_TYPES}
+        by_native_state: Dict[str, List[str]] = {}
+        by_status: Dict[str, List[str]] = {}
+
+        for atype in ANIMAL_TYPES:
+            breeds = raw.get(atype, {})
+            if not isinstance(breeds, dict):
+                raise CatalogError(f"'{atype}' must map breed ids to breed objects")
+
+            for breed_id, info in breeds.items():
+                if not isinstance(info, dict):
+                    raise CatalogError(f"Breed '{breed_id}' must be an object")
+                if breed_id in by_id:
+                    raise CatalogError(f"Duplicate breed id '{breed_id}'")
+
+                if not isinstance(info.get("nativeState", []), list):
+                    raise CatalogError(f"Breed '{breed_id}' nativeState must be a list")
+
+                record = self._build_record(breed_id, atype, len(records), info)
+                records.append(record)
+                by_id[breed_id] = record
+                by_type[atype].append(breed_id)
+
+                for key in (breed_id, record.name, record.name_hindi):
+                    if key:
+                        by_name.setdefault(_fold(key), breed_id)
+                # Model labels use hyphens and spaces ("nili-ravi"), ids use underscores
+                by_name.setdefault(_fold(record.name).replace("-", "_").replace(" ", "_"), breed_id)
+
+                for state in info.get("nativeState", []):
+                    by_native_state.setdefault(_fold(state), []).append(breed_id)
+
+                status = info.get("population", {}).get("conservationStatus", "")
+                by_status.setdefault(_fold(status), []).append(breed_id)
+
+        state_mapping = raw.get("stateBreedMapping", {})
+        if not isinstance(state_mapping, dict):
+            raise CatalogError("'stateBreedMapping' must map states to breed id lists")
+
+        schemes = raw.get("governmentSchemes", {})
+        if not isinstance(schemes, dict):
+            raise CatalogError("'governmentSchemes' must map scheme ids to scheme objects")
+
+        state_ids: Dict[str, Tuple[str, ...]] = {}
+        state_breeds: Dict[str, Tuple[str, ...]] = {}
+        state_by_key: Dict[str, str] = {}
+        for state, breed_ids in state_mapping.items():
+            if not isinstance(breed_ids, list):
+                raise CatalogError(f"stateBreedMapping['{state}'] must be a list of breed ids")
+            state_ids[state] = tuple(breed_ids)
+            state_breeds[state] = tuple(b for b in breed_ids if b in by_id)
+            state_by_key.setdefault(_fold(state), state)
+
+        # Partial state match ("pradesh" -> first state containing it), in mapping order
+        state_by_fragment: Dict[str, str] = {}
+        for state in state_mapping:
+            for fragment in _substrings(_fold(state)):
+                state_by_fragment.setdefault(fragment, state)
+
+        # Partial conservation-status match ("endangered" also hits "Not Endangered")
+        status_by_fragment: Dict[str, set] = {}
+        for status, breed_ids in by_status.items():
+            for fragment in set(_substrings(status)):
+                status_by_fragment.setdefault(fragment, set()).update(breed_ids)
+
+        self._records: Tuple[BreedRecord, ...] = tuple(records)
+        self._by_id = MappingProxyType(by_id)
+        self._by_name = MappingProxyType(by_name)
+        self._by_type = MappingProxyType({k: tuple(v) for k, v in by_type.items()})
+        self._by_native_state = MappingProxyType({k: frozenset(v) for k, v in by_native_state.items()})
+        self._status_by_fragment = MappingProxyType({k: frozenset(v) for k, v in status_by_fragment.items()})
+        self._state_ids = MappingProxyType(state_ids)
+        self._state_breeds = MappingProxyType(state_breeds)
+        self._state_by_key = MappingProxyType(state_by_key)
+        self._state_by_fragment = MappingProxyType(state_by_fragment)
+        self._schemes = MappingProxyType(schemes)
+
+        # Parsed numeric attributes and the query feature matrix, one row per record
+        self.numeric = NumericColumns.from_records(self._records)
+        self.query_engine = BreedQueryEngine(self._records, self.numeric)
+        # Every pair and preset comparison, rebuilt with the catalog on reload
+        self.comparisons = ComparisonEngine(self._records, self.numeric, self.query_engine)
+        self.search_index = BreedSearchIndex(self._records)
+        self.embeddings = BreedEmbeddings(self._records, self.query_engine)
+        try:
+            self.geo = GeoIndex(self._records, state_ids, centroids)
+        except GeoDataError as e:
+            raise CatalogError(f"Invalid region centroids: {e}") from e
+
+    @classmethod
+    def from_file(cls, path: Path, centroids_path: Optional[Path] = None) -> "BreedCatalog":
+        """Load and index breed_info.json, plus region centroids when present"""
+        breed_data = cls._read_json(path)
+        centroids_path = centroids_path or path.parent / CENTROIDS_FILENAME
+        centroids = cls._read_json(centroids_path) if centroids_path.exists() else None
+        return cls(breed_data, centroids)
+
+    @staticmethod
+    def _read_json(path: Path) -> Any:
+        with open(path, "r", encoding="utf-8") as f:
+            try:
+                return json.load(f)
+            except json.JSONDecodeError as e:
+                raise CatalogError(f"Invalid JSON in {path.name}: {e}") from e
+
+    @staticmethod
+    def _build_record(breed_id: str, atype: str, position: int, info: dict) -> BreedRecord:
+        productivity = info.get("productivity", {})
+        population = info.get("population", {})
+        summary = {
+            "id": breed_id,
+            "name": info.get("name", breed_id),
+            "name_hindi": info.get("nameHindi", ""),
+            "type": atype,
+            "native_states": info.get("nativeState", []),
+            "milk_yield": productivity.get("milkYieldPerDay", "N/A"),
+            "conservation_status": population.get("conservationStatus", "Unknown"),
+            "carbon_score": info.get("sustainability", {}).get("carbonScore", 0),
+            "image": info.get("image", "")
+        }
+        state_summary = {
+            "id": breed_id,
+            "name": info.get("name", breed_id),
+            "name_hindi": info.get("nameHindi", ""),
+            "type": atype,
+            "milk_yield": productivity.get("milkYieldPerDay", "N/A"),
+            "conservation_status": population.get("conservationStatus", "Unknown")
+        }
+        return BreedRecord(
+            id=breed_id,
+            animal_type=atype,
+            position=position,
+            data=info,
+            summary=summary,
+            state_summary=state_summary
+        )
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(self._records)
+
+    @property
+    def records(self) -> Tuple[BreedRecord, ...]:
+        return self._records
+
+    def get(self, breed_id: str) -> Optional[BreedRecord]:
+        """Look up a breed by its id"""
+        return self._by_id.get(breed_id)
+
+    def resolve(self, label: str) -> Optional[BreedRecord]:
+        """Look up a breed by id, English name or Hindi name (case-insensitive)"""
+        record = self._by_id.get(label)
+        if record is not None:
+            return record
+        breed_id = self._by_name.get(_fold(label))
+        return self._by_id.get(breed_id) if breed_id else None
+
+    def by_type(self, animal_type: str) -> Tuple[BreedRecord, ...]:
+        return tuple(self._by_id[b] for b in self._by_type.get(animal_type, ()))
+
+    def type_rows(self, animal_type: str) -> frozenset:
+        """Record positions of one animal type"""
+        return frozenset(self._by_id[b].position for b in self._by_type.get(animal_type, ()))
+
+    def ranked(
+        self,
+        attribute: str = "carbon_score",
+        animal_type: Optional[str] = None,
+        descending: bool = True
+    ) -> List[BreedRecord]:
+        """Breeds ordered by an attribute, optionally for one animal type"""
+        result = self.query_engine.run(
+            QuerySpec(animal_type=animal_type, sort_by=attribute, descending=descending)
+        )
+        return [self._records[i] for i in result.rows]
+
+    def filter(
+        self,
+        animal_type: Optional[str] = None,
+        state: Optional[str] = None,
+        conservation_status: Optional[str] = None
+    ) -> List[BreedRecord]:
+        """
+        Breeds matching all given filters, in catalog order
+
+        - **state** matches any native state (case-insensitive)
+        - **conservation_status** matches as a case-insensitive substring
+        """
+        candidates: List[frozenset] = []
+        if animal_type:
+            candidates.append(frozenset(self._by_type.get(animal_type, ())))
+        if state:
+            candidates.append(self._by_native_state.get(_fold(state), frozenset()))
+        if conservation_status:
+            candidates.append(self._status_by_fragment.get(_fold(conservation_status), frozenset()))
+
+        if not candidates:
+            return list(self._records)
+
+        candidates.sort(key=len)
+        matched = candidates[0].intersection(*candidates[1:])
+        return sorted((self._by_id[b] for b in matched), key=lambda r: r.position)
+
+    def match_state(self, state_name: str) -> Optional[str]:
+        """Resolve a state name: exact (case-insensitive) first, then partial"""
+        key = _fold(state_name)
+        return self._state_by_key.get(key) or self._state_by_fragment.get(key)
+
+    def state_breeds(self, state: str) -> Tuple[BreedRecord, ...]:
+        return tuple(self._by_id[b] for b in self._state_breeds.get(state, ()))
+
+    @property
+    def state_mapping(self) -> Mapping[str, Tuple[str, ...]]:
+        """stateBreedMapping as listed in the data file"""
+        return self._state_ids
+
+    @property
+    def schemes(self) -> Mapping[str, Any]:
+        return self._schemes
+
+
+def get_catalog(request: Request) -> BreedCatalog:
+    """FastAPI dependency returning the currently loaded catalog"""
+    catalog = getattr(request.app.state, "catalog", None)
+    if catalog is None:
+        raise HTTPException(status_code=500, detail="Breed data not loaded")
+    return catalog
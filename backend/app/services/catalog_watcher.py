@@ -0,0 +1,100 @@
+"""
+Catalog Watcher Service
+Reloads breed_info.json and region_centroids.json in the background when either changes
+"""
+
+import asyncio
+from pathlib import Path
+from typing import Optional, Tuple
+
+from fastapi import FastAPI
+
+from app.services.catalog_service import CENTROIDS_FILENAME, BreedCatalog, CatalogError
+
+
+class CatalogWatcher:
+    """
+    Polls the breed and centroid files and swaps in a freshly built catalog
+
+    Parsing, validation and index building run in a worker thread, off the
+    request path. The new catalog replaces ``app.state.catalog`` with a single
+    reference assignment, so a request that already resolved its catalog keeps
+    using that consistent snapshot until it finishes.
+    """
+
+    def __init__(self, app: FastAPI, path: Path, interval: float = 2.0):
+        self.app = app
+        self.path = path
+        self.centroids_path = path.parent / CENTROIDS_FILENAME
+        self.interval = interval
+        self._signature = self._stat()
+        self._task: Optional[asyncio.Task] = None
+
+    def _stat(self) -> Optional[Tuple[Tuple[int, int], Optional[Tuple[int, int]]]]:
+        """(mtime, size) of the breed file and of the optional centroids file"""
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        try:
+            centroids = self.centroids_path.stat()
+            centroids_signature = (centroids.st_mtime_ns, centroids.st_size)
+        except OSError:
+            centroids_signature = None
+        return ((stat.st_mtime_ns, stat.st_size), centroids_signature)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            print(f"Watching {self.path.name} and {self.centroids_path.name} for changes every {self.interval}s")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception as e:
+                print(f"Catalog reload check failed: {e}")
+
+    async def check(self) -> bool:
+        """Reload the catalog if either file changed; returns True when swapped"""
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return False
+        # Remember the signature even if parsing fails, so a broken file is
+        # reported once and retried only after it is written again
+        self._signature = signature
+
+        try:
+            catalog = await asyncio.to_thread(BreedCatalog.from_file, self.path)
+        except (OSError, CatalogError) as e:
+            print(f"Keeping current breed catalog, reload rejected: {e}")
+            return False
+
+        current = getattr(self.app.state, "catalog", None)
+        if current is not None and current.version == catalog.version:
+            return False
+
+        # Log first, then swap with no await in between; /sync waits out the
+        # moment the two disagree rather than mixing their versions
+        sync_log = getattr(self.app.state, "sync_log", None)
+        if sync_log is not None:
+            await asyncio.to_thread(sync_log.update, catalog)
+
+        self.app.state.catalog = catalog
+        # Entries are keyed by catalog version; drop the old ones eagerly
+        response_cache = getattr(self.app.state, "response_cache", None)
+        if response_cache is not None:
+            response_cache.clear()
+
+        print(f"Breed catalog reloaded: version {catalog.version} ({len(catalog)} breeds)")
+        return True
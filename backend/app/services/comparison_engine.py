@@ -0,0 +1,227 @@
+"""
+Comparison Engine Service
+Pairwise and preset breed comparisons precomputed at catalog load
+"""
+
+import threading
+from collections import OrderedDict
+from itertools import permutations
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.breed_parsing import NumericColumns
+from app.services.breed_query import FEATURES, LOWER_IS_BETTER, BreedQueryEngine, QuerySpec
+
+# Quick comparison groups shown on the frontend compare page
+COMPARISON_PRESETS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "dairy": ("Best for Dairy", ("gir", "sahiwal", "murrah", "mehsana")),
+    "sustainable": ("Most Sustainable", ("vechur", "punganur", "gir", "sahiwal")),
+    "budget": ("Budget Friendly", ("red_sindhi", "hariana", "nagpuri", "bhadawari")),
+    "heat": ("Heat Tolerant", ("tharparkar", "kankrej", "ongole", "kangayam")),
+}
+
+# Catalogs up to this size get every ordered pair rendered at load; larger
+# ones render pairs on first request and keep them in a bounded memo
+PRECOMPUTE_PAIRS_LIMIT = 300
+PAIR_MEMO_SIZE = 4096
+
+# Insight name -> (attribute, descending) for multi-breed comparisons
+MULTI_INSIGHTS: Dict[str, Tuple[str, bool]] = {
+    "best_sustainability": ("carbon_score", True),
+    "highest_milk_yield": ("milk_yield", True),
+    "highest_fat_content": ("fat_content", True),
+    "lowest_purchase_cost": ("purchase_cost", False),
+    "best_heat_tolerance": ("heat_tolerance", True),
+}
+
+
+def extract_metrics(record: Any, numeric: NumericColumns) -> Dict[str, Any]:
+    """Side-by-side comparison metrics of one breed"""
+    data = record.data
+    productivity = data.get("productivity", {})
+    sustainability = data.get("sustainability", {})
+    economic = data.get("economicValue", {})
+    population = data.get("population", {})
+    return {
+        "id": record.id,
+        "name": data.get("name", ""),
+        "name_hindi": data.get("nameHindi", ""),
+        "type": record.animal_type,
+        "native_states": data.get("nativeState", []),
+        "productivity": {
+            "milk_yield_per_day": productivity.get("milkYieldPerDay", "N/A"),
+            "lactation_yield": productivity.get("lactationYield", "N/A"),
+            "fat_content": productivity.get("fatContent", "N/A"),
+            "lactation_period": productivity.get("lactationPeriod", "N/A")
+        },
+        "sustainability": {
+            "carbon_score": sustainability.get("carbonScore", 0),
+            "carbon_footprint": sustainability.get("carbonFootprint", "Unknown"),
+            "heat_tolerance": sustainability.get("heatTolerance", "Unknown"),
+            "disease_resistance": sustainability.get("diseaseResistance", "Unknown"),
+            "feed_efficiency": sustainability.get("feedEfficiency", "Unknown"),
+            "climate_adaptability": sustainability.get("climateAdaptability", "Unknown")
+        },
+        "economic": {
+            "purchase_cost": economic.get("purchaseCost", "N/A"),
+            "maintenance_cost": economic.get("maintenanceCost", "N/A"),
+            "market_demand": economic.get("marketDemand", "Unknown")
+        },
+        "population": {
+            "status": population.get("status", "Unknown"),
+            "trend": population.get("trend", "unknown"),
+            "conservation_status": population.get("conservationStatus", "Unknown")
+        },
+        "best_for": data.get("bestFor", []),
+        "government_schemes": data.get("governmentSchemes", []),
+        "numeric": numeric.values(record.id)
+    }
+
+
+class ComparisonEngine:
+    """
+    Every pairwise comparison and preset group, rendered once per catalog
+
+    Per-breed metrics are extracted once and shared by reference between the
+    pair results, so a pair costs a few small dicts. Pair count grows with the
+    square of the catalog, so past PRECOMPUTE_PAIRS_LIMIT breeds pairs are
+    rendered on demand instead. Because the engine lives on the catalog, a
+    reloaded catalog brings a freshly built engine with it.
+    """
+
+    def __init__(self, records: Sequence[Any], numeric: NumericColumns, query_engine: BreedQueryEngine):
+        self._records = tuple(records)
+        self._query_engine = query_engine
+        self._metrics: Dict[str, Dict[str, Any]] = {
+            record.id: extract_metrics(record, numeric) for record in self._records
+        }
+
+        self._pairs: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._memo: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._memo_lock = threading.Lock()
+        if len(self._records) <= PRECOMPUTE_PAIRS_LIMIT:
+            for first, second in permutations(range(len(self._records)), 2):
+                a, b = self._records[first], self._records[second]
+                self._pairs[(a.id, b.id)] = self._build_pair(first, second)
+
+        presets: Dict[str, Dict[str, Any]] = {}
+        for preset_id, (name, breed_ids) in COMPARISON_PRESETS.items():
+            available = [b for b in breed_ids if b in self._metrics]
+            if len(available) < 2:
+                continue
+            presets[preset_id] = {
+                "id": preset_id,
+                "name": name,
+                **self.compare_many(available)
+            }
+        self._presets = MappingProxyType(presets)
+
+    def __len__(self) -> int:
+        """Number of precomputed ordered pairs"""
+        return len(self._pairs)
+
+    @property
+    def precomputed(self) -> bool:
+        """Whether every pair was rendered at load"""
+        return len(self._records) <= PRECOMPUTE_PAIRS_LIMIT
+
+    def _build_pair(self, first: int, second: int) -> Dict[str, Any]:
+        a, b = self._records[first], self._records[second]
+        metrics_a, metrics_b = self._metrics[a.id], self._metrics[b.id]
+        score_a = metrics_a["sustainability"]["carbon_score"]
+        score_b = metrics_b["sustainability"]["carbon_score"]
+
+        values = self._query_engine.matrix
+        deltas: Dict[str, Optional[float]] = {}
+        winners: Dict[str, Optional[str]] = {}
+        for j, attribute in enumerate(FEATURES):
+            value_a, value_b = values[first, j], values[second, j]
+            if np.isnan(value_a) or np.isnan(value_b):
+                deltas[attribute] = winners[attribute] = None
+                continue
+            deltas[attribute] = float(value_a - value_b)
+            if value_a == value_b:
+                winners[attribute] = None
+            elif (value_a < value_b) == (attribute in LOWER_IS_BETTER):
+                winners[attribute] = a.id
+            else:
+                winners[attribute] = b.id
+
+        if score_a > score_b:
+            recommendation = f"{metrics_a['name']} has better sustainability score ({score_a} vs {score_b})"
+        else:
+            recommendation = f"{metrics_b['name']} has better sustainability score ({score_b} vs {score_a})"
+
+        return {
+            "breeds": [metrics_a, metrics_b],
+            "comparison_metrics": {
+                "carbon_score_difference": score_a - score_b,
+                "better_carbon_score": a.id if score_a > score_b else b.id,
+                "same_animal_type": a.animal_type == b.animal_type,
+                "deltas": deltas,
+                "winners": winners
+            },
+            "recommendation": recommendation
+        }
+
+    def metrics(self, breed_id: str) -> Optional[Dict[str, Any]]:
+        return self._metrics.get(breed_id)
+
+    def pair(self, breed1: str, breed2: str) -> Optional[Dict[str, Any]]:
+        """Comparison of two breeds (possibly the same one), None if either is unknown"""
+        key = (breed1, breed2)
+        result = self._pairs.get(key)
+        if result is not None:
+            return result
+
+        positions = self._query_engine.positions
+        if breed1 not in positions or breed2 not in positions:
+            return None
+        with self._memo_lock:
+            result = self._memo.get(key)
+            if result is not None:
+                self._memo.move_to_end(key)
+                return result
+
+        result = self._build_pair(positions[breed1], positions[breed2])
+        with self._memo_lock:
+            self._memo[key] = result
+            while len(self._memo) > PAIR_MEMO_SIZE:
+                self._memo.popitem(last=False)
+        return result
+
+    def compare_many(self, breed_ids: Sequence[str]) -> Dict[str, Any]:
+        """Summary rows and category leaders for a group of known breeds"""
+        results: List[Dict[str, Any]] = []
+        for breed_id in breed_ids:
+            metrics = self._metrics[breed_id]
+            results.append({
+                "id": breed_id,
+                "name": metrics["name"],
+                "type": metrics["type"],
+                "milk_yield": metrics["productivity"]["milk_yield_per_day"],
+                "carbon_score": metrics["sustainability"]["carbon_score"],
+                "purchase_cost": metrics["economic"]["purchase_cost"],
+                "conservation_status": metrics["population"]["conservation_status"],
+                "heat_tolerance": metrics["sustainability"]["heat_tolerance"]
+            })
+
+        insights: Dict[str, Any] = {}
+        for insight, (attribute, descending) in MULTI_INSIGHTS.items():
+            ranked = self._query_engine.run(QuerySpec(
+                breed_ids=breed_ids, sort_by=attribute, descending=descending, limit=1
+            ))
+            insights[insight] = self._records[ranked.rows[0]].name if len(ranked.rows) else None
+        insights["total_compared"] = len(results)
+
+        return {
+            "breeds": results,
+            "insights": insights
+        }
+
+    @property
+    def presets(self) -> Mapping[str, Dict[str, Any]]:
+        """Precomputed preset comparisons by preset id"""
+        return self._presets
@@ -0,0 +1,180 @@
+"""
+Geo Index Service
+Grid spatial index over state and native-region centroids
+"""
+
+import math
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180.0
+
+# Grid cell size in degrees (~220 km of latitude)
+CELL_DEGREES = 2.0
+
+
+class GeoDataError(ValueError):
+    """Raised when the centroid table does not have the expected structure"""
+
+
+def haversine_km(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Great-circle distance from one point to many, in kilometres"""
+    lat1, lng1 = math.radians(lat), math.radians(lng)
+    lat2, lng2 = np.radians(lats), np.radians(lngs)
+    a = (
+        np.sin((lat2 - lat1) / 2.0) ** 2
+        + math.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2.0) ** 2
+    )
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _coordinates(entry: Any, label: str) -> Tuple[float, float]:
+    if not isinstance(entry, dict):
+        raise GeoDataError(f"Centroid for '{label}' must be an object with lat and lng")
+    try:
+        lat, lng = float(entry["lat"]), float(entry["lng"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise GeoDataError(f"Centroid for '{label}' needs numeric lat and lng") from e
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lng <= 180.0):
+        raise GeoDataError(f"Centroid for '{label}' is out of range")
+    return lat, lng
+
+
+@dataclass(frozen=True)
+class GeoPoint:
+    """A state or native-region centroid and the breeds it stands for"""
+    kind: str
+    name: str
+    lat: float
+    lng: float
+    rows: Tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class BreedDistance:
+    """A breed and its closest centroid to the query location"""
+    row: int
+    distance_km: float
+    point: GeoPoint
+
+
+class GeoIndex:
+    """
+    Spatial lookup from a location to nearby breed homelands
+
+    Each state centroid stands for the breeds native to that state and each
+    native-region centroid for its own breed. Points are bucketed into a
+    fixed degree grid, so a query only computes haversine distances for the
+    cells overlapping its search radius.
+    """
+
+    def __init__(
+        self,
+        records: Sequence[Any],
+        state_ids: Mapping[str, Sequence[str]],
+        centroids: Optional[Dict[str, Any]] = None
+    ):
+        centroids = centroids or {}
+        if not isinstance(centroids, dict):
+            raise GeoDataError("Centroid table must be a JSON object")
+        states = centroids.get("states", {})
+        regions = centroids.get("regions", {})
+        if not isinstance(states, dict) or not isinstance(regions, dict):
+            raise GeoDataError("'states' and 'regions' must be JSON objects")
+
+        position = {record.id: i for i, record in enumerate(records)}
+        state_rows: Dict[str, set] = defaultdict(set)
+        for state, breed_ids in state_ids.items():
+            state_rows[state].update(position[b] for b in breed_ids if b in position)
+        for i, record in enumerate(records):
+            for state in record.data.get("nativeState", []):
+                state_rows[state].add(i)
+
+        points: List[GeoPoint] = []
+        for state, entry in states.items():
+            lat, lng = _coordinates(entry, state)
+            points.append(GeoPoint("state", state, lat, lng, tuple(sorted(state_rows.get(state, ())))))
+        for breed_id, entries in regions.items():
+            if not isinstance(entries, list):
+                raise GeoDataError(f"Regions for '{breed_id}' must be a list")
+            if breed_id not in position:
+                continue
+            for entry in entries:
+                name = entry.get("name", breed_id) if isinstance(entry, dict) else breed_id
+                lat, lng = _coordinates(entry, name)
+                points.append(GeoPoint("region", name, lat, lng, (position[breed_id],)))
+
+        self.points: Tuple[GeoPoint, ...] = tuple(points)
+        self.lats = np.array([p.lat for p in points], dtype=np.float64)
+        self.lngs = np.array([p.lng for p in points], dtype=np.float64)
+
+        grid: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for i, point in enumerate(points):
+            grid[self._cell(point.lat, point.lng)].append(i)
+        self._grid = {cell: np.array(indices) for cell, indices in grid.items()}
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    @staticmethod
+    def _cell(lat: float, lng: float) -> Tuple[int, int]:
+        return (math.floor(lat / CELL_DEGREES), math.floor(lng / CELL_DEGREES))
+
+    def _candidates(self, lat: float, lng: float, radius_km: float) -> np.ndarray:
+        """Indices of points in grid cells overlapping the search radius"""
+        dlat = radius_km / KM_PER_DEGREE
+        cos_lat = max(math.cos(math.radians(lat)), 0.01)
+        dlng = radius_km / (KM_PER_DEGREE * cos_lat)
+        if dlng >= 180.0 or dlat >= 90.0:
+            return np.arange(len(self.points))
+
+        low_lat, low_lng = self._cell(lat - dlat, lng - dlng)
+        high_lat, high_lng = self._cell(lat + dlat, lng + dlng)
+        cells = (high_lat - low_lat + 1) * (high_lng - low_lng + 1)
+        if cells >= len(self._grid):
+            # Cheaper to scan every occupied cell than to probe empty ones
+            found = [
+                indices for (i, j), indices in self._grid.items()
+                if low_lat <= i <= high_lat and low_lng <= j <= high_lng
+            ]
+        else:
+            found = [
+                self._grid[(i, j)]
+                for i in range(low_lat, high_lat + 1)
+                for j in range(low_lng, high_lng + 1)
+                if (i, j) in self._grid
+            ]
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    def nearest_points(self, lat: float, lng: float, radius_km: float) -> List[Tuple[GeoPoint, float]]:
+        """Centroids within radius_km, closest first"""
+        candidates = self._candidates(lat, lng, radius_km)
+        if not len(candidates):
+            return []
+        distances = haversine_km(lat, lng, self.lats[candidates], self.lngs[candidates])
+        inside = distances <= radius_km
+        candidates, distances = candidates[inside], distances[inside]
+        order = np.lexsort((candidates, distances))
+        return [(self.points[candidates[i]], float(distances[i])) for i in order]
+
+    def nearby_breeds(
+        self,
+        lat: float,
+        lng: float,
+        radius_km: float,
+        rows: Optional[frozenset] = None
+    ) -> List[BreedDistance]:
+        """Breeds with a homeland centroid within radius_km, by distance to the closest one"""
+        seen = set()
+        results: List[BreedDistance] = []
+        for point, distance in self.nearest_points(lat, lng, radius_km):
+            for row in point.rows:
+                if row in seen or (rows is not None and row not in rows):
+                    continue
+                seen.add(row)
+                results.append(BreedDistance(row=row, distance_km=distance, point=point))
+        return results
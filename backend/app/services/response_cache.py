@@ -0,0 +1,165 @@
+"""
+Response Cache Service
+Pre-serialized, precompressed and ETag'd responses for catalog routes
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+from app.config import settings
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 512
+
+
+def encode_json(content: Any) -> bytes:
+    """Encode content exactly like FastAPI's JSONResponse does"""
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """One encoded response and its compressed variants"""
+    etag: str
+    body: bytes
+    gzip_body: Optional[bytes] = None
+    br_body: Optional[bytes] = None
+
+    @classmethod
+    def from_content(cls, content: Any) -> "CachedResponse":
+        body = encode_json(content)
+        etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+        gzip_body = br_body = None
+        if len(body) >= MIN_COMPRESS_SIZE:
+            gzip_body = gzip.compress(body, compresslevel=9, mtime=0)
+            if BROTLI_AVAILABLE:
+                br_body = brotli.compress(body, quality=11)
+        return cls(etag=etag, body=body, gzip_body=gzip_body, br_body=br_body)
+
+    def variant_etag(self, encoding: Optional[str]) -> str:
+        """Strong ETags must differ per content-coding"""
+        if not encoding:
+            return self.etag
+        return self.etag[:-1] + "-" + encoding + '"'
+
+    def matches(self, if_none_match: str) -> bool:
+        """Check an If-None-Match header against every variant of this response"""
+        if if_none_match.strip() == "*":
+            return True
+        known = {self.etag, self.variant_etag("gzip"), self.variant_etag("br")}
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag.startswith("W/"):
+                tag = tag[2:]
+            if tag in known:
+                return True
+        return False
+
+    def negotiate(self, accept_encoding: str):
+        """Pick the best stored body for an Accept-Encoding header"""
+        accepted = set()
+        for part in accept_encoding.lower().split(","):
+            token, _, params = part.strip().partition(";")
+            quality = 1.0
+            for param in params.split(";"):
+                name, _, value = param.strip().partition("=")
+                if name == "q":
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            if quality > 0:
+                accepted.add(token.strip())
+
+        if self.br_body is not None and ("br" in accepted or "*" in accepted):
+            return "br", self.br_body
+        if self.gzip_body is not None and ("gzip" in accepted or "*" in accepted):
+            return "gzip", self.gzip_body
+        return None, self.body
+
+
+class ResponseCache:
+    """
+    Bounded LRU of encoded catalog responses
+
+    Keys should include the catalog version so a reloaded catalog never
+    serves bytes rendered from an older one.
+    """
+
+    def __init__(self, max_entries: int = settings.RESPONSE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Any]) -> CachedResponse:
+        """Return the cached response for key, rendering it with build() on a miss"""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                return cached
+
+        # Render outside the lock; a concurrent miss at worst renders twice
+        cached = CachedResponse.from_content(build())
+
+        with self._lock:
+            self._entries[key] = cached
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return cached
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def respond(self, request: Request, key: Hashable, build: Callable[[], Any]) -> Response:
+        """Serve a cached response with ETag revalidation and content negotiation"""
+        cached = self.get_or_build(key, build)
+        headers = {
+            "Cache-Control": f"public, max-age={settings.RESPONSE_CACHE_MAX_AGE}",
+            "Vary": "Accept-Encoding",
+        }
+
+        encoding, body = cached.negotiate(request.headers.get("accept-encoding", ""))
+        headers["ETag"] = cached.variant_etag(encoding)
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and cached.matches(if_none_match):
+            return Response(status_code=304, headers=headers)
+
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+def get_response_cache(request: Request) -> ResponseCache:
+    """FastAPI dependency returning the shared response cache"""
+    cache = getattr(request.app.state, "response_cache", None)
+    if cache is None:
+        cache = request.app.state.response_cache = ResponseCache()
+    return cache
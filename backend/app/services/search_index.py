@@ -0,0 +1,194 @@
+"""
+Search Index Service
+Fuzzy multilingual breed search over an inverted index and character trigrams
+"""
+
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+# Field name -> weight of a hit in that field
+FIELD_WEIGHTS: Dict[str, float] = {
+    "name": 10.0,
+    "name_hindi": 10.0,
+    "id": 8.0,
+    "native_state": 4.0,
+    "native_region": 3.0,
+    "best_for": 3.0,
+    "characteristics": 1.5,
+    "climate": 1.0,
+}
+
+# Similarity credited to a term that the query token only starts
+PREFIX_SIMILARITY = 0.9
+# Minimum Dice coefficient over trigrams for a typo match
+FUZZY_THRESHOLD = 0.45
+# Shorter tokens are too ambiguous for prefix or typo matching
+MIN_FUZZY_LENGTH = 3
+
+STOP_WORDS = frozenset({"a", "an", "and", "of", "the", "in", "for", "to", "with", "or"})
+
+
+def normalize(text: str) -> str:
+    """Case-fold and compose text so 'Nili-Ravi' and 'nili ravi' tokenize alike"""
+    return unicodedata.normalize("NFKC", text).casefold()
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into word tokens
+
+    Letters, combining marks and digits form words, so Devanagari vowel
+    signs stay attached to their consonants ('गिर' is one token).
+    """
+    tokens: List[str] = []
+    current: List[str] = []
+    for char in normalize(text):
+        if unicodedata.category(char)[0] in ("L", "M", "N"):
+            current.append(char)
+        elif current:
+            tokens.append("".join(current))
+            current = []
+    if current:
+        tokens.append("".join(current))
+    return [t for t in tokens if t not in STOP_WORDS]
+
+
+def trigrams(term: str) -> FrozenSet[str]:
+    """Character trigrams of a term padded with boundary markers"""
+    padded = f"${term}$"
+    if len(padded) < 3:
+        return frozenset({padded})
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """One ranked search result"""
+    row: int
+    score: float
+    fields: Tuple[str, ...]
+
+
+class BreedSearchIndex:
+    """
+    Inverted index over breed text fields plus a trigram index over its vocabulary
+
+    Each query token is matched exactly, as a prefix of an indexed term, or
+    by trigram similarity for misspellings and transliteration variants.
+    Multi-word names are also indexed in compact form ('niliravi').
+    """
+
+    def __init__(self, records: Sequence[Any]):
+        self._records = tuple(records)
+        # term -> {row: (weight, field)} keeping the strongest field per row
+        postings: Dict[str, Dict[int, Tuple[float, str]]] = defaultdict(dict)
+
+        def add(term: str, row: int, field: str) -> None:
+            weight = FIELD_WEIGHTS[field]
+            current = postings[term].get(row)
+            if current is None or current[0] < weight:
+                postings[term][row] = (weight, field)
+
+        for row, record in enumerate(self._records):
+            for field, text in self._fields(record):
+                tokens = tokenize(text)
+                for token in tokens:
+                    add(token, row, field)
+                if field in ("name", "id") and len(tokens) > 1:
+                    add("".join(tokens), row, field)
+
+        self._postings = {term: dict(rows) for term, rows in postings.items()}
+        self._vocabulary: Tuple[str, ...] = tuple(sorted(self._postings))
+        self._term_trigrams: Dict[str, FrozenSet[str]] = {
+            term: trigrams(term) for term in self._vocabulary
+        }
+        trigram_terms: Dict[str, Set[str]] = defaultdict(set)
+        for term, grams in self._term_trigrams.items():
+            for gram in grams:
+                trigram_terms[gram].add(term)
+        self._trigram_terms = {gram: frozenset(terms) for gram, terms in trigram_terms.items()}
+
+    @staticmethod
+    def _fields(record: Any) -> List[Tuple[str, str]]:
+        data = record.data
+        fields = [
+            ("id", record.id.replace("_", " ")),
+            ("name", data.get("name", "")),
+            ("name_hindi", data.get("nameHindi", "")),
+            ("native_region", data.get("nativeRegion", "")),
+            ("climate", data.get("sustainability", {}).get("climateAdaptability", "")),
+        ]
+        fields.extend(("native_state", state) for state in data.get("nativeState", []))
+        fields.extend(("best_for", tag) for tag in data.get("bestFor", []))
+        characteristics = data.get("characteristics", {})
+        if isinstance(characteristics, dict):
+            fields.extend(("characteristics", str(value)) for value in characteristics.values())
+        return [(field, text) for field, text in fields if isinstance(text, str) and text]
+
+    def __len__(self) -> int:
+        return len(self._vocabulary)
+
+    def _expand(self, token: str) -> Dict[str, float]:
+        """Indexed terms matching one query token, with their similarity"""
+        matches: Dict[str, float] = {}
+        if token in self._postings:
+            matches[token] = 1.0
+        if len(token) < MIN_FUZZY_LENGTH:
+            return matches
+
+        # Prefix matches for partially typed words
+        start = bisect_left(self._vocabulary, token)
+        for term in self._vocabulary[start:]:
+            if not term.startswith(token):
+                break
+            matches.setdefault(term, PREFIX_SIMILARITY)
+
+        # Trigram candidates for misspellings and transliterations
+        grams = trigrams(token)
+        shared: Dict[str, int] = defaultdict(int)
+        for gram in grams:
+            for term in self._trigram_terms.get(gram, ()):
+                shared[term] += 1
+        for term, count in shared.items():
+            similarity = 2.0 * count / (len(grams) + len(self._term_trigrams[term]))
+            if similarity >= FUZZY_THRESHOLD and similarity * PREFIX_SIMILARITY > matches.get(term, 0.0):
+                matches[term] = similarity * PREFIX_SIMILARITY
+        return matches
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        rows: Optional[FrozenSet[int]] = None
+    ) -> List[SearchHit]:
+        """Rank breeds for a free-text query, optionally restricted to some rows"""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        # "nili ravi" and "niliravi" should both reach the compact name term
+        if len(tokens) > 1:
+            tokens.append("".join(tokens))
+
+        scores: Dict[int, float] = defaultdict(float)
+        fields: Dict[int, Set[str]] = defaultdict(set)
+        for token in tokens:
+            best: Dict[int, Tuple[float, str]] = {}
+            for term, similarity in self._expand(token).items():
+                for row, (weight, field) in self._postings[term].items():
+                    if rows is not None and row not in rows:
+                        continue
+                    score = weight * similarity
+                    if row not in best or best[row][0] < score:
+                        best[row] = (score, field)
+            for row, (score, field) in best.items():
+                scores[row] += score
+                fields[row].add(field)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [
+            SearchHit(row=row, score=round(score, 3), fields=tuple(sorted(fields[row])))
+            for row, score in ranked[:limit]
+        ]
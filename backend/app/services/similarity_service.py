@@ -0,0 +1,223 @@
+"""
+Similarity Service
+Breed feature embeddings for nearest-neighbour and farm-profile recommendations
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.breed_query import FEATURES, BreedQueryEngine, QueryError
+from app.services.search_index import tokenize
+
+# Tag -> words in climateAdaptability text that imply it
+CLIMATE_TAGS: Dict[str, Tuple[str, ...]] = {
+    "hot": ("hot", "heat", "desert", "tropical"),
+    "humid": ("humid", "coastal"),
+    "arid": ("arid", "dry", "desert", "ravine"),
+    "tropical": ("tropical",),
+    "coastal": ("coastal",),
+    "hilly": ("hilly", "hill", "altitude", "plateau"),
+    "cold": ("cold", "temperate"),
+}
+
+# Tag -> words in bestFor entries that imply it
+PURPOSE_TAGS: Dict[str, Tuple[str, ...]] = {
+    "dairy": ("dairy", "milk", "ghee", "fat", "yield"),
+    "draught": ("draught", "work", "transport", "racing"),
+    "dual_purpose": ("dual",),
+    "low_input": ("low", "small", "harsh"),
+    "conservation": ("conservation",),
+}
+
+# Relative weight of each attribute group in the similarity embedding
+GROUP_WEIGHTS: Dict[str, float] = {
+    **{name: 1.0 for name in FEATURES},
+    "climate": 1.5,
+    "purpose": 1.5,
+    "animal_type": 1.0,
+}
+
+
+def extract_tags(text: str, vocabulary: Dict[str, Tuple[str, ...]]) -> List[str]:
+    """Tags whose keywords appear in text"""
+    words = set(tokenize(text))
+    return [tag for tag, keywords in vocabulary.items() if words.intersection(keywords)]
+
+
+@dataclass
+class FarmProfile:
+    """What a farmer needs from a breed"""
+    animal_type: Optional[str] = None
+    climate: Sequence[str] = ()
+    purpose: Sequence[str] = ()
+    max_purchase_cost: Optional[float] = None
+    priorities: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class Neighbour:
+    """One ranked breed with its score broken down by attribute"""
+    row: int
+    score: float
+    contributions: Dict[str, float]
+
+
+class BreedEmbeddings:
+    """
+    Normalized feature vectors for every breed
+
+    Numeric and ordinal attributes are standardized (missing values sit at
+    the catalog mean), climate and purpose keywords become binary tags, and
+    every vector is scaled to unit length. Similarity to one breed is then
+    a single matrix-vector product, and top-k uses argpartition, so cost
+    grows linearly with the catalog.
+    """
+
+    def __init__(self, records: Sequence[Any], query_engine: BreedQueryEngine):
+        self._records = tuple(records)
+        self._query_engine = query_engine
+        n = len(self._records)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            raw = query_engine.matrix
+            mean = np.nanmean(raw, axis=0) if n else np.zeros(raw.shape[1])
+            std = np.nanstd(raw, axis=0) if n else np.ones(raw.shape[1])
+            standardized = (raw - mean) / np.where(std > 0, std, 1.0)
+        standardized = np.nan_to_num(standardized, nan=0.0)
+
+        climate = np.zeros((n, len(CLIMATE_TAGS)))
+        purpose = np.zeros((n, len(PURPOSE_TAGS)))
+        animal = np.zeros((n, 2))
+        for i, record in enumerate(self._records):
+            climate_text = record.data.get("sustainability", {}).get("climateAdaptability", "")
+            for tag in extract_tags(climate_text if isinstance(climate_text, str) else "", CLIMATE_TAGS):
+                climate[i, list(CLIMATE_TAGS).index(tag)] = 1.0
+            for entry in record.data.get("bestFor", []):
+                for tag in extract_tags(entry if isinstance(entry, str) else "", PURPOSE_TAGS):
+                    purpose[i, list(PURPOSE_TAGS).index(tag)] = 1.0
+            animal[i, 0 if record.animal_type == "cattle" else 1] = 1.0
+        self.climate_tags = climate
+        self.purpose_tags = purpose
+
+        # Column -> attribute group, so contributions can be summed per attribute
+        groups = list(FEATURES)
+        groups += ["climate"] * len(CLIMATE_TAGS) + ["purpose"] * len(PURPOSE_TAGS) + ["animal_type"] * 2
+        self.groups: Tuple[str, ...] = tuple(dict.fromkeys(groups))
+        self._group_matrix = np.zeros((len(groups), len(self.groups)))
+        self._group_matrix[np.arange(len(groups)), [self.groups.index(g) for g in groups]] = 1.0
+
+        # Tag groups are spread over several columns; keep each group's total weight equal
+        column_weights = np.array([
+            np.sqrt(GROUP_WEIGHTS[g] / groups.count(g)) for g in groups
+        ])
+        vectors = np.hstack([standardized, climate, purpose, animal]) * column_weights
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms > 0, norms, 1.0)
+        vectors.flags.writeable = False
+        self.vectors = vectors
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def _group_sums(self, columns: np.ndarray) -> np.ndarray:
+        """Sum per-column values of shape (k, columns) into (k, groups)"""
+        return columns @ self._group_matrix
+
+    @staticmethod
+    def _top(scores: np.ndarray, candidates: np.ndarray, k: int) -> np.ndarray:
+        """Indices into candidates of the k highest scores, best first"""
+        if len(candidates) > k:
+            part = np.argpartition(-scores[candidates], k - 1)[:k]
+            candidates = candidates[part]
+        return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+    def similar(self, row: int, k: int = 5, same_type: bool = False) -> List[Neighbour]:
+        """Nearest breeds to one breed by cosine similarity"""
+        target = self.vectors[row]
+        scores = self.vectors @ target
+
+        candidates = np.ones(len(self._records), dtype=bool)
+        candidates[row] = False
+        if same_type:
+            animal_type = self._records[row].animal_type
+            candidates &= self._query_engine.animal_types == animal_type
+        rows = self._top(scores, np.flatnonzero(candidates), k)
+
+        contributions = self._group_sums(self.vectors[rows] * target)
+        return [
+            Neighbour(
+                row=int(r),
+                score=round(float(scores[r]), 4),
+                contributions={g: round(float(v), 4) for g, v in zip(self.groups, contributions[i]) if v}
+            )
+            for i, r in enumerate(rows)
+        ]
+
+    def recommend(self, profile: FarmProfile, k: int = 5) -> List[Neighbour]:
+        """
+        Breeds ranked for a farm profile
+
+        Each priority weight scores the catalog-wide 0-1 benefit of an
+        attribute; requested climate and purpose tags score by the share of
+        them a breed has. The total is normalized by the sum of weights.
+        """
+        for tag in profile.climate:
+            if tag not in CLIMATE_TAGS:
+                raise QueryError(f"Unknown climate '{tag}'. Available: {', '.join(CLIMATE_TAGS)}")
+        for tag in profile.purpose:
+            if tag not in PURPOSE_TAGS:
+                raise QueryError(f"Unknown purpose '{tag}'. Available: {', '.join(PURPOSE_TAGS)}")
+        for name in profile.priorities:
+            if name not in FEATURES:
+                raise QueryError(f"Unknown attribute '{name}'. Available: {', '.join(FEATURES)}")
+
+        engine = self._query_engine
+        columns: List[np.ndarray] = []
+        names: List[str] = []
+        weights: List[float] = []
+        for name, weight in profile.priorities.items():
+            columns.append(engine.benefit[:, engine.feature_index[name]])
+            names.append(name)
+            weights.append(float(weight))
+        if profile.climate:
+            selected = [list(CLIMATE_TAGS).index(t) for t in profile.climate]
+            columns.append(self.climate_tags[:, selected].mean(axis=1))
+            names.append("climate")
+            weights.append(GROUP_WEIGHTS["climate"])
+        if profile.purpose:
+            selected = [list(PURPOSE_TAGS).index(t) for t in profile.purpose]
+            columns.append(self.purpose_tags[:, selected].mean(axis=1))
+            names.append("purpose")
+            weights.append(GROUP_WEIGHTS["purpose"])
+        if not columns:
+            # No preferences: fall back to overall sustainability
+            columns.append(engine.benefit[:, engine.feature_index["carbon_score"]])
+            names.append("carbon_score")
+            weights.append(1.0)
+
+        weight_vector = np.array(weights)
+        total = np.abs(weight_vector).sum()
+        if total == 0:
+            raise QueryError("At least one weight must be non-zero")
+        contributions = np.column_stack(columns) * (weight_vector / total)
+        scores = contributions.sum(axis=1)
+
+        candidates = np.ones(len(self._records), dtype=bool)
+        if profile.animal_type:
+            candidates &= engine.animal_types == profile.animal_type
+        if profile.max_purchase_cost is not None:
+            cost = engine.matrix[:, engine.feature_index["purchase_cost"]]
+            with np.errstate(invalid="ignore"):
+                candidates &= cost <= profile.max_purchase_cost
+        rows = self._top(scores, np.flatnonzero(candidates), k)
+
+        return [
+            Neighbour(
+                row=int(r),
+                score=round(float(scores[r]), 4),
+                contributions={n: round(float(v), 4) for n, v in zip(names, contributions[r])}
+            )
+            for r in rows
+        ]
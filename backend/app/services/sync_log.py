@@ -0,0 +1,152 @@
+"""
+Sync Log Service
+Per-record change log of the breed catalog for delta sync clients
+"""
+
+import hashlib
+import json
+import os
+import secrets
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+from app.services.catalog_service import BreedCatalog
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Record kinds clients can sync
+SYNC_KINDS = ("breed", "scheme")
+
+
+def record_payloads(catalog: BreedCatalog) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """Every syncable record of a catalog keyed by (kind, id)"""
+    records: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for record in catalog:
+        records[("breed", record.id)] = record.detail()
+    for scheme_id, scheme in catalog.schemes.items():
+        records[("scheme", scheme_id)] = {"id": scheme_id, "data": scheme}
+    return records
+
+
+def _digest(payload: Any) -> str:
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class SyncLog:
+    """
+    Monotonic change log over catalog records
+
+    Every catalog load is diffed against the last known content hash of each
+    record; changed and new records get the next sequence number, removed
+    ones become tombstones. A client token is ``<log id>.<sequence>``; a
+    token from another log (e.g. after the file was deleted) forces a full
+    sync. The log is persisted so tokens survive restarts.
+
+    ``catalog_version`` is the catalog the log was last updated from; a
+    request holding a different catalog must not pair its record bodies
+    with this log's versions and token.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self.log_id = secrets.token_hex(4)
+        self.sequence = 0
+        # "kind:id" -> {"hash": str | None, "version": int}; hash None marks a deletion
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self.catalog_version: Optional[str] = None
+        self._load()
+
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            state = json.loads(self.path.read_text(encoding="utf-8"))
+            self.log_id = str(state["log_id"])
+            self.sequence = int(state["sequence"])
+            self._entries = dict(state["entries"])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Sync log unreadable, starting a new one: {e}")
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        state = {"log_id": self.log_id, "sequence": self.sequence, "entries": self._entries}
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            tmp.write_text(json.dumps(state, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"Could not persist sync log: {e}")
+
+    @property
+    def token(self) -> str:
+        return f"{self.log_id}.{self.sequence}"
+
+    def update(self, catalog: BreedCatalog) -> int:
+        """Record changes between the logged state and catalog; returns how many"""
+        current = {f"{kind}:{rid}": _digest(p) for (kind, rid), p in record_payloads(catalog).items()}
+
+        with self._lock:
+            changed = 0
+            for key, digest in current.items():
+                entry = self._entries.get(key)
+                if entry is None or entry["hash"] != digest:
+                    self.sequence += 1
+                    self._entries[key] = {"hash": digest, "version": self.sequence}
+                    changed += 1
+            for key, entry in self._entries.items():
+                if key not in current and entry["hash"] is not None:
+                    self.sequence += 1
+                    self._entries[key] = {"hash": None, "version": self.sequence}
+                    changed += 1
+            if changed:
+                self._save()
+            self.catalog_version = catalog.version
+        return changed
+
+    def parse_token(self, token: Optional[str]) -> Optional[int]:
+        """Sequence a token refers to, or None when a full sync is needed"""
+        if not token:
+            return None
+        log_id, _, sequence = token.partition(".")
+        if log_id != self.log_id or not sequence.isdigit():
+            return None
+        sequence = int(sequence)
+        return sequence if sequence <= self.sequence else None
+
+    def changes_since(self, sequence: Optional[int]) -> List[Tuple[str, str, int, bool]]:
+        """(kind, id, version, deleted) of records changed after sequence, oldest first"""
+        with self._lock:
+            changes = self._changes_since(sequence)
+        return sorted(changes, key=lambda change: change[2])
+
+    def changes_for(
+        self, catalog_version: str, sequence: Optional[int]
+    ) -> Optional[Tuple[str, List[Tuple[str, str, int, bool]]]]:
+        """
+        (token, changes since sequence) read together, or None while the log
+        was built from another catalog version than the caller's
+        """
+        with self._lock:
+            if catalog_version != self.catalog_version:
+                return None
+            token = self.token
+            changes = self._changes_since(sequence)
+        return token, sorted(changes, key=lambda change: change[2])
+
+    def _changes_since(self, sequence: Optional[int]) -> List[Tuple[str, str, int, bool]]:
+        since = sequence or 0
+        return [
+            (*key.split(":", 1), entry["version"], entry["hash"] is None)
+            for key, entry in self._entries.items()
+            if entry["version"] > since and (sequence is not None or entry["hash"] is not None)
+        ]
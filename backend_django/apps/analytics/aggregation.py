@@ -0,0 +1,290 @@
+"""
+Analytics aggregation
+Rebuild DailyStats, BreedPopularity and RegionalStats from raw rows
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.predictions.models import Prediction
+from apps.users.models import User, UserFavoriteBreed
+from .models import BreedPopularity, DailyStats, RegionalStats, UserActivity
+
+# Days aggregated per round of grouped queries
+CHUNK_DAYS = 31
+
+# Predictions reach the database late (write buffer, spool replay), still
+# carrying their original created_at, so a day stays open this long after
+# it ends: re-aggregated on every run and read live until then
+SETTLE_PERIOD = timedelta(hours=getattr(settings, 'ANALYTICS_SETTLE_HOURS', 48))
+
+DAILY_FIELDS = [
+    'total_predictions', 'cattle_predictions', 'buffalo_predictions',
+    'avg_confidence', 'high_confidence_count', 'low_confidence_count',
+    'unique_users', 'new_registrations', 'total_breed_views',
+    'total_comparisons', 'avg_processing_time_ms', 'updated_at',
+]
+POPULARITY_FIELDS = [
+    'prediction_count', 'view_count', 'favorite_count', 'comparison_count', 'popularity_score',
+]
+REGIONAL_FIELDS = ['predictions_count', 'users_count', 'top_breed']
+
+
+def day_start(day: date) -> datetime:
+    """Start of a calendar day in the current time zone"""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def aggregated_through() -> Optional[date]:
+    """
+    Last day whose DailyStats row is final
+
+    A row is final once it was computed SETTLE_PERIOD after its day ended,
+    late rows included. Days are aggregated in order, so only the newest
+    few rows can still be open.
+    """
+    open_days = SETTLE_PERIOD.days + 3
+    recent = DailyStats.objects.order_by('-date').values_list('date', 'updated_at')[:open_days]
+    for day, updated_at in recent:
+        if updated_at >= day_start(day + timedelta(days=1)) + SETTLE_PERIOD:
+            return day
+    return None
+
+
+def live_since() -> Optional[datetime]:
+    """Where raw rows take over from the aggregates; None when nothing is final"""
+    through = aggregated_through()
+    return day_start(through + timedelta(days=1)) if through else None
+
+
+def live_rows(queryset, field: str, through: Optional[date]):
+    """Raw rows the final aggregates do not cover yet"""
+    if through is None:
+        return queryset
+    return queryset.filter(**{f'{field}__gte': day_start(through + timedelta(days=1))})
+
+
+def merge_daily(*series: Iterable[Tuple[date, int]]) -> List[Dict[str, Any]]:
+    """Combine (date, count) pairs from stored and live rows into one series"""
+    counts: Dict[date, int] = defaultdict(int)
+    for pairs in series:
+        for day, count in pairs:
+            counts[day] += count
+    return [{'date': day, 'count': counts[day]} for day in sorted(counts) if counts[day]]
+
+
+def prediction_totals(through: Optional[date]) -> Dict[str, float]:
+    """All-time prediction count and averages: final days plus live rows"""
+    stored = {}
+    if through is not None:
+        stored = DailyStats.objects.filter(date__lte=through).aggregate(
+            total=Sum('total_predictions'),
+            confidence=Sum(F('avg_confidence') * F('total_predictions')),
+            processing=Sum(F('avg_processing_time_ms') * F('total_predictions')),
+        )
+    live = live_rows(Prediction.objects.all(), 'created_at', through).aggregate(
+        total=Count('id'),
+        confidence=Sum('breed_confidence'),
+        processing=Sum('processing_time_ms'),
+    )
+    total = (stored.get('total') or 0) + live['total']
+    if not total:
+        return {'total': 0, 'avg_confidence': 0, 'avg_processing_time_ms': 0}
+    return {
+        'total': total,
+        'avg_confidence': ((stored.get('confidence') or 0) + (live['confidence'] or 0)) / total,
+        'avg_processing_time_ms': ((stored.get('processing') or 0) + (live['processing'] or 0)) / total,
+    }
+
+
+def default_range() -> Tuple[Optional[date], date]:
+    """From the first non-final day (or the first prediction) through today"""
+    today = timezone.localdate()
+    through = aggregated_through()
+    if through is not None:
+        return min(through + timedelta(days=1), today), today
+    first = Prediction.objects.order_by('created_at').values_list('created_at', flat=True).first()
+    return (timezone.localdate(first) if first else None), today
+
+
+def _chunks(start: date, end: date) -> Iterator[Tuple[date, date]]:
+    while start <= end:
+        stop = min(start + timedelta(days=CHUNK_DAYS - 1), end)
+        yield start, stop
+        start = stop + timedelta(days=1)
+
+
+def _by_day(queryset, field: str, start: date, end: date):
+    """Rows in [start, end] grouped by the local date of field"""
+    return queryset.filter(**{
+        f'{field}__gte': day_start(start),
+        f'{field}__lt': day_start(end + timedelta(days=1)),
+    }).order_by().annotate(day=TruncDate(field))
+
+
+def _upsert(model, objs: List, unique_fields: List[str], update_fields: List[str]) -> None:
+    if objs:
+        model.objects.bulk_create(
+            objs, update_conflicts=True, unique_fields=unique_fields, update_fields=update_fields
+        )
+
+
+def _drop_stale(model, start: date, end: date, key_fields: Tuple[str, str], keep) -> int:
+    """Delete rows in the range whose key no longer has any source data"""
+    stale = [
+        pk for pk, *key in model.objects.filter(date__range=(start, end)).values_list('pk', *key_fields)
+        if tuple(key) not in keep
+    ]
+    if stale:
+        model.objects.filter(pk__in=stale).delete()
+    return len(stale)
+
+
+def aggregate_days(start: date, end: date) -> Dict[str, int]:
+    """
+    Recompute the analytics tables for every day in [start, end]
+
+    Six grouped queries per chunk of days, then idempotent upserts, so a
+    range can be re-run at any time. Days without predictions still get a
+    DailyStats row.
+    """
+    written = {'daily': 0, 'popularity': 0, 'regional': 0, 'removed': 0}
+    for chunk_start, chunk_end in _chunks(start, end):
+        for key, count in _aggregate_chunk(chunk_start, chunk_end).items():
+            written[key] += count
+    return written
+
+
+def _aggregate_chunk(start: date, end: date) -> Dict[str, int]:
+    predictions = _by_day(Prediction.objects.all(), 'created_at', start, end)
+
+    # Pass 1: daily prediction totals
+    daily = {
+        row['day']: row
+        for row in predictions.values('day').annotate(
+            total=Count('id'),
+            cattle=Count('id', filter=Q(animal_type='cattle')),
+            buffalo=Count('id', filter=Q(animal_type='buffalo')),
+            avg_confidence=Avg('breed_confidence'),
+            high=Count('id', filter=Q(breed_confidence__gt=0.8)),
+            low=Count('id', filter=Q(breed_confidence__lt=0.5)),
+            users=Count('user', distinct=True),
+            avg_time=Avg('processing_time_ms'),
+        )
+    }
+
+    # Pass 2: predictions per state and breed, summed below for both tables
+    per_state_breed = list(
+        predictions.values('day', 'user__state_id', 'predicted_breed_id').annotate(count=Count('id'))
+    )
+
+    # Pass 3: distinct predicting users per state
+    users_per_state = {
+        (row['day'], row['user__state_id']): row['users']
+        for row in predictions.exclude(user__state__isnull=True)
+        .values('day', 'user__state_id').annotate(users=Count('user', distinct=True))
+    }
+
+    # Pass 4: registrations
+    registrations = dict(
+        _by_day(User.objects.all(), 'date_joined', start, end)
+        .values('day').annotate(count=Count('id')).values_list('day', 'count')
+    )
+
+    # Pass 5: breed views and comparisons from the activity log
+    activity = list(
+        _by_day(UserActivity.objects.all(), 'created_at', start, end)
+        .filter(activity_type__in=['view_breed', 'compare'])
+        .values('day', 'activity_type', 'breed_id').annotate(count=Count('id'))
+    )
+
+    # Pass 6: favorites added
+    favorites = list(
+        _by_day(UserFavoriteBreed.objects.all(), 'created_at', start, end)
+        .values('day', 'breed_id').annotate(count=Count('id'))
+    )
+
+    breed_counts: Dict[Tuple[date, int], Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    state_counts: Dict[Tuple[date, int], int] = defaultdict(int)
+    state_top: Dict[Tuple[date, int], Tuple[int, int]] = {}
+    for row in per_state_breed:
+        day, state_id, breed_id, count = row['day'], row['user__state_id'], row['predicted_breed_id'], row['count']
+        if breed_id is not None:
+            breed_counts[(day, breed_id)]['prediction_count'] += count
+        if state_id is not None:
+            state_counts[(day, state_id)] += count
+            if breed_id is not None and count > state_top.get((day, state_id), (0, None))[0]:
+                state_top[(day, state_id)] = (count, breed_id)
+
+    views_per_day: Dict[date, int] = defaultdict(int)
+    comparisons_per_day: Dict[date, int] = defaultdict(int)
+    for row in activity:
+        field = 'view_count' if row['activity_type'] == 'view_breed' else 'comparison_count'
+        per_day = views_per_day if field == 'view_count' else comparisons_per_day
+        per_day[row['day']] += row['count']
+        if row['breed_id'] is not None:
+            breed_counts[(row['day'], row['breed_id'])][field] += row['count']
+    for row in favorites:
+        breed_counts[(row['day'], row['breed_id'])]['favorite_count'] += row['count']
+
+    now = timezone.now()
+    daily_rows = []
+    day = start
+    while day <= end:
+        stats = daily.get(day, {})
+        daily_rows.append(DailyStats(
+            date=day,
+            total_predictions=stats.get('total', 0),
+            cattle_predictions=stats.get('cattle', 0),
+            buffalo_predictions=stats.get('buffalo', 0),
+            avg_confidence=stats.get('avg_confidence') or 0,
+            high_confidence_count=stats.get('high', 0),
+            low_confidence_count=stats.get('low', 0),
+            unique_users=stats.get('users', 0),
+            new_registrations=registrations.get(day, 0),
+            total_breed_views=views_per_day.get(day, 0),
+            total_comparisons=comparisons_per_day.get(day, 0),
+            avg_processing_time_ms=round(stats.get('avg_time') or 0),
+            updated_at=now,
+        ))
+        day += timedelta(days=1)
+
+    popularity_rows = []
+    for (day, breed_id), counts in breed_counts.items():
+        row = BreedPopularity(breed_id=breed_id, date=day, **counts)
+        row.popularity_score = BreedPopularity.score(
+            row.prediction_count, row.view_count, row.favorite_count, row.comparison_count
+        )
+        popularity_rows.append(row)
+
+    regional_rows = [
+        RegionalStats(
+            state_id=state_id,
+            date=day,
+            predictions_count=count,
+            users_count=users_per_state.get((day, state_id), 0),
+            top_breed_id=state_top.get((day, state_id), (0, None))[1],
+        )
+        for (day, state_id), count in state_counts.items()
+    ]
+
+    with transaction.atomic():
+        _upsert(DailyStats, daily_rows, ['date'], DAILY_FIELDS)
+        _upsert(BreedPopularity, popularity_rows, ['breed', 'date'], POPULARITY_FIELDS)
+        _upsert(RegionalStats, regional_rows, ['state', 'date'], REGIONAL_FIELDS)
+        removed = _drop_stale(BreedPopularity, start, end, ('date', 'breed_id'), breed_counts.keys())
+        removed += _drop_stale(RegionalStats, start, end, ('date', 'state_id'), state_counts.keys())
+
+    return {
+        'daily': len(daily_rows),
+        'popularity': len(popularity_rows),
+        'regional': len(regional_rows),
+        'removed': removed,
+    }
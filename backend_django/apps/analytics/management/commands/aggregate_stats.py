@@ -0,0 +1,55 @@
+"""
+Django management command to aggregate DailyStats, BreedPopularity and RegionalStats
+"""
+
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.analytics.aggregation import aggregate_days, default_range
+
+
+class Command(BaseCommand):
+    help = 'Recompute the daily analytics tables from predictions, users and activity'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--start',
+            type=date.fromisoformat,
+            help='First day to aggregate (YYYY-MM-DD)'
+        )
+        parser.add_argument(
+            '--end',
+            type=date.fromisoformat,
+            help='Last day to aggregate (default: today)'
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            help='Aggregate this many days back from --end instead of --start'
+        )
+    
+    def handle(self, *args, **options):
+        end = options['end'] or timezone.localdate()
+        if options['days'] is not None:
+            start = end - timedelta(days=max(1, options['days']) - 1)
+        elif options['start']:
+            start = options['start']
+        else:
+            # Everything not yet final: the last partial day through today
+            start, _ = default_range()
+            if start is None:
+                self.stdout.write('No predictions to aggregate')
+                return
+        if start > end:
+            raise CommandError(f'--start {start} is after --end {end}')
+        
+        written = aggregate_days(start, end)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Aggregated {start} to {end}: {written['daily']} daily, "
+                f"{written['popularity']} breed and {written['regional']} regional rows "
+                f"({written['removed']} stale rows removed)"
+            )
+        )
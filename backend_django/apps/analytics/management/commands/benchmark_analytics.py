@@ -0,0 +1,234 @@
+"""
+Django management command to benchmark the analytics endpoints and suggest indexes
+"""
+
+import json
+import re
+import statistics
+import time
+from collections import defaultdict
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import resolve, reverse
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.breeds.models import Breed
+from apps.predictions.models import Prediction
+from apps.users.models import User
+
+# (label, url name, query string, who is signed in)
+ENDPOINTS = [
+    ('prediction stats', 'prediction-stats', '', None),
+    ('dashboard', 'dashboard-stats', '', None),
+    ('breed analytics', 'breed-analytics', '', None),
+    ('breed analytics detail', 'breed-analytics-detail', '', None),
+    ('popular breeds', 'popular-breeds', 'period=30', None),
+    ('recent activity', 'recent-activity', '', None),
+    ('map layers', 'map-layers', 'zoom=state', None),
+    ('user engagement', 'user-engagement', '', 'user'),
+    ('admin analytics', 'admin-analytics', '', 'admin'),
+]
+
+# Cache-free settings, so timings measure the queries rather than a cache hit
+UNCACHED = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+# Plan lines that mean a whole table is read
+FULL_SCAN_PATTERNS = [
+    re.compile(r'\bSCAN (?:TABLE )?(\w+)(?!.*\bUSING\b)'),   # SQLite
+    re.compile(r'Seq Scan on (\w+)'),                        # PostgreSQL
+    re.compile(r'\btable\W+(\w+)\W+type\W+ALL\b'),           # MySQL
+]
+
+EQUALITY_OPS = {'=', 'IN', 'IS'}
+
+
+class Command(BaseCommand):
+    help = 'Time analytics and prediction-stats endpoints, record query plans and suggest missing indexes'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Timed runs per endpoint'
+        )
+        parser.add_argument(
+            '--only',
+            type=str,
+            default='',
+            help='Only run endpoints whose label contains this text'
+        )
+        parser.add_argument(
+            '--json',
+            type=str,
+            default=None,
+            help='Write the full results, including query plans, to this file'
+        )
+        parser.add_argument(
+            '--no-explain',
+            action='store_true',
+            help='Skip query plans and index suggestions'
+        )
+    
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        users = {
+            'user': (
+                User.objects.annotate(n=Count('predictions')).order_by('-n').first()
+            ),
+            'admin': User.objects.filter(is_superuser=True).first() or User(is_staff=True, is_superuser=True),
+        }
+        top_breed = (
+            Prediction.objects.exclude(predicted_breed__isnull=True)
+            .values_list('predicted_breed__breed_id', flat=True).first()
+            or Breed.objects.values_list('breed_id', flat=True).first()
+        )
+        
+        self.stdout.write(
+            f'{Prediction.objects.count()} predictions, {User.objects.count()} users '
+            f'on {connection.vendor}'
+        )
+        self.stdout.write(
+            f"{'endpoint':<26}{'uncached ms':>12}{'cached ms':>11}{'queries':>9}{'sql ms':>9}"
+        )
+        
+        results = []
+        for label, url_name, query, signed_in in ENDPOINTS:
+            if options['only'] and options['only'] not in label:
+                continue
+            kwargs = {'breed_id': top_breed} if url_name == 'breed-analytics-detail' else {}
+            path = reverse(url_name, kwargs=kwargs)
+            user = users.get(signed_in) if signed_in else None
+            if signed_in and user is None:
+                self.stdout.write(f'{label:<26}skipped: no {signed_in} to sign in as')
+                continue
+            
+            def call():
+                request = factory.get(f'{path}?{query}' if query else path)
+                if user is not None:
+                    force_authenticate(request, user=user)
+                match = resolve(path)
+                response = match.func(request, *match.args, **match.kwargs)
+                if hasattr(response, 'render'):
+                    response.render()
+                return response
+            
+            timings = []
+            with override_settings(CACHES=UNCACHED):
+                for _ in range(max(1, options['repeat'])):
+                    with CaptureQueriesContext(connection) as captured:
+                        started = time.perf_counter()
+                        response = call()
+                        timings.append((time.perf_counter() - started) * 1000)
+            call()
+            started = time.perf_counter()
+            call()
+            cached_ms = (time.perf_counter() - started) * 1000
+            
+            queries = [
+                {'sql': q['sql'], 'ms': float(q['time']) * 1000}
+                for q in captured.captured_queries
+            ]
+            result = {
+                'endpoint': label,
+                'path': path,
+                'status': response.status_code,
+                'uncached_ms': statistics.median(timings),
+                'cached_ms': cached_ms,
+                'queries': len(queries),
+                'sql_ms': sum(q['ms'] for q in queries),
+                'slowest_queries': sorted(queries, key=lambda q: -q['ms'])[:5],
+            }
+            results.append(result)
+            self.stdout.write(
+                f"{label:<26}{result['uncached_ms']:>12.1f}{cached_ms:>11.1f}"
+                f"{result['queries']:>9}{result['sql_ms']:>9.1f}"
+            )
+        
+        suggestions = []
+        if not options['no_explain']:
+            suggestions = self._explain(results)
+            if suggestions:
+                self.stdout.write('\nSuggested indexes:')
+                for suggestion in suggestions:
+                    self.stdout.write(
+                        f"  {suggestion['model']}: models.Index(fields={suggestion['fields']!r})"
+                        f"  # full scan in {', '.join(suggestion['endpoints'])}"
+                    )
+            else:
+                self.stdout.write('\nNo full table scans without a usable index')
+        
+        if options['json']:
+            with open(options['json'], 'w', encoding='utf-8') as f:
+                json.dump({
+                    'vendor': connection.vendor,
+                    'predictions': Prediction.objects.count(),
+                    'users': User.objects.count(),
+                    'results': results,
+                    'suggested_indexes': suggestions,
+                }, f, indent=2, default=str)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['json']}"))
+    
+    def _explain(self, results):
+        """Attach plans to each endpoint's slowest queries; index suggestions for full scans"""
+        prefix = connection.ops.explain_query_prefix()
+        models_by_table = {model._meta.db_table: model for model in apps.get_models()}
+        wanted = defaultdict(set)
+        
+        with connection.cursor() as cursor:
+            for result in results:
+                for query in result['slowest_queries']:
+                    try:
+                        cursor.execute(f"{prefix} {query['sql']}")
+                        plan = '\n'.join(' '.join(str(col) for col in row) for row in cursor.fetchall())
+                    except Exception as e:
+                        query['plan'] = f'unavailable: {e}'
+                        continue
+                    query['plan'] = plan
+                    scanned = {
+                        table for pattern in FULL_SCAN_PATTERNS
+                        for line in plan.splitlines()
+                        for table in pattern.findall(line)
+                    }
+                    for table in scanned & models_by_table.keys():
+                        fields = self._index_fields(query['sql'], table)
+                        if fields:
+                            wanted[(table, tuple(fields))].add(result['endpoint'])
+            
+            suggestions = []
+            for (table, fields), endpoints in sorted(wanted.items()):
+                existing = [
+                    info['columns'] for info in
+                    connection.introspection.get_constraints(cursor, table).values()
+                    if info['index'] or info['unique'] or info['primary_key']
+                ]
+                if any(list(columns[:len(fields)]) == list(fields) for columns in existing):
+                    continue
+                model = models_by_table[table]
+                column_to_field = {field.column: field.name for field in model._meta.concrete_fields}
+                suggestions.append({
+                    'table': table,
+                    'model': f'{model._meta.app_label}.{model.__name__}',
+                    'fields': [column_to_field.get(column, column) for column in fields],
+                    'endpoints': sorted(endpoints),
+                })
+        return suggestions
+    
+    @staticmethod
+    def _index_fields(sql, table):
+        """Columns of table filtered in the WHERE clause: equality first, then one range"""
+        where = re.split(r'\bWHERE\b', sql, maxsplit=1)
+        if len(where) < 2:
+            return []
+        clause = re.split(r'\b(?:GROUP BY|ORDER BY|LIMIT|HAVING)\b', where[1], maxsplit=1)[0]
+        equality, ranges = [], []
+        pattern = rf'"?{table}"?\."?(\w+)"?\s*(=|>=|<=|<|>|IN\b|IS\b|BETWEEN\b)'
+        for column, op in re.findall(pattern, clause):
+            target = equality if op.strip() in EQUALITY_OPS else ranges
+            if column not in equality and column not in ranges:
+                target.append(column)
+        return equality + ranges[:1]
@@ -0,0 +1,248 @@
+"""
+Django management command to generate synthetic analytics data for benchmarks
+"""
+
+import random
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.analytics.aggregation import aggregate_days
+from apps.analytics.models import UserActivity
+from apps.breeds.models import Breed
+from apps.core.models import State
+from apps.predictions.models import Prediction
+from apps.users.models import User, UserFavoriteBreed
+
+# Synthetic rows are recognisable, so --clear never touches real data
+SYNTHETIC_EMAIL_DOMAIN = 'synthetic.invalid'
+SYNTHETIC_USER_AGENT = 'synthetic-data'
+
+FEEDBACK_WEIGHTS = [('', 80), ('correct', 14), ('incorrect', 4), ('unsure', 2)]
+ACTIVITY_WEIGHTS = [('view_breed', 55), ('login', 20), ('compare', 15), ('favorite', 5), ('feedback', 5)]
+USER_TYPE_WEIGHTS = [('farmer', 60), ('student', 12), ('veterinarian', 8), ('business', 8),
+                     ('researcher', 5), ('government', 3), ('other', 4)]
+
+# Share of predictions made by signed-in users
+REGISTERED_SHARE = 0.7
+
+
+@contextmanager
+def explicit_timestamps(*fields):
+    """Let bulk inserts keep the timestamps we generate for auto_now_add fields"""
+    saved = [(field, field.auto_now_add) for field in fields]
+    for field, _ in saved:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, value in saved:
+            field.auto_now_add = value
+
+
+def _weighted(rng, weights):
+    values, counts = zip(*weights)
+    return rng.choices(values, weights=counts)[0]
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic users, predictions, feedback and activity for analytics benchmarks'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000, help='Users to create')
+        parser.add_argument('--predictions', type=int, default=200000, help='Predictions to create')
+        parser.add_argument(
+            '--activities',
+            type=int,
+            default=None,
+            help='Activity log rows to create (default: half the predictions)'
+        )
+        parser.add_argument('--days', type=int, default=365, help='History length in days')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows inserted per batch')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed')
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete previously generated synthetic data first'
+        )
+        parser.add_argument(
+            '--no-aggregate',
+            action='store_true',
+            help='Skip rebuilding rollups and daily analytics tables afterwards'
+        )
+    
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.days = max(1, options['days'])
+        self.batch_size = max(1, options['batch_size'])
+        self.now = timezone.now()
+        
+        self.breeds = list(Breed.objects.filter(is_active=True).values_list('id', 'name', 'animal_type'))
+        if not self.breeds:
+            raise CommandError('No breeds found; run import_breeds first')
+        # A few breeds dominate, like real traffic (Zipf-like weights)
+        self.rng.shuffle(self.breeds)
+        self.breed_weights = [1 / (rank + 1) for rank in range(len(self.breeds))]
+        states = list(State.objects.values_list('id', flat=True))
+        self.rng.shuffle(states)
+        self.states = states
+        self.state_weights = [1 / (rank + 1) ** 0.8 for rank in range(len(states))]
+        
+        if options['clear']:
+            self._clear()
+        
+        users = self._create_users(max(0, options['users']))
+        self._create_predictions(max(0, options['predictions']), users)
+        activities = options['activities']
+        if activities is None:
+            activities = options['predictions'] // 2
+        self._create_activity(max(0, activities), users)
+        
+        if not options['no_aggregate']:
+            call_command('rebuild_prediction_rollups', stdout=self.stdout)
+            written = aggregate_days(
+                timezone.localdate(self.now) - timedelta(days=self.days), timezone.localdate(self.now)
+            )
+            self.stdout.write(f"Aggregated {written['daily']} days of analytics")
+        
+        self.stdout.write(self.style.SUCCESS('Synthetic data ready'))
+    
+    def _timestamp(self, not_before=None):
+        """Random moment in the history window, denser towards today and by day"""
+        age_days = self.days * self.rng.random() ** 1.6
+        moment = self.now - timedelta(days=age_days)
+        day = timezone.localtime(moment).date()
+        hour = min(23, int(self.rng.triangular(5, 22, 11)))
+        moment = timezone.make_aware(
+            datetime.combine(day, time(hour, self.rng.randrange(60), self.rng.randrange(60)))
+        )
+        if not_before is not None and moment < not_before:
+            moment = not_before + timedelta(minutes=self.rng.randrange(1, 600))
+        return min(moment, self.now)
+    
+    def _clear(self):
+        predictions = Prediction.objects.filter(user_agent=SYNTHETIC_USER_AGENT)
+        users = User.objects.filter(email__endswith=f'@{SYNTHETIC_EMAIL_DOMAIN}')
+        deleted = 0
+        for queryset in (predictions, users):
+            while True:
+                batch = list(queryset.values_list('pk', flat=True)[:self.batch_size])
+                if not batch:
+                    break
+                queryset.model.objects.filter(pk__in=batch).delete()
+                deleted += len(batch)
+        self.stdout.write(f'Deleted {deleted} synthetic rows')
+    
+    def _create_users(self, count):
+        password = make_password(None)
+        start = User.objects.filter(email__endswith=f'@{SYNTHETIC_EMAIL_DOMAIN}').count()
+        created_field = User._meta.get_field('created_at')
+        for offset in range(0, count, self.batch_size):
+            batch = []
+            for i in range(offset, min(count, offset + self.batch_size)):
+                joined = self._timestamp()
+                batch.append(User(
+                    email=f'user{start + i}@{SYNTHETIC_EMAIL_DOMAIN}',
+                    password=password,
+                    full_name=f'Synthetic User {start + i}',
+                    user_type=_weighted(self.rng, USER_TYPE_WEIGHTS),
+                    state_id=(
+                        self.rng.choices(self.states, weights=self.state_weights)[0]
+                        if self.states and self.rng.random() < 0.85 else None
+                    ),
+                    preferred_language=self.rng.choice(['en', 'en', 'hi']),
+                    date_joined=joined,
+                    created_at=joined,
+                    last_login=self._timestamp(not_before=joined),
+                ))
+            with explicit_timestamps(created_field):
+                User.objects.bulk_create(batch, batch_size=self.batch_size)
+            self.stdout.write(f'Users: {offset + len(batch)}/{count}')
+        
+        return list(
+            User.objects.filter(email__endswith=f'@{SYNTHETIC_EMAIL_DOMAIN}')
+            .values_list('id', 'date_joined')
+        )
+    
+    def _create_predictions(self, count, users):
+        for offset in range(0, count, self.batch_size):
+            batch = []
+            for _ in range(min(self.batch_size, count - offset)):
+                user_id, joined = (None, None)
+                if users and self.rng.random() < REGISTERED_SHARE:
+                    user_id, joined = self.rng.choice(users)
+                breed_pk, breed_name, animal_type = self.rng.choices(
+                    self.breeds, weights=self.breed_weights
+                )[0]
+                confidence = self.rng.betavariate(6, 2)
+                runner_up = self.rng.choice(self.breeds)
+                batch.append(Prediction(
+                    public_id=uuid.UUID(int=self.rng.getrandbits(128), version=4),
+                    user_id=user_id,
+                    animal_type=animal_type,
+                    animal_type_confidence=self.rng.betavariate(12, 1),
+                    predicted_breed_id=breed_pk,
+                    predicted_breed_name=breed_name,
+                    breed_confidence=confidence,
+                    top_predictions=[
+                        {'breed': breed_name, 'confidence': round(confidence, 4)},
+                        {'breed': runner_up[1], 'confidence': round((1 - confidence) * 0.6, 4)},
+                    ],
+                    image_hash=f'{self.rng.getrandbits(256):064x}',
+                    user_feedback=_weighted(self.rng, FEEDBACK_WEIGHTS) if user_id else '',
+                    processing_time_ms=int(self.rng.lognormvariate(4.6, 0.35)),
+                    model_version='2.0.0',
+                    user_agent=SYNTHETIC_USER_AGENT,
+                    created_at=self._timestamp(not_before=joined),
+                ))
+            Prediction.objects.bulk_create(batch, batch_size=self.batch_size)
+            self.stdout.write(f'Predictions: {offset + len(batch)}/{count}')
+        
+        if users:
+            per_user = Prediction.objects.filter(user=OuterRef('pk')).order_by().values('user').annotate(
+                count=Count('id')
+            ).values('count')
+            with transaction.atomic():
+                User.objects.filter(email__endswith=f'@{SYNTHETIC_EMAIL_DOMAIN}').update(
+                    total_predictions=Coalesce(Subquery(per_user), 0)
+                )
+    
+    def _create_activity(self, count, users):
+        if not users:
+            return
+        breed_pks = [breed[0] for breed in self.breeds]
+        activity_created = UserActivity._meta.get_field('created_at')
+        favorite_created = UserFavoriteBreed._meta.get_field('created_at')
+        for offset in range(0, count, self.batch_size):
+            activities = []
+            favorites = []
+            for _ in range(min(self.batch_size, count - offset)):
+                user_id, joined = self.rng.choice(users)
+                activity_type = _weighted(self.rng, ACTIVITY_WEIGHTS)
+                breed_pk = None
+                if activity_type in ('view_breed', 'compare', 'favorite'):
+                    breed_pk = self.rng.choices(breed_pks, weights=self.breed_weights)[0]
+                created = self._timestamp(not_before=joined)
+                activities.append(UserActivity(
+                    user_id=user_id,
+                    activity_type=activity_type,
+                    breed_id=breed_pk,
+                    metadata={'synthetic': True},
+                    created_at=created,
+                ))
+                if activity_type == 'favorite':
+                    favorites.append(UserFavoriteBreed(user_id=user_id, breed_id=breed_pk, created_at=created))
+            with explicit_timestamps(activity_created, favorite_created):
+                UserActivity.objects.bulk_create(activities, batch_size=self.batch_size)
+                UserFavoriteBreed.objects.bulk_create(
+                    favorites, batch_size=self.batch_size, ignore_conflicts=True
+                )
+            self.stdout.write(f'Activity: {offset + len(activities)}/{count}')
@@ -74,13 +74,23 @@ class BreedPopularity(models.Model):
     def __str__(self):
         return f"{self.breed.name} - {self.date}"
     
+    @staticmethod
+    def score(prediction_count, view_count, favorite_count, comparison_count):
+        """Popularity score of a set of daily counts"""
+        return (
+            prediction_count * 3 +
+            view_count * 1 +
+            favorite_count * 5 +
+            comparison_count * 2
+        )
+    
     def calculate_score(self):
         """Calculate popularity score based on various factors"""
-        self.popularity_score = (
-            self.prediction_count * 3 +
-            self.view_count * 1 +
-            self.favorite_count * 5 +
-            self.comparison_count * 2
+        self.popularity_score = self.score(
+            self.prediction_count,
+            self.view_count,
+            self.favorite_count,
+            self.comparison_count
         )
         self.save()
 
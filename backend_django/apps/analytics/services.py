@@ -0,0 +1,219 @@
+"""
+Analytics services
+Precomputed GeoJSON map layers for the breed distribution map
+"""
+
+import gzip
+import hashlib
+import json
+from collections import defaultdict
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, Sum
+from django.utils import timezone
+
+from apps.breeds.models import Breed
+from apps.core.models import State
+from .models import RegionalStats
+
+# Zoom level -> (aggregation, coordinate decimals). Low zooms merge states
+# into their region and round coordinates harder; high zooms add one point
+# per breed homeland.
+ZOOM_LEVELS = {
+    'country': ('region', 1),
+    'state': ('state', 3),
+    'detail': ('breed', 4),
+}
+
+LAYERS = ('breeds', 'conservation', 'predictions')
+
+# Prediction density covers this many recent days of RegionalStats
+PREDICTION_WINDOW_DAYS = 30
+
+CACHE_PREFIX = 'analytics:map_layers'
+
+
+def _load_centroids() -> Dict[str, Any]:
+    path = settings.REGION_CENTROIDS_PATH
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Region centroids unavailable ({path}): {e}")
+        return {}
+
+
+def _centroid_mtime() -> int:
+    try:
+        return settings.REGION_CENTROIDS_PATH.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def map_layers_version() -> str:
+    """
+    Fingerprint of everything the layers are built from
+
+    Four small queries; any breed edit, native state link change, state
+    rename or region move, new regional stats row or centroid file edit
+    yields a new version.
+    """
+    since = timezone.now().date() - timedelta(days=PREDICTION_WINDOW_DAYS)
+    breeds = Breed.objects.aggregate(count=Count('id'), updated=Max('updated_at'))
+    # M2M edits do not touch Breed.updated_at, so fingerprint the links
+    links = Breed.native_states.through.objects.aggregate(
+        count=Count('id'), last=Max('id'), breeds=Sum('breed_id'), states=Sum('state_id')
+    )
+    # State has no timestamp; the few dozen rows are cheap to list whole
+    states = list(State.objects.order_by('id').values_list('id', 'name', 'region'))
+    stats = RegionalStats.objects.filter(date__gte=since).aggregate(
+        count=Count('id'), last=Max('date'), total=Sum('predictions_count')
+    )
+    fingerprint = json.dumps(
+        [breeds, links, states, stats, str(since), _centroid_mtime()],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()[:16]
+
+
+def _point(lat: float, lng: float, decimals: int) -> Dict[str, Any]:
+    # GeoJSON orders coordinates as [longitude, latitude]
+    return {'type': 'Point', 'coordinates': [round(lng, decimals), round(lat, decimals)]}
+
+
+def _feature_collection(features: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def build_map_layers(zoom: str) -> Dict[str, Any]:
+    """Render every map layer for one zoom level straight from the database"""
+    aggregation, decimals = ZOOM_LEVELS[zoom]
+    centroids = _load_centroids()
+    state_coords = centroids.get('states', {})
+    since = timezone.now().date() - timedelta(days=PREDICTION_WINDOW_DAYS)
+
+    states = {state.id: state for state in State.objects.all()}
+    breeds = list(
+        Breed.objects.filter(is_active=True)
+        .only('breed_id', 'name', 'animal_type', 'conservation_status')
+        .prefetch_related('native_states')
+    )
+    predictions = dict(
+        RegionalStats.objects.filter(date__gte=since)
+        .values('state_id')
+        .annotate(total=Sum('predictions_count'))
+        .values_list('state_id', 'total')
+    )
+
+    # Group states into map areas: themselves, or their region at low zoom
+    def area_of(state: State) -> str:
+        if aggregation == 'region':
+            return state.region or state.name
+        return state.name
+
+    area_states: Dict[str, List[State]] = defaultdict(list)
+    for state in states.values():
+        if state.name in state_coords:
+            area_states[area_of(state)].append(state)
+
+    area_breeds: Dict[str, Dict[str, Breed]] = defaultdict(dict)
+    for breed in breeds:
+        for state in breed.native_states.all():
+            area_breeds[area_of(state)][breed.breed_id] = breed
+
+    area_predictions = {
+        area: sum(predictions.get(state.id, 0) or 0 for state in members)
+        for area, members in area_states.items()
+    }
+    peak = max(area_predictions.values(), default=0)
+
+    layers: Dict[str, List[Dict[str, Any]]] = {layer: [] for layer in LAYERS}
+    for area in sorted(area_states):
+        members = area_states[area]
+        lat = sum(state_coords[s.name]['lat'] for s in members) / len(members)
+        lng = sum(state_coords[s.name]['lng'] for s in members) / len(members)
+        geometry = _point(lat, lng, decimals)
+        base = {'name': area, 'states': sorted(s.name for s in members)}
+        area_breed_list = sorted(area_breeds[area].values(), key=lambda b: b.name)
+
+        layers['breeds'].append({
+            'type': 'Feature',
+            'geometry': geometry,
+            'properties': {
+                **base,
+                'breed_count': len(area_breed_list),
+                'breeds': [
+                    {'id': b.breed_id, 'name': b.name, 'type': b.animal_type}
+                    for b in area_breed_list
+                ]
+            }
+        })
+
+        status_counts: Dict[str, int] = defaultdict(int)
+        for breed in area_breed_list:
+            status_counts[breed.conservation_status] += 1
+        layers['conservation'].append({
+            'type': 'Feature',
+            'geometry': geometry,
+            'properties': {**base, 'status_counts': dict(sorted(status_counts.items()))}
+        })
+
+        count = area_predictions[area]
+        layers['predictions'].append({
+            'type': 'Feature',
+            'geometry': geometry,
+            'properties': {
+                **base,
+                'predictions': count,
+                'density': round(count / peak, 3) if peak else 0.0
+            }
+        })
+
+    if aggregation == 'breed':
+        # Native-region points for each breed, on top of the state layer
+        by_id = {breed.breed_id: breed for breed in breeds}
+        for breed_id, regions in sorted(centroids.get('regions', {}).items()):
+            breed = by_id.get(breed_id)
+            if breed is None:
+                continue
+            for region in regions:
+                layers['breeds'].append({
+                    'type': 'Feature',
+                    'geometry': _point(region['lat'], region['lng'], decimals),
+                    'properties': {
+                        'name': region.get('name', breed.name),
+                        'kind': 'native_region',
+                        'breeds': [{'id': breed.breed_id, 'name': breed.name, 'type': breed.animal_type}]
+                    }
+                })
+
+    return {
+        'zoom': zoom,
+        'prediction_window_days': PREDICTION_WINDOW_DAYS,
+        'layers': {layer: _feature_collection(features) for layer, features in layers.items()}
+    }
+
+
+def get_map_layers(zoom: str) -> Tuple[str, bytes, bytes]:
+    """
+    Encoded layers for a zoom level as (etag, json body, gzip body)
+
+    Blobs are cached per data version, so a stale version is never served
+    and unchanged data is rendered once per cache timeout.
+    """
+    version = map_layers_version()
+    key = f'{CACHE_PREFIX}:{version}:{zoom}'
+    cached: Optional[Tuple[str, bytes, bytes]] = cache.get(key)
+    if cached is not None:
+        return cached
+
+    payload = {'version': version, **build_map_layers(zoom)}
+    body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    etag = f'"{version}-{zoom}"'
+    cached = (etag, body, gzip.compress(body, compresslevel=9, mtime=0))
+    cache.set(key, cached, settings.MAP_LAYERS_CACHE_TIMEOUT)
+    return cached
@@ -0,0 +1,337 @@
+"""
+Analytics snapshots
+Public dashboard responses cached with stale-while-revalidate
+"""
+
+import time
+from collections import Counter
+from datetime import timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.breeds.models import Breed
+from apps.predictions.models import Prediction, PredictionRollup
+from apps.users.models import User
+from .aggregation import aggregated_through, day_start, live_rows, merge_daily, prediction_totals
+from .models import BreedPopularity, DailyStats
+
+CACHE_PREFIX = 'analytics:snapshot'
+
+_snapshot_settings = settings.ANALYTICS_SNAPSHOTS
+
+
+class Snapshot:
+    """
+    A computed response cached under stale-while-revalidate rules
+
+    Entries are fresh for ``ttl`` seconds. For ``stale_ttl`` seconds after
+    that they are still served while one background task recomputes them.
+    A cache lock (``cache.add``) makes sure each key is recomputed once,
+    whether it is refreshing in the background or missing entirely; other
+    requests for a missing key wait for that result instead of querying.
+    Across processes that needs a shared cache backend (Redis); with the
+    default LocMemCache each worker recomputes a key once for itself.
+    """
+
+    # How long a recomputation may hold the lock, and how long others wait on it
+    LOCK_TIMEOUT = 60
+    WAIT_TIMEOUT = 10.0
+    WAIT_INTERVAL = 0.05
+
+    def __init__(self, name: str, build: Callable[..., Any], ttl: int, stale_ttl: int):
+        self.name = name
+        self.build = build
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+    def __call__(self, *args):
+        return self.build(*args)
+
+    def key(self, *args) -> str:
+        return ':'.join([CACHE_PREFIX, self.name, *(str(arg) for arg in args)])
+
+    def get(self, *args) -> Any:
+        """Cached data for args, recomputing only when nothing usable is cached"""
+        key = self.key(*args)
+        entry: Optional[Tuple[float, Any]] = cache.get(key)
+        if entry is not None:
+            built_at, data = entry
+            if time.time() - built_at >= self.ttl and self._lock(key):
+                from .tasks import refresh_snapshot
+                refresh_snapshot.delay(self.name, list(args))
+            return data
+
+        if self._lock(key):
+            return self.refresh(*args)
+
+        # Another worker is computing this key; wait for its result
+        deadline = time.monotonic() + self.WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(self.WAIT_INTERVAL)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry[1]
+        return self.build(*args)
+
+    def refresh(self, *args) -> Any:
+        """Recompute and store the snapshot, releasing the lock"""
+        key = self.key(*args)
+        try:
+            data = self.build(*args)
+            # None means "no such object"; caching it would pin a miss per id
+            if data is not None:
+                cache.set(key, (time.time(), data), self.ttl + self.stale_ttl)
+            return data
+        finally:
+            cache.delete(f'{key}:lock')
+
+    def _lock(self, key: str) -> bool:
+        return cache.add(f'{key}:lock', 1, self.LOCK_TIMEOUT)
+
+
+_snapshots: Dict[str, Snapshot] = {}
+
+
+def snapshot(name: str):
+    """Register a builder as a cached snapshot"""
+    def decorator(build: Callable[..., Any]) -> Snapshot:
+        registered = Snapshot(name, build, _snapshot_settings['TTL'], _snapshot_settings['STALE_TTL'])
+        _snapshots[name] = registered
+        return registered
+    return decorator
+
+
+def get_snapshot(name: str) -> Snapshot:
+    return _snapshots[name]
+
+
+@snapshot('dashboard')
+def dashboard_stats() -> Dict[str, Any]:
+    """Platform overview for the public dashboard"""
+    today = timezone.localdate()
+    thirty_days_ago = today - timedelta(days=30)
+
+    # Final days come from DailyStats, the rest (usually today) live
+    through = aggregated_through()
+    stored = DailyStats.objects.filter(date__lte=through) if through else DailyStats.objects.none()
+    live_predictions = live_rows(Prediction.objects.all(), 'created_at', through)
+    live_users = live_rows(User.objects.all(), 'date_joined', through)
+
+    # Total counts
+    totals = prediction_totals(through)
+    total_users = User.objects.count()
+    total_breeds = Breed.objects.filter(is_active=True).count()
+
+    # Today's stats
+    today_predictions = Prediction.objects.filter(
+        created_at__gte=day_start(today)
+    ).count()
+    today_new_users = User.objects.filter(
+        date_joined__gte=day_start(today)
+    ).count()
+
+    # Prediction trend (last 30 days)
+    prediction_trend = merge_daily(
+        stored.filter(date__gte=thirty_days_ago).values_list('date', 'total_predictions'),
+        live_predictions.filter(
+            created_at__gte=day_start(thirty_days_ago)
+        ).annotate(
+            date=TruncDate('created_at')
+        ).values('date').annotate(
+            count=Count('id')
+        ).values_list('date', 'count')
+    )
+
+    # User registration trend (last 30 days)
+    user_trend = merge_daily(
+        stored.filter(date__gte=thirty_days_ago).values_list('date', 'new_registrations'),
+        live_users.filter(
+            date_joined__gte=day_start(thirty_days_ago)
+        ).annotate(
+            date=TruncDate('date_joined')
+        ).values('date').annotate(
+            count=Count('id')
+        ).values_list('date', 'count')
+    )
+
+    # Top predicted breeds, from the prediction rollups
+    top_breeds = list(
+        PredictionRollup.objects.values(
+            'breed_name'
+        ).annotate(
+            count=Sum('predictions')
+        ).filter(count__gt=0).order_by('-count').values(
+            'count', predicted_breed_name=F('breed_name')
+        )[:10]
+    )
+
+    # Top states (by user count)
+    top_states = list(
+        User.objects.exclude(
+            state__isnull=True
+        ).values(
+            'state__name'
+        ).annotate(
+            count=Count('id')
+        ).order_by('-count')[:10]
+    )
+
+    # Feedback accuracy
+    feedback = PredictionRollup.objects.exclude(feedback='').aggregate(
+        total=Sum('predictions'),
+        correct=Sum('predictions', filter=Q(feedback='correct'))
+    )
+    total_feedback = feedback['total'] or 0
+    correct_feedback = feedback['correct'] or 0
+    feedback_accuracy = (correct_feedback / total_feedback * 100) if total_feedback > 0 else 0
+
+    return {
+        'total_predictions': totals['total'],
+        'total_users': total_users,
+        'total_breeds': total_breeds,
+        'today_predictions': today_predictions,
+        'today_new_users': today_new_users,
+        'prediction_trend': prediction_trend,
+        'user_trend': user_trend,
+        'top_breeds': top_breeds,
+        'top_states': top_states,
+        'avg_confidence': totals['avg_confidence'],
+        'feedback_accuracy': feedback_accuracy
+    }
+
+
+@snapshot('breed')
+def breed_analytics(breed_id: str) -> Optional[Dict[str, Any]]:
+    """Prediction stats of one breed, or None when it does not exist"""
+    breed = Breed.objects.filter(breed_id=breed_id).first()
+    if breed is None:
+        return None
+
+    thirty_days_ago = timezone.now() - timedelta(days=30)
+
+    # Prediction stats
+    predictions = Prediction.objects.filter(predicted_breed=breed)
+    total_predictions = predictions.count()
+    avg_confidence = predictions.aggregate(avg=Avg('breed_confidence'))['avg'] or 0
+
+    # Trend
+    prediction_trend = list(
+        predictions.filter(
+            created_at__gte=thirty_days_ago
+        ).annotate(
+            date=TruncDate('created_at')
+        ).values('date').annotate(
+            count=Count('id')
+        ).order_by('date')
+    )
+
+    # Feedback
+    feedback_stats = dict(
+        predictions.exclude(user_feedback='').values(
+            'user_feedback'
+        ).annotate(
+            count=Count('id')
+        ).values_list('user_feedback', 'count')
+    )
+
+    return {
+        'breed_id': breed_id,
+        'breed_name': breed.name,
+        'total_predictions': total_predictions,
+        'avg_confidence': avg_confidence,
+        'view_count': breed.view_count,
+        'prediction_trend': prediction_trend,
+        'feedback_stats': feedback_stats
+    }
+
+
+@snapshot('breeds')
+def all_breeds_analytics() -> Dict[str, Any]:
+    """Breeds ranked by predictions and views, and totals per animal type"""
+    # Top breeds by predictions
+    top_by_predictions = list(
+        Prediction.objects.values(
+            'predicted_breed__breed_id',
+            'predicted_breed__name'
+        ).annotate(
+            count=Count('id'),
+            avg_conf=Avg('breed_confidence')
+        ).order_by('-count')[:20]
+    )
+
+    # Top breeds by views
+    top_by_views = list(
+        Breed.objects.filter(is_active=True).values(
+            'breed_id', 'name', 'view_count'
+        ).order_by('-view_count')[:20]
+    )
+
+    # By animal type
+    by_type = Prediction.objects.values('animal_type').annotate(
+        count=Count('id'),
+        avg_conf=Avg('breed_confidence')
+    )
+
+    return {
+        'top_by_predictions': top_by_predictions,
+        'top_by_views': top_by_views,
+        'by_animal_type': list(by_type)
+    }
+
+
+@snapshot('popular')
+def popular_breeds(days: int) -> Dict[str, Any]:
+    """Most predicted breeds over the last days, and most viewed breeds"""
+    since = timezone.localdate() - timedelta(days=max(days, 1) - 1)
+    through = aggregated_through()
+    breed_fields = ('breed_id', 'name', 'animal_type')
+
+    # By predictions: BreedPopularity for final days, live rows after
+    counts = Counter()
+    if through and through >= since:
+        counts.update({
+            tuple(row[:3]): row[3]
+            for row in BreedPopularity.objects.filter(
+                date__range=(since, through)
+            ).values(
+                *(f'breed__{field}' for field in breed_fields)
+            ).annotate(
+                count=Sum('prediction_count')
+            ).values_list(*(f'breed__{field}' for field in breed_fields), 'count')
+        })
+    counts.update({
+        tuple(row[:3]): row[3]
+        for row in live_rows(
+            Prediction.objects.filter(created_at__gte=day_start(since)), 'created_at', through
+        ).exclude(
+            predicted_breed__isnull=True
+        ).values(
+            *(f'predicted_breed__{field}' for field in breed_fields)
+        ).annotate(
+            count=Count('id')
+        ).values_list(*(f'predicted_breed__{field}' for field in breed_fields), 'count')
+    })
+    by_predictions = [
+        dict(zip((f'predicted_breed__{field}' for field in breed_fields), breed), count=count)
+        for breed, count in counts.most_common(10)
+    ]
+
+    # By views
+    by_views = list(
+        Breed.objects.filter(
+            is_active=True
+        ).values(
+            'breed_id', 'name', 'animal_type', 'view_count'
+        ).order_by('-view_count')[:10]
+    )
+
+    return {
+        'period_days': days,
+        'by_predictions': by_predictions,
+        'by_views': by_views
+    }
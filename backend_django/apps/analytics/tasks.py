@@ -0,0 +1,46 @@
+"""
+Analytics background tasks
+Activity logging after the response, aggregation and snapshot refreshes
+"""
+
+from typing import Any, Dict, List, Optional
+
+from apps.core.task_queue import task
+from .aggregation import aggregate_days, default_range
+from .models import UserActivity
+from .snapshots import get_snapshot
+
+
+@task()
+def log_user_activity(
+    user_id: int,
+    activity_type: str,
+    prediction_public_id: Optional[str] = None,
+    breed_id: Optional[int] = None,
+    metadata: Optional[Dict[str, Any]] = None
+) -> None:
+    prediction_id = None
+    if prediction_public_id:
+        from apps.predictions.tasks import get_written_prediction
+        prediction_id = get_written_prediction(prediction_public_id).pk
+    UserActivity.objects.create(
+        user_id=user_id,
+        activity_type=activity_type,
+        prediction_id=prediction_id,
+        breed_id=breed_id,
+        metadata=metadata or {}
+    )
+
+
+@task(max_retries=0)
+def aggregate_recent_stats() -> None:
+    """Recompute the analytics tables for every day that is not final yet"""
+    start, end = default_range()
+    if start is not None:
+        aggregate_days(start, end)
+
+
+@task(max_retries=0)
+def refresh_snapshot(name: str, args: List[Any]) -> None:
+    """Recompute a stale dashboard snapshot"""
+    get_snapshot(name).refresh(*args)
@@ -13,4 +13,5 @@ urlpatterns = [
     path('popular/', views.PopularBreedsView.as_view(), name='popular-breeds'),
     path('recent/', views.RecentActivityView.as_view(), name='recent-activity'),
     path('admin/', views.AdminAnalyticsView.as_view(), name='admin-analytics'),
+    path('map-layers/', views.MapLayersView.as_view(), name='map-layers'),
 ]
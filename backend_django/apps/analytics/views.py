@@ -5,7 +5,8 @@ Analytics views
 from rest_framework import generics, views
 from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
-from django.db.models import Count, Avg, Sum
+from django.http import HttpResponse
+from django.db.models import Count, Sum
 from django.db.models.functions import TruncDate
 from django.utils import timezone
 from datetime import timedelta
@@ -16,188 +17,55 @@ from .serializers import (
     BreedPopularitySerializer,
     UserActivitySerializer
 )
-from apps.predictions.models import Prediction
+from apps.predictions.models import Prediction, PredictionRollup
 from apps.breeds.models import Breed
 from apps.users.models import User
+from .aggregation import aggregated_through, day_start, prediction_totals
+from .snapshots import all_breeds_analytics, breed_analytics, dashboard_stats, popular_breeds
+from .services import ZOOM_LEVELS, get_map_layers
 
 
-class DashboardStatsView(views.APIView):
+# Longest period PopularBreedsView accepts
+MAX_POPULAR_PERIOD_DAYS = 365
+
+
+class SnapshotResponseMixin:
+    """Serve a cached analytics snapshot, letting shared caches keep it for its TTL"""
+    
+    def snapshot_response(self, snapshot, *args):
+        data = snapshot.get(*args)
+        if data is None:
+            return Response({'error': 'Breed not found'}, status=404)
+        response = Response(data)
+        response['Cache-Control'] = f'public, max-age={snapshot.ttl}'
+        return response
+
+
+class DashboardStatsView(SnapshotResponseMixin, views.APIView):
     """
     Get dashboard statistics overview
     """
     permission_classes = [AllowAny]
+    query_budget = 16
     
     def get(self, request):
-        now = timezone.now()
-        today = now.date()
-        thirty_days_ago = now - timedelta(days=30)
-        seven_days_ago = now - timedelta(days=7)
-        
-        # Total counts
-        total_predictions = Prediction.objects.count()
-        total_users = User.objects.count()
-        total_breeds = Breed.objects.filter(is_active=True).count()
-        
-        # Today's stats
-        today_predictions = Prediction.objects.filter(
-            created_at__date=today
-        ).count()
-        today_new_users = User.objects.filter(
-            date_joined__date=today
-        ).count()
-        
-        # Prediction trend (last 30 days)
-        prediction_trend = list(
-            Prediction.objects.filter(
-                created_at__gte=thirty_days_ago
-            ).annotate(
-                date=TruncDate('created_at')
-            ).values('date').annotate(
-                count=Count('id')
-            ).order_by('date')
-        )
-        
-        # User registration trend (last 30 days)
-        user_trend = list(
-            User.objects.filter(
-                date_joined__gte=thirty_days_ago
-            ).annotate(
-                date=TruncDate('date_joined')
-            ).values('date').annotate(
-                count=Count('id')
-            ).order_by('date')
-        )
-        
-        # Top predicted breeds
-        top_breeds = list(
-            Prediction.objects.values(
-                'predicted_breed_name'
-            ).annotate(
-                count=Count('id')
-            ).order_by('-count')[:10]
-        )
-        
-        # Top states (by user count)
-        top_states = list(
-            User.objects.exclude(
-                state__isnull=True
-            ).values(
-                'state__name'
-            ).annotate(
-                count=Count('id')
-            ).order_by('-count')[:10]
-        )
-        
-        # Accuracy metrics
-        avg_confidence = Prediction.objects.aggregate(
-            avg=Avg('breed_confidence')
-        )['avg'] or 0
-        
-        # Feedback accuracy
-        feedback_predictions = Prediction.objects.exclude(user_feedback='')
-        total_feedback = feedback_predictions.count()
-        correct_feedback = feedback_predictions.filter(user_feedback='correct').count()
-        feedback_accuracy = (correct_feedback / total_feedback * 100) if total_feedback > 0 else 0
-        
-        return Response({
-            'total_predictions': total_predictions,
-            'total_users': total_users,
-            'total_breeds': total_breeds,
-            'today_predictions': today_predictions,
-            'today_new_users': today_new_users,
-            'prediction_trend': prediction_trend,
-            'user_trend': user_trend,
-            'top_breeds': top_breeds,
-            'top_states': top_states,
-            'avg_confidence': avg_confidence,
-            'feedback_accuracy': feedback_accuracy
-        })
+        return self.snapshot_response(dashboard_stats)
 
 
-class BreedAnalyticsView(views.APIView):
+class BreedAnalyticsView(SnapshotResponseMixin, views.APIView):
     """
     Get breed-specific analytics
     """
     permission_classes = [AllowAny]
+    query_budget = 7
     
     def get(self, request, breed_id=None):
         if breed_id:
-            return self._get_single_breed_analytics(breed_id)
-        return self._get_all_breeds_analytics()
-    
-    def _get_single_breed_analytics(self, breed_id):
-        try:
-            breed = Breed.objects.get(breed_id=breed_id)
-        except Breed.DoesNotExist:
-            return Response({'error': 'Breed not found'}, status=404)
-        
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        
-        # Prediction stats
-        predictions = Prediction.objects.filter(predicted_breed=breed)
-        total_predictions = predictions.count()
-        avg_confidence = predictions.aggregate(avg=Avg('breed_confidence'))['avg'] or 0
-        
-        # Trend
-        prediction_trend = list(
-            predictions.filter(
-                created_at__gte=thirty_days_ago
-            ).annotate(
-                date=TruncDate('created_at')
-            ).values('date').annotate(
-                count=Count('id')
-            ).order_by('date')
-        )
-        
-        # Feedback
-        feedback_stats = dict(
-            predictions.exclude(user_feedback='').values(
-                'user_feedback'
-            ).annotate(
-                count=Count('id')
-            ).values_list('user_feedback', 'count')
-        )
-        
-        return Response({
-            'breed_id': breed_id,
-            'breed_name': breed.name,
-            'total_predictions': total_predictions,
-            'avg_confidence': avg_confidence,
-            'view_count': breed.view_count,
-            'prediction_trend': prediction_trend,
-            'feedback_stats': feedback_stats
-        })
-    
-    def _get_all_breeds_analytics(self):
-        # Top breeds by predictions
-        top_by_predictions = list(
-            Prediction.objects.values(
-                'predicted_breed__breed_id',
-                'predicted_breed__name'
-            ).annotate(
-                count=Count('id'),
-                avg_conf=Avg('breed_confidence')
-            ).order_by('-count')[:20]
-        )
-        
-        # Top breeds by views
-        top_by_views = list(
-            Breed.objects.filter(is_active=True).values(
-                'breed_id', 'name', 'view_count'
-            ).order_by('-view_count')[:20]
-        )
-        
-        # By animal type
-        by_type = Prediction.objects.values('animal_type').annotate(
-            count=Count('id'),
-            avg_conf=Avg('breed_confidence')
-        )
-        
-        return Response({
-            'top_by_predictions': top_by_predictions,
-            'top_by_views': top_by_views,
-            'by_animal_type': list(by_type)
-        })
+            # Unknown ids 404 here, before any snapshot key or lock is made
+            if not Breed.objects.filter(breed_id=breed_id).exists():
+                return Response({'error': 'Breed not found'}, status=404)
+            return self.snapshot_response(breed_analytics, breed_id)
+        return self.snapshot_response(all_breeds_analytics)
 
 
 class UserEngagementView(views.APIView):
@@ -205,6 +73,7 @@ class UserEngagementView(views.APIView):
     Get user engagement analytics
     """
     permission_classes = [IsAuthenticated]
+    query_budget = 6
     
     def get(self, request):
         user = request.user
@@ -257,16 +126,18 @@ class RecentActivityView(generics.ListAPIView):
     serializer_class = UserActivitySerializer
     permission_classes = [AllowAny]
     pagination_class = None
+    query_budget = 2
     
     def get_queryset(self):
         return UserActivity.objects.all()[:20]
 
 
-class PopularBreedsView(views.APIView):
+class PopularBreedsView(SnapshotResponseMixin, views.APIView):
     """
     Get popular breeds based on various metrics
     """
     permission_classes = [AllowAny]
+    query_budget = 5
     
     def get(self, request):
         period = request.query_params.get('period', '7')  # days
@@ -274,36 +145,9 @@ class PopularBreedsView(views.APIView):
             days = int(period)
         except ValueError:
             days = 7
-        
-        since = timezone.now() - timedelta(days=days)
-        
-        # By predictions
-        by_predictions = list(
-            Prediction.objects.filter(
-                created_at__gte=since
-            ).values(
-                'predicted_breed__breed_id',
-                'predicted_breed__name',
-                'predicted_breed__animal_type'
-            ).annotate(
-                count=Count('id')
-            ).order_by('-count')[:10]
-        )
-        
-        # By views
-        by_views = list(
-            Breed.objects.filter(
-                is_active=True
-            ).values(
-                'breed_id', 'name', 'animal_type', 'view_count'
-            ).order_by('-view_count')[:10]
-        )
-        
-        return Response({
-            'period_days': days,
-            'by_predictions': by_predictions,
-            'by_views': by_views
-        })
+        # Bounded so arbitrary periods cannot fill the cache
+        days = min(max(days, 1), MAX_POPULAR_PERIOD_DAYS)
+        return self.snapshot_response(popular_breeds, days)
 
 
 class AdminAnalyticsView(views.APIView):
@@ -311,17 +155,15 @@ class AdminAnalyticsView(views.APIView):
     Detailed analytics for administrators
     """
     permission_classes = [IsAdminUser]
+    query_budget = 11
     
     def get(self, request):
         now = timezone.now()
-        today = now.date()
+        today = timezone.localdate()
         
-        # System health
-        total_predictions = Prediction.objects.count()
-        predictions_today = Prediction.objects.filter(created_at__date=today).count()
-        avg_processing_time = Prediction.objects.aggregate(
-            avg=Avg('processing_time_ms')
-        )['avg'] or 0
+        # System health: final days from DailyStats plus live rows
+        totals = prediction_totals(aggregated_through())
+        predictions_today = Prediction.objects.filter(created_at__gte=day_start(today)).count()
         
         # User stats
         total_users = User.objects.count()
@@ -335,18 +177,18 @@ class AdminAnalyticsView(views.APIView):
         
         # Feedback analysis
         feedback_breakdown = dict(
-            Prediction.objects.exclude(
-                user_feedback=''
-            ).values('user_feedback').annotate(
-                count=Count('id')
-            ).values_list('user_feedback', 'count')
+            PredictionRollup.objects.exclude(
+                feedback=''
+            ).values('feedback').annotate(
+                count=Sum('predictions')
+            ).filter(count__gt=0).values_list('feedback', 'count')
         )
         
         return Response({
             'system_health': {
-                'total_predictions': total_predictions,
+                'total_predictions': totals['total'],
                 'predictions_today': predictions_today,
-                'avg_processing_time_ms': avg_processing_time
+                'avg_processing_time_ms': totals['avg_processing_time_ms']
             },
             'users': {
                 'total': total_users,
@@ -358,3 +200,38 @@ class AdminAnalyticsView(views.APIView):
             },
             'feedback': feedback_breakdown
         })
+
+
+class MapLayersView(views.APIView):
+    """
+    GeoJSON layers for the breed distribution map in one request
+    
+    Breeds per state, conservation-status counts and prediction density,
+    served as a precompressed cached blob with ETag revalidation.
+    """
+    permission_classes = [AllowAny]
+    query_budget = 9
+    
+    def get(self, request):
+        zoom = request.query_params.get('zoom', 'state')
+        if zoom not in ZOOM_LEVELS:
+            return Response(
+                {'error': f"zoom must be one of: {', '.join(ZOOM_LEVELS)}"},
+                status=400
+            )
+        
+        etag, body, gzip_body = get_map_layers(zoom)
+        use_gzip = 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if use_gzip:
+            etag = etag[:-1] + '-gzip"'
+        
+        if etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+            response = HttpResponse(status=304)
+        else:
+            response = HttpResponse(gzip_body if use_gzip else body, content_type='application/json')
+            if use_gzip:
+                response['Content-Encoding'] = 'gzip'
+        response['ETag'] = etag
+        response['Vary'] = 'Accept-Encoding'
+        response['Cache-Control'] = 'public, max-age=300'
+        return response
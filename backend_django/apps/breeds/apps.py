@@ -5,3 +5,6 @@ class BreedsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.breeds'
     verbose_name = 'Breeds'
+    
+    def ready(self):
+        import apps.breeds.signals  # noqa
@@ -7,6 +7,7 @@ from pathlib import Path
 from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
 from apps.breeds.models import Breed
+from apps.breeds.services import BreedResolver
 from apps.core.models import State
 
 
@@ -64,6 +65,9 @@ class Command(BaseCommand):
                 created_count += created
                 updated_count += updated
         
+        # Prediction responses resolve breeds from an in-process table
+        BreedResolver.invalidate()
+        
         self.stdout.write(
             self.style.SUCCESS(
                 f'Successfully imported breeds: {created_count} created, {updated_count} updated'
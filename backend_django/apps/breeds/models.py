@@ -3,6 +3,7 @@ Breed models for cattle and buffalo breeds
 """
 
 from django.db import models
+from django.db.models import F
 from django.utils.translation import gettext_lazy as _
 
 
@@ -179,3 +180,38 @@ class BreedResource(models.Model):
     
     def __str__(self):
         return f"{self.breed.name}: {self.title}"
+
+
+class BreedContentVersion(models.Model):
+    """
+    Counter bumped on every breed content change (a single row)
+    
+    Kept in the database because it is the one store every server process
+    and management command shares; in-process breed tables built at an
+    older value are rebuilt on their next lookup.
+    """
+    
+    SINGLETON_ID = 1
+    
+    version = models.BigIntegerField(default=0)
+    
+    class Meta:
+        verbose_name = _('Breed Content Version')
+        verbose_name_plural = _('Breed Content Version')
+    
+    def __str__(self):
+        return f"Breed content v{self.version}"
+    
+    @classmethod
+    def current(cls) -> int:
+        version = cls.objects.filter(pk=cls.SINGLETON_ID).values_list('version', flat=True).first()
+        return version or 0
+    
+    @classmethod
+    def bump(cls) -> None:
+        """Advance the counter; an F() update, so concurrent bumps all count"""
+        if cls.objects.filter(pk=cls.SINGLETON_ID).update(version=F('version') + 1):
+            return
+        _, created = cls.objects.get_or_create(pk=cls.SINGLETON_ID, defaults={'version': 1})
+        if not created:
+            cls.objects.filter(pk=cls.SINGLETON_ID).update(version=F('version') + 1)
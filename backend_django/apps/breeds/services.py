@@ -0,0 +1,65 @@
+"""
+Breed services
+In-process resolution of model class labels to breeds
+"""
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from .models import Breed, BreedContentVersion
+
+# label -> (breed primary key, BreedDetailSerializer payload)
+Resolution = Tuple[int, Dict[str, Any]]
+
+
+class BreedResolver:
+    """
+    Maps model output labels to breed rows without touching the database
+
+    The table of every breed, keyed by lower-cased name and breed_id, is
+    built once with its serialized detail payload. Breed content changes
+    bump ``BreedContentVersion`` in the database, so every worker process,
+    including after a ``manage.py import_breeds`` run elsewhere, drops its
+    table on the next lookup after an edit.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._by_name: Dict[str, Resolution] = {}
+        self._by_breed_id: Dict[str, Resolution] = {}
+
+    @staticmethod
+    def current_version() -> int:
+        return BreedContentVersion.current()
+
+    @staticmethod
+    def invalidate() -> None:
+        """Make every process rebuild its table on the next lookup"""
+        BreedContentVersion.bump()
+
+    def _build(self) -> None:
+        from .serializers import BreedDetailSerializer
+
+        by_name: Dict[str, Resolution] = {}
+        by_breed_id: Dict[str, Resolution] = {}
+        for breed in Breed.objects.prefetch_related('native_states', 'resources'):
+            resolution = (breed.pk, BreedDetailSerializer(breed).data)
+            by_name.setdefault(breed.name.lower(), resolution)
+            by_breed_id.setdefault(breed.breed_id.lower(), resolution)
+        self._by_name, self._by_breed_id = by_name, by_breed_id
+
+    def resolve(self, label: str) -> Optional[Resolution]:
+        """(primary key, detail payload) for a model label, by name then breed_id"""
+        version = self.current_version()
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    self._build()
+                    self._version = version
+        key = label.lower()
+        return self._by_name.get(key) or self._by_breed_id.get(key.replace(' ', '_'))
+
+
+# Shared resolver for prediction views
+breed_resolver = BreedResolver()
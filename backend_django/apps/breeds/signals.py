@@ -0,0 +1,35 @@
+"""
+Breed signals
+Invalidate the breed resolution table on breed content changes
+"""
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core.models import State
+from .models import Breed, BreedResource
+from .services import BreedResolver
+
+# Saves touching only these fields do not change resolution payloads
+BREED_COUNTER_FIELDS = frozenset({'view_count'})
+
+
+@receiver(post_save, sender=Breed)
+def invalidate_on_breed_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= BREED_COUNTER_FIELDS:
+        return
+    BreedResolver.invalidate()
+
+
+@receiver(post_delete, sender=Breed)
+@receiver(post_save, sender=State)
+@receiver(post_save, sender=BreedResource)
+@receiver(post_delete, sender=BreedResource)
+def invalidate_on_breed_changed(sender, **kwargs):
+    BreedResolver.invalidate()
+
+
+@receiver(m2m_changed, sender=Breed.native_states.through)
+def invalidate_on_breed_states_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        BreedResolver.invalidate()
@@ -7,7 +7,7 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from django_filters import rest_framework as filters
-from django.db.models import F
+from django.db.models import Avg, Count, F, Q
 
 from .models import Breed, BreedComparison, BreedResource
 from .serializers import (
@@ -46,13 +46,14 @@ class BreedListView(generics.ListAPIView):
     Search by name, name_hindi, native_region
     Order by name, carbon_score, view_count
     """
-    queryset = Breed.objects.filter(is_active=True)
+    queryset = Breed.objects.filter(is_active=True).prefetch_related('native_states')
     serializer_class = BreedListSerializer
     permission_classes = [AllowAny]
     filterset_class = BreedFilter
     search_fields = ['name', 'name_hindi', 'native_region']
     ordering_fields = ['name', 'carbon_score', 'view_count', 'created_at']
     ordering = ['name']
+    query_budget = 5
 
 
 class BreedDetailView(generics.RetrieveAPIView):
@@ -61,10 +62,11 @@ class BreedDetailView(generics.RetrieveAPIView):
     
     Use breed_id (e.g., 'gir', 'murrah') or database ID
     """
-    queryset = Breed.objects.filter(is_active=True)
+    queryset = Breed.objects.filter(is_active=True).prefetch_related('native_states', 'resources')
     serializer_class = BreedDetailSerializer
     permission_classes = [AllowAny]
     lookup_field = 'breed_id'
+    query_budget = 6
     
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -78,9 +80,10 @@ class BreedByIdView(generics.RetrieveAPIView):
     """
     Get breed by database ID
     """
-    queryset = Breed.objects.filter(is_active=True)
+    queryset = Breed.objects.filter(is_active=True).prefetch_related('native_states', 'resources')
     serializer_class = BreedDetailSerializer
     permission_classes = [AllowAny]
+    query_budget = 5
 
 
 class BreedCompareView(views.APIView):
@@ -90,17 +93,18 @@ class BreedCompareView(views.APIView):
     POST with { "breed_ids": ["gir", "sahiwal", "murrah"] }
     """
     permission_classes = [AllowAny]
+    query_budget = 10
     
     def post(self, request):
         serializer = BreedCompareSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
         breed_ids = serializer.validated_data['breed_ids']
-        breeds = Breed.objects.filter(breed_id__in=breed_ids)
+        breeds = Breed.objects.filter(breed_id__in=breed_ids).prefetch_related('native_states', 'resources')
         
         # Track comparison
         if len(breed_ids) == 2:
-            self._track_comparison(breed_ids[0], breed_ids[1])
+            self._track_comparison(breeds, breed_ids[0], breed_ids[1])
         
         # Generate comparison metrics
         comparison_metrics = self._generate_comparison_metrics(breeds)
@@ -114,23 +118,24 @@ class BreedCompareView(views.APIView):
         
         return Response(result)
     
-    def _track_comparison(self, breed_id_1, breed_id_2):
+    def _track_comparison(self, breeds, breed_id_1, breed_id_2):
         """Track comparison for analytics"""
-        try:
-            breed_1 = Breed.objects.get(breed_id=breed_id_1)
-            breed_2 = Breed.objects.get(breed_id=breed_id_2)
-            
-            # Ensure consistent ordering
-            if breed_1.id > breed_2.id:
-                breed_1, breed_2 = breed_2, breed_1
-            
-            comparison, created = BreedComparison.objects.get_or_create(
-                breed_1=breed_1,
-                breed_2=breed_2
-            )
-            comparison.increment_count()
-        except Breed.DoesNotExist:
-            pass
+        # The breeds are already loaded for the response
+        by_id = {breed.breed_id: breed for breed in breeds}
+        breed_1 = by_id.get(breed_id_1)
+        breed_2 = by_id.get(breed_id_2)
+        if breed_1 is None or breed_2 is None:
+            return
+        
+        # Ensure consistent ordering
+        if breed_1.id > breed_2.id:
+            breed_1, breed_2 = breed_2, breed_1
+        
+        comparison, created = BreedComparison.objects.get_or_create(
+            breed_1=breed_1,
+            breed_2=breed_2
+        )
+        comparison.increment_count()
     
     def _generate_comparison_metrics(self, breeds):
         """Generate comparison metrics between breeds"""
@@ -175,10 +180,11 @@ class PopularComparisonsView(generics.ListAPIView):
     """
     Get most popular breed comparisons
     """
-    queryset = BreedComparison.objects.all()[:10]
+    queryset = BreedComparison.objects.select_related('breed_1', 'breed_2')[:10]
     serializer_class = BreedComparisonPopularSerializer
     permission_classes = [AllowAny]
     pagination_class = None
+    query_budget = 3
 
 
 class BreedsByStateView(views.APIView):
@@ -186,18 +192,19 @@ class BreedsByStateView(views.APIView):
     Get breeds native to a specific state
     """
     permission_classes = [AllowAny]
+    query_budget = 4
     
     def get(self, request, state_name):
         breeds = Breed.objects.filter(
             is_active=True,
             native_states__name__icontains=state_name
-        )
+        ).prefetch_related('native_states')
         
         serializer = BreedListSerializer(breeds, many=True)
         
         return Response({
             'state': state_name,
-            'total': breeds.count(),
+            'total': len(serializer.data),
             'breeds': serializer.data
         })
 
@@ -207,33 +214,37 @@ class BreedStatsView(views.APIView):
     Get overall breed statistics
     """
     permission_classes = [AllowAny]
+    query_budget = 6
     
     def get(self, request):
-        total_breeds = Breed.objects.filter(is_active=True).count()
-        cattle_count = Breed.objects.filter(is_active=True, animal_type='cattle').count()
-        buffalo_count = Breed.objects.filter(is_active=True, animal_type='buffalo').count()
-        
-        # Conservation breakdown
-        conservation_stats = {}
-        for status, label in Breed.CONSERVATION_STATUS:
-            conservation_stats[status] = Breed.objects.filter(
-                is_active=True,
-                conservation_status=status
-            ).count()
+        active = Breed.objects.filter(is_active=True)
+        
+        # Totals and conservation breakdown in one pass
+        counts = active.aggregate(
+            total=Count('id'),
+            cattle=Count('id', filter=Q(animal_type='cattle')),
+            buffalo=Count('id', filter=Q(animal_type='buffalo')),
+            **{
+                status: Count('id', filter=Q(conservation_status=status))
+                for status, label in Breed.CONSERVATION_STATUS
+            }
+        )
+        conservation_stats = {
+            status: counts[status] for status, label in Breed.CONSERVATION_STATUS
+        }
         
         # Most viewed breeds
-        most_viewed = Breed.objects.filter(is_active=True).order_by('-view_count')[:5]
+        most_viewed = active.order_by('-view_count').prefetch_related('native_states')[:5]
         
         # Average carbon score by type
-        from django.db.models import Avg
-        avg_scores = Breed.objects.filter(is_active=True).values('animal_type').annotate(
+        avg_scores = active.values('animal_type').annotate(
             avg_carbon=Avg('carbon_score')
         )
         
         return Response({
-            'total_breeds': total_breeds,
-            'cattle_count': cattle_count,
-            'buffalo_count': buffalo_count,
+            'total_breeds': counts['total'],
+            'cattle_count': counts['cattle'],
+            'buffalo_count': counts['buffalo'],
             'conservation_breakdown': conservation_stats,
             'most_viewed': BreedListSerializer(most_viewed, many=True).data,
             'average_carbon_scores': {item['animal_type']: item['avg_carbon'] for item in avg_scores}
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import GovernmentScheme, State, Feedback
+from .models import GovernmentScheme, State, Feedback, SyncChange, QueuedTask
 
 
 @admin.register(GovernmentScheme)
@@ -46,3 +46,18 @@ class FeedbackAdmin(admin.ModelAdmin):
     search_fields = ['subject', 'message', 'email']
     readonly_fields = ['created_at', 'updated_at']
     raw_id_fields = ['user', 'related_breed', 'related_prediction']
+
+
+@admin.register(SyncChange)
+class SyncChangeAdmin(admin.ModelAdmin):
+    list_display = ['id', 'kind', 'record_id', 'deleted', 'changed_at']
+    list_filter = ['kind', 'deleted']
+    search_fields = ['record_id']
+    readonly_fields = ['kind', 'record_id', 'deleted', 'changed_at']
+
+
+@admin.register(QueuedTask)
+class QueuedTaskAdmin(admin.ModelAdmin):
+    list_display = ['id', 'name', 'status', 'attempts', 'run_after', 'claimed_at', 'created_at']
+    list_filter = ['status', 'name']
+    readonly_fields = ['created_at']
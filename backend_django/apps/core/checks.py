@@ -0,0 +1,30 @@
+"""
+Core system checks
+Deployment settings the cache-coordinated features rely on
+"""
+
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+# Backends whose entries are private to one process
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [
+        Warning(
+            f"CACHES['default'] uses {backend.rsplit('.', 1)[-1]}, which is private to each process.",
+            hint=(
+                "With several workers, analytics snapshots are recomputed by every worker and "
+                "query metrics are per worker. Use a shared backend such as Redis."
+            ),
+            id='core.W001',
+        )
+    ]
@@ -0,0 +1,132 @@
+"""
+Core column selection
+Load only the columns a serializer or admin list actually reads
+"""
+
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple
+
+from django.contrib.admin.views.main import ChangeList
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+def _resolve(model, path: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Map a dotted attribute path to an only() path and a select_related path
+
+    Returns (None, None) when the path does not start at a concrete field,
+    e.g. a property or reverse relation, which cannot be pruned safely.
+    """
+    parts = path.split('.')
+    try:
+        field = model._meta.get_field(parts[0])
+    except FieldDoesNotExist:
+        return None, None
+    if not field.concrete:
+        return None, None
+    if not field.is_relation or len(parts) == 1:
+        return field.name, (field.name if field.is_relation else None)
+    # Only the first hop is pruned; deeper paths load the related row whole
+    related = field.related_model
+    try:
+        nested = related._meta.get_field(parts[1])
+    except FieldDoesNotExist:
+        return field.name, field.name
+    if nested.concrete and not nested.is_relation:
+        return f'{field.name}__{nested.name}', field.name
+    return field.name, field.name
+
+
+@lru_cache(maxsize=None)
+def serializer_columns(serializer_class) -> Optional[Tuple[Tuple[str, ...], Tuple[str, ...]]]:
+    """
+    (only, select_related) paths for a ModelSerializer, or None
+
+    Method fields and ``source='*'`` fields read arbitrary attributes, so
+    they must be described by ``Meta.column_sources`` (field name -> list
+    of attribute paths); otherwise nothing is pruned.
+    """
+    meta = getattr(serializer_class, 'Meta', None)
+    model = getattr(meta, 'model', None)
+    if model is None:
+        return None
+    declared = getattr(meta, 'column_sources', {})
+
+    paths = []
+    for name, field in serializer_class().fields.items():
+        if name in declared:
+            paths.extend(declared[name])
+        elif isinstance(field, serializers.SerializerMethodField) or field.source == '*':
+            return None
+        else:
+            paths.append(field.source)
+
+    return model_columns(model, paths)
+
+
+def model_columns(model, paths: Iterable[str]) -> Optional[Tuple[Tuple[str, ...], Tuple[str, ...]]]:
+    """(only, select_related) paths for attribute paths on model, or None"""
+    only = [model._meta.pk.name]
+    related = []
+    for path in paths:
+        column, relation = _resolve(model, path)
+        if column is None:
+            return None
+        if column not in only:
+            only.append(column)
+        if relation and relation not in related:
+            related.append(relation)
+    # A related row loaded whole makes narrower paths into it redundant
+    only = [
+        column for column in only
+        if '__' not in column or column.split('__')[0] not in only
+    ]
+    return tuple(only), tuple(related)
+
+
+def prune_columns(queryset, serializer_class):
+    """Restrict a queryset to the columns serializer_class reads"""
+    columns = serializer_columns(serializer_class)
+    if columns is None:
+        return queryset
+    only, related = columns
+    if related:
+        queryset = queryset.select_related(*related)
+    return queryset.only(*only)
+
+
+class SerializerColumnsMixin:
+    """
+    Generic-view mixin: load only the columns the serializer reads
+
+    Wide columns the response never shows (images, JSON blobs, notes) stay
+    in the database instead of being read and thrown away on every row.
+    """
+
+    def get_queryset(self):
+        return prune_columns(super().get_queryset(), self.get_serializer_class())
+
+
+class ColumnsChangeList(ChangeList):
+    """Admin changelist that reads only the columns in list_display"""
+
+    def get_queryset(self, request, exclude_parameters=None):
+        queryset = super().get_queryset(request, exclude_parameters)
+        paths = [name for name in self.list_display if name != 'action_checkbox']
+        if not all(isinstance(name, str) for name in paths):
+            return queryset
+        columns = model_columns(self.model, paths)
+        if columns is None:
+            return queryset
+        only, related = columns
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*only)
+
+
+class ListColumnsAdminMixin:
+    """ModelAdmin mixin: changelist pages skip columns the list never shows"""
+
+    def get_changelist(self, request, **kwargs):
+        return ColumnsChangeList
@@ -0,0 +1,54 @@
+"""
+Django management command to run background tasks from the database queue
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+from django.db import close_old_connections
+
+from apps.core.task_queue import DatabaseBackend
+
+
+class Command(BaseCommand):
+    help = "Run queued background tasks (TASK_QUEUE BACKEND 'database')"
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run every due task, then exit'
+        )
+    
+    def handle(self, *args, **options):
+        config = settings.TASK_QUEUE
+        if config['BACKEND'] != 'database':
+            raise CommandError(
+                f"TASK_QUEUE BACKEND is '{config['BACKEND']}'; run_tasks only serves 'database'"
+            )
+        
+        # A standalone worker: no in-process threads, just this loop
+        worker = DatabaseBackend(
+            workers=0,
+            poll_interval=config['POLL_INTERVAL'],
+            lease_timeout=config.get('LEASE_TIMEOUT', 600)
+        )
+        if options['once']:
+            ran = worker.run_pending()
+            self.stdout.write(self.style.SUCCESS(f'Ran {ran} tasks'))
+            return
+        
+        # A long-running worker also replays predictions a web process spooled
+        from apps.predictions.buffer import prediction_buffer
+        if prediction_buffer.has_spool():
+            prediction_buffer.start()
+        
+        self.stdout.write(f"Running queued tasks (polling every {config['POLL_INTERVAL']}s)")
+        try:
+            while True:
+                close_old_connections()
+                if not worker.run_pending():
+                    time.sleep(worker.poll_interval)
+        except KeyboardInterrupt:
+            self.stdout.write('Stopped')
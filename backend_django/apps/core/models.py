@@ -2,7 +2,8 @@
 Core app models - Government Schemes and other shared models
 """
 
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
@@ -143,3 +144,87 @@ class Feedback(models.Model):
     
     def __str__(self):
         return f"{self.feedback_type}: {self.subject}"
+
+
+class SyncChange(models.Model):
+    """
+    Change log entry for delta sync clients
+    
+    One row per record: a change deletes the record's previous row and
+    appends a new one, so the auto-increment id is the record's version and
+    the table stays as small as the catalog. (kind, record_id) is unique, so
+    concurrent writers cannot leave two live versions of one record.
+    """
+    
+    KINDS = [
+        ('breed', 'Breed'),
+        ('scheme', 'Government Scheme'),
+    ]
+    
+    kind = models.CharField(max_length=10, choices=KINDS)
+    record_id = models.CharField(max_length=50)  # Breed.breed_id or GovernmentScheme.pk
+    deleted = models.BooleanField(default=False)
+    changed_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['id']
+        verbose_name = _('Sync Change')
+        verbose_name_plural = _('Sync Changes')
+        unique_together = ['kind', 'record_id']
+    
+    def __str__(self):
+        action = 'deleted' if self.deleted else 'changed'
+        return f"{self.kind} {self.record_id} {action} (v{self.id})"
+    
+    @classmethod
+    def record(cls, kind, record_id, deleted=False):
+        """Log a change to one record, superseding its previous entry"""
+        record_id = str(record_id)
+        for attempt in range(3):
+            try:
+                with transaction.atomic():
+                    cls.objects.filter(kind=kind, record_id=record_id).delete()
+                    return cls.objects.create(kind=kind, record_id=record_id, deleted=deleted)
+            except IntegrityError:
+                # A concurrent writer inserted first; supersede its row
+                if attempt == 2:
+                    raise
+
+
+class QueuedTask(models.Model):
+    """
+    Background job for the database task backend
+    
+    Rows are claimed by a conditional status update, so several worker
+    threads or processes can poll the same table; finished jobs are deleted.
+    A running job whose lease (``claimed_at``) expired was left by a dead
+    worker and is claimed again.
+    """
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('failed', 'Failed'),
+    ]
+    
+    name = models.CharField(max_length=100)
+    args = models.JSONField(default=list)
+    kwargs = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['run_after', 'id']
+        verbose_name = _('Queued Task')
+        verbose_name_plural = _('Queued Tasks')
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+            models.Index(fields=['status', 'claimed_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} ({self.status}, attempt {self.attempts})"
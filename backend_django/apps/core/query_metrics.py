@@ -0,0 +1,245 @@
+"""
+SQL query metrics
+Per-request query counts, SQL time and repeated query shapes, with budgets
+
+``QueryMetricsMiddleware`` records every query a request runs. With
+``settings.QUERY_METRICS['HEADERS']`` (default: DEBUG) the numbers are sent
+back as ``X-Query-*`` response headers; in all modes they are summed per
+endpoint and flushed to the cache for ``GET /api/v1/query-metrics/``.
+
+Views declare a budget with a ``query_budget`` class attribute (or the
+``@query_budget(n)`` decorator on function views). Going over it prints a
+warning with the repeated shapes; with ``ENFORCE_BUDGETS`` on, as in tests,
+it raises ``QueryBudgetExceeded`` instead.
+"""
+
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+CACHE_PREFIX = 'query_metrics'
+COUNTERS = ('requests', 'queries', 'sql_us', 'duplicates', 'over_budget')
+
+# "IN (%s, %s, %s)" and "VALUES (...), (...)" collapse to one shape
+IN_LIST = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+VALUES_ROWS = re.compile(r'(\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+')
+
+
+def _config() -> Dict[str, Any]:
+    config = {
+        'ENABLED': True,
+        'HEADERS': settings.DEBUG,
+        'ENFORCE_BUDGETS': False,
+        'FLUSH_INTERVAL': 10.0,
+    }
+    config.update(getattr(settings, 'QUERY_METRICS', {}))
+    return config
+
+
+def query_shape(sql: str) -> str:
+    """SQL with parameter lists folded, so N lookups of one kind match"""
+    return VALUES_ROWS.sub(r'\1', IN_LIST.sub('(...)', sql))
+
+
+def query_budget(limit: int):
+    """Declare the most queries a function view may run"""
+    def decorate(view):
+        view.query_budget = limit
+        return view
+    return decorate
+
+
+def view_budget(view_func) -> Optional[int]:
+    """Budget from a function view or from the class behind as_view()"""
+    budget = getattr(view_func, 'query_budget', None)
+    if budget is None:
+        view_class = getattr(view_func, 'view_class', None) or getattr(view_func, 'cls', None)
+        budget = getattr(view_class, 'query_budget', None)
+    return budget
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A view ran more queries than its declared budget"""
+
+
+class QueryRecorder:
+    """Execute wrapper collecting one request's queries"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+        self.endpoint: Optional[str] = None
+        self.budget: Optional[int] = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+            self.shapes[query_shape(sql)] += 1
+
+    @property
+    def duplicates(self) -> int:
+        """Queries that repeated an earlier shape: the N in N+1"""
+        return sum(count - 1 for count in self.shapes.values())
+
+    def repeated(self, limit: int = 3) -> List[str]:
+        return [
+            f'{count}x {shape[:200]}'
+            for shape, count in self.shapes.most_common(limit) if count > 1
+        ]
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+
+class EndpointMetrics:
+    """
+    Per-endpoint totals, summed in-process and flushed to the cache
+
+    Counters go through cache.incr so every worker adds to the same numbers
+    (given a shared cache backend; LocMemCache keeps one set per process);
+    flushing every few seconds keeps cache traffic off the request path.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+        self._max: Dict[str, int] = {}
+        self._budgets: Dict[str, Optional[int]] = {}
+        self._last_flush = time.monotonic()
+
+    def record(self, recorder: QueryRecorder, flush_interval: float) -> None:
+        endpoint = recorder.endpoint
+        with self._lock:
+            totals = self._pending[endpoint]
+            totals['requests'] += 1
+            totals['queries'] += recorder.count
+            totals['sql_us'] += int(recorder.seconds * 1_000_000)
+            totals['duplicates'] += recorder.duplicates
+            totals['over_budget'] += int(recorder.over_budget)
+            self._max[endpoint] = max(self._max.get(endpoint, 0), recorder.count)
+            self._budgets[endpoint] = recorder.budget
+            due = time.monotonic() - self._last_flush >= flush_interval
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+            peaks, self._max = self._max, {}
+            budgets = dict(self._budgets)
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+        try:
+            for endpoint, totals in pending.items():
+                for name, value in totals.items():
+                    key = f'{CACHE_PREFIX}:{endpoint}:{name}'
+                    cache.add(key, 0, None)
+                    cache.incr(key, value)
+                peak_key = f'{CACHE_PREFIX}:{endpoint}:max_queries'
+                if peaks[endpoint] > (cache.get(peak_key) or 0):
+                    cache.set(peak_key, peaks[endpoint], None)
+                cache.set(f'{CACHE_PREFIX}:{endpoint}:budget', budgets.get(endpoint), None)
+            # Re-added on every flush, so a lost concurrent update heals itself
+            endpoints = set(cache.get(f'{CACHE_PREFIX}:endpoints') or ()) | set(pending)
+            cache.set(f'{CACHE_PREFIX}:endpoints', sorted(endpoints), None)
+        except Exception as e:
+            print(f"Query metrics flush failed: {e}")
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Totals and averages per endpoint, busiest first"""
+        self.flush()
+        rows = []
+        for endpoint in cache.get(f'{CACHE_PREFIX}:endpoints') or ():
+            names = [*COUNTERS, 'max_queries', 'budget']
+            values = cache.get_many([f'{CACHE_PREFIX}:{endpoint}:{name}' for name in names])
+            data = {name: values.get(f'{CACHE_PREFIX}:{endpoint}:{name}') for name in names}
+            requests = data['requests'] or 0
+            if not requests:
+                continue
+            rows.append({
+                'endpoint': endpoint,
+                'requests': requests,
+                'avg_queries': round((data['queries'] or 0) / requests, 2),
+                'max_queries': data['max_queries'] or 0,
+                'avg_sql_ms': round((data['sql_us'] or 0) / requests / 1000, 3),
+                'avg_duplicate_queries': round((data['duplicates'] or 0) / requests, 2),
+                'budget': data['budget'],
+                'over_budget': data['over_budget'] or 0,
+            })
+        return sorted(rows, key=lambda row: -row['requests'])
+
+    def reset(self) -> None:
+        with self._lock:
+            self._pending.clear()
+            self._max.clear()
+        endpoints = cache.get(f'{CACHE_PREFIX}:endpoints') or ()
+        cache.delete_many([
+            f'{CACHE_PREFIX}:{endpoint}:{name}'
+            for endpoint in endpoints
+            for name in (*COUNTERS, 'max_queries', 'budget')
+        ] + [f'{CACHE_PREFIX}:endpoints'])
+
+
+endpoint_metrics = EndpointMetrics()
+
+
+class QueryMetricsMiddleware:
+    """Record the queries behind every request; see the module docstring"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        config = _config()
+        if not config['ENABLED']:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        request.query_recorder = recorder
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        if recorder.endpoint is not None:
+            endpoint_metrics.record(recorder, config['FLUSH_INTERVAL'])
+
+        if config['HEADERS']:
+            response['X-Query-Count'] = str(recorder.count)
+            response['X-Query-Time-Ms'] = f'{recorder.seconds * 1000:.1f}'
+            response['X-Query-Duplicates'] = str(recorder.duplicates)
+            if recorder.budget is not None:
+                response['X-Query-Budget'] = str(recorder.budget)
+
+        if recorder.over_budget:
+            message = (
+                f"{recorder.endpoint} ran {recorder.count} queries, budget {recorder.budget}"
+                + ''.join(f"\n  {line}" for line in recorder.repeated())
+            )
+            if config['ENFORCE_BUDGETS']:
+                raise QueryBudgetExceeded(message)
+            print(f"Query budget exceeded: {message}")
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        recorder = getattr(request, 'query_recorder', None)
+        if recorder is not None:
+            match = request.resolver_match
+            recorder.endpoint = (match.view_name if match else None) or request.path
+            recorder.budget = view_budget(view_func)
+        return None
@@ -0,0 +1,26 @@
+"""
+Core renderers
+"""
+
+from rest_framework.renderers import BaseRenderer
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Compact binary bodies for clients sending Accept: application/msgpack"""
+    
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        # Serializer output is JSON-ready apart from the odd Decimal or date
+        return msgpack.packb(data, use_bin_type=True, default=str)
@@ -0,0 +1,47 @@
+"""
+Core signals
+Feed the delta sync change log from breed and scheme edits
+"""
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from apps.breeds.models import Breed
+from .models import GovernmentScheme, SyncChange
+
+# Saves touching only these fields are not content changes for clients
+BREED_COUNTER_FIELDS = frozenset({'view_count'})
+
+
+@receiver(post_save, sender=Breed)
+def log_breed_saved(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw or (update_fields and set(update_fields) <= BREED_COUNTER_FIELDS):
+        return
+    SyncChange.record('breed', instance.breed_id)
+
+
+@receiver(post_delete, sender=Breed)
+def log_breed_deleted(sender, instance, **kwargs):
+    SyncChange.record('breed', instance.breed_id, deleted=True)
+
+
+@receiver(m2m_changed, sender=Breed.native_states.through)
+def log_breed_states_changed(sender, instance, action, reverse, pk_set=None, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        SyncChange.record('breed', instance.breed_id)
+    elif pk_set:
+        for breed_id in Breed.objects.filter(pk__in=pk_set).values_list('breed_id', flat=True):
+            SyncChange.record('breed', breed_id)
+
+
+@receiver(post_save, sender=GovernmentScheme)
+def log_scheme_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        SyncChange.record('scheme', instance.pk)
+
+
+@receiver(post_delete, sender=GovernmentScheme)
+def log_scheme_deleted(sender, instance, **kwargs):
+    SyncChange.record('scheme', instance.pk, deleted=True)
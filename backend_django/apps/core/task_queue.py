@@ -0,0 +1,349 @@
+"""
+Background task layer
+Run post-response work on Celery, a local thread queue or a database queue
+
+Tasks are plain functions decorated with ``@task``; callers use
+``some_task.delay(...)``. ``settings.TASK_QUEUE['BACKEND']`` picks where
+they run:
+
+- ``thread``: in-process worker threads (single-box default)
+- ``database``: rows in ``QueuedTask``, run by in-process threads and/or
+  ``manage.py run_tasks`` workers; survives restarts
+- ``celery``: the Celery app in ``breed_recognition.celery``
+- ``eager``: inline in the caller, for tests and scripts
+
+Arguments must be JSON serializable so every backend can carry them.
+"""
+
+import atexit
+import heapq
+import itertools
+import threading
+import time
+import traceback
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+try:
+    from celery import shared_task
+    CELERY_AVAILABLE = True
+except ImportError:
+    CELERY_AVAILABLE = False
+
+BACKENDS = ('thread', 'database', 'celery', 'eager')
+
+
+class RetryLater(Exception):
+    """Raised by a task whose inputs are not ready yet, e.g. an unflushed row"""
+
+    def __init__(self, message: str = '', delay: Optional[float] = None):
+        super().__init__(message)
+        self.delay = delay
+
+
+class Task:
+    """A registered background function"""
+
+    def __init__(self, fn: Callable, name: str, max_retries: int, retry_delay: float):
+        self.fn = fn
+        self.name = name
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._celery_task = None
+        if CELERY_AVAILABLE:
+            def run(celery_task, *args, **kwargs):
+                try:
+                    return fn(*args, **kwargs)
+                except RetryLater as e:
+                    raise celery_task.retry(exc=e, countdown=e.delay or retry_delay)
+
+            run.__name__, run.__module__ = fn.__name__, fn.__module__
+            self._celery_task = shared_task(name=name, bind=True, max_retries=max_retries)(run)
+
+    def __call__(self, *args, **kwargs):
+        return self.fn(*args, **kwargs)
+
+    def __repr__(self):
+        return f'<Task {self.name}>'
+
+    def delay(self, *args, **kwargs) -> None:
+        """Run the task in the background on the configured backend"""
+        get_backend().enqueue(self, list(args), kwargs)
+
+
+_registry: Dict[str, Task] = {}
+
+
+def task(name: Optional[str] = None, max_retries: int = 5, retry_delay: float = 2.0):
+    """Register a function as a background task"""
+    def decorator(fn: Callable) -> Task:
+        registered = Task(fn, name or f'{fn.__module__}.{fn.__name__}', max_retries, retry_delay)
+        _registry[registered.name] = registered
+        return registered
+    return decorator
+
+
+def get_task(name: str) -> Task:
+    if name not in _registry:
+        # Task modules register on import; make sure every app's is loaded
+        from django.utils.module_loading import autodiscover_modules
+        autodiscover_modules('tasks')
+    return _registry[name]
+
+
+def _log_failure(name: str, attempt: int, error: BaseException) -> None:
+    print(f"Task {name} failed (attempt {attempt}): {error}")
+
+
+class EagerBackend:
+    """Runs tasks inline; retries immediately"""
+
+    def enqueue(self, task_obj: Task, args: List[Any], kwargs: Dict[str, Any]) -> None:
+        for attempt in range(1, task_obj.max_retries + 2):
+            try:
+                task_obj.fn(*args, **kwargs)
+                return
+            except RetryLater as e:
+                if attempt > task_obj.max_retries:
+                    _log_failure(task_obj.name, attempt, e)
+            except Exception as e:
+                _log_failure(task_obj.name, attempt, e)
+                return
+
+
+class ThreadBackend:
+    """
+    In-process queue served by worker threads
+
+    Jobs sit in a heap ordered by due time, so retries can wait without
+    holding a thread. Queued jobs are drained at interpreter exit.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = max(1, workers)
+        self._heap: List[Tuple[float, int, Task, List[Any], Dict[str, Any], int]] = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._stopped = False
+        atexit.register(self.close)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def enqueue(self, task_obj: Task, args, kwargs, attempt: int = 1, delay: float = 0.0) -> None:
+        with self._cond:
+            heapq.heappush(
+                self._heap, (time.monotonic() + delay, next(self._counter), task_obj, args, kwargs, attempt)
+            )
+            if not self._threads:
+                for i in range(self.workers):
+                    thread = threading.Thread(target=self._work, name=f'task-worker-{i}', daemon=True)
+                    thread.start()
+                    self._threads.append(thread)
+            self._cond.notify()
+
+    def _next_job(self):
+        with self._cond:
+            while True:
+                if self._heap and (self._stopped or self._heap[0][0] <= time.monotonic()):
+                    return heapq.heappop(self._heap)
+                if self._stopped:
+                    return None
+                timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+                self._cond.wait(timeout)
+
+    def _run(self, job) -> None:
+        _, _, task_obj, args, kwargs, attempt = job
+        close_old_connections()
+        try:
+            task_obj.fn(*args, **kwargs)
+        except RetryLater as e:
+            if attempt <= task_obj.max_retries and not self._stopped:
+                self.enqueue(task_obj, args, kwargs, attempt + 1, e.delay or task_obj.retry_delay)
+            else:
+                _log_failure(task_obj.name, attempt, e)
+        except Exception as e:
+            _log_failure(task_obj.name, attempt, e)
+
+    def _work(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            self._run(job)
+
+    def close(self) -> None:
+        """Finish every queued job, then stop the workers"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+
+class DatabaseBackend:
+    """
+    Queue stored in the ``QueuedTask`` table
+
+    Jobs survive restarts. Worker threads start in the web process unless
+    ``WORKERS`` is 0, in which case only ``manage.py run_tasks`` runs them.
+    A claim is a lease of ``lease_timeout`` seconds: a job still running
+    after that belonged to a worker that died, and is run again while it
+    has retries left. Keep the lease longer than the slowest task.
+    """
+
+    def __init__(self, workers: int, poll_interval: float, lease_timeout: float = 600):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease_timeout = lease_timeout
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+
+    def enqueue(self, task_obj: Task, args, kwargs) -> None:
+        from apps.core.models import QueuedTask
+
+        QueuedTask.objects.create(name=task_obj.name, args=args, kwargs=kwargs)
+        if self.workers:
+            self._ensure_threads()
+            # Run after the enclosing transaction, when the row is visible
+            transaction.on_commit(self._wakeup.set)
+
+    def _ensure_threads(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f'task-worker-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def claim(self):
+        """Mark the next due or abandoned job running and return it, or None"""
+        from apps.core.models import QueuedTask
+
+        now = timezone.now()
+        self._reclaim_expired(now)
+        for job in QueuedTask.objects.filter(status='pending', run_after__lte=now)[:5]:
+            claimed = QueuedTask.objects.filter(pk=job.pk, status='pending').update(
+                status='running', attempts=job.attempts + 1, claimed_at=now
+            )
+            if claimed:
+                job.attempts += 1
+                job.claimed_at = now
+                return job
+        return None
+
+    def _reclaim_expired(self, now) -> None:
+        """Requeue running jobs whose lease ran out, or fail them when out of retries"""
+        from apps.core.models import QueuedTask
+
+        expired = QueuedTask.objects.filter(
+            status='running', claimed_at__lt=now - timedelta(seconds=self.lease_timeout)
+        )
+        for job in expired[:20]:
+            try:
+                retries = get_task(job.name).max_retries
+            except KeyError:
+                retries = 0
+            # Matching claimed_at makes this a no-op if another worker got there first
+            stale = QueuedTask.objects.filter(pk=job.pk, status='running', claimed_at=job.claimed_at)
+            if job.attempts <= retries:
+                if stale.update(status='pending', claimed_at=None, run_after=now,
+                                last_error='Lease expired; worker presumed dead'):
+                    print(f"Task {job.name} (id {job.pk}) lease expired, requeued")
+            elif stale.update(status='failed', last_error='Lease expired; worker presumed dead'):
+                _log_failure(job.name, job.attempts, RuntimeError('lease expired'))
+
+    def run_job(self, job) -> None:
+        from apps.core.models import QueuedTask
+
+        task_obj = get_task(job.name)
+        try:
+            task_obj.fn(*job.args, **job.kwargs)
+        except RetryLater as e:
+            if job.attempts <= task_obj.max_retries:
+                QueuedTask.objects.filter(pk=job.pk).update(
+                    status='pending',
+                    claimed_at=None,
+                    run_after=timezone.now() + timedelta(seconds=e.delay or task_obj.retry_delay),
+                    last_error=str(e)
+                )
+                return
+            self._fail(job, e)
+        except Exception as e:
+            self._fail(job, e)
+        else:
+            QueuedTask.objects.filter(pk=job.pk).delete()
+
+    def _fail(self, job, error: BaseException) -> None:
+        from apps.core.models import QueuedTask
+
+        _log_failure(job.name, job.attempts, error)
+        QueuedTask.objects.filter(pk=job.pk).update(
+            status='failed', last_error=''.join(traceback.format_exception(error))[-4000:]
+        )
+
+    def run_pending(self) -> int:
+        """Run due jobs until none are left; returns how many ran"""
+        ran = 0
+        while not self._stopped:
+            job = self.claim()
+            if job is None:
+                break
+            self.run_job(job)
+            ran += 1
+        return ran
+
+    def _work(self) -> None:
+        while not self._stopped:
+            close_old_connections()
+            try:
+                self.run_pending()
+            except Exception as e:
+                print(f"Task worker error: {e}")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+
+class CeleryBackend:
+    """Hands tasks to Celery workers through the configured broker"""
+
+    def enqueue(self, task_obj: Task, args, kwargs) -> None:
+        task_obj._celery_task.delay(*args, **kwargs)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """The backend selected in settings, created on first use"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                config = settings.TASK_QUEUE
+                name = config['BACKEND']
+                if name not in BACKENDS:
+                    raise ValueError(f"TASK_QUEUE BACKEND must be one of {BACKENDS}, got '{name}'")
+                if name == 'celery' and not CELERY_AVAILABLE:
+                    print("Celery not installed, running tasks on local threads")
+                    name = 'thread'
+                if name == 'eager':
+                    _backend = EagerBackend()
+                elif name == 'thread':
+                    _backend = ThreadBackend(config['WORKERS'])
+                elif name == 'database':
+                    _backend = DatabaseBackend(
+                        config['WORKERS'], config['POLL_INTERVAL'], config.get('LEASE_TIMEOUT', 600)
+                    )
+                else:
+                    _backend = CeleryBackend()
+    return _backend
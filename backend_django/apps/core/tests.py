@@ -0,0 +1,265 @@
+"""
+Core tests
+Query budgets of the API views, the query metrics middleware and delta sync
+"""
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.analytics.models import UserActivity
+from apps.breeds.models import Breed, BreedComparison, BreedResource
+from apps.breeds.views import BreedListView
+from apps.predictions.models import Prediction
+from apps.users.models import User, UserComparison, UserFavoriteBreed
+from .models import GovernmentScheme, State
+from .query_metrics import QueryBudgetExceeded, QueryRecorder, query_shape
+
+ENFORCED = {'ENABLED': True, 'HEADERS': True, 'ENFORCE_BUDGETS': True, 'FLUSH_INTERVAL': 0}
+
+
+def create_catalog(count, offset=0):
+    """Breeds with states and resources, so per-row lookups would show up"""
+    breeds = []
+    for index in range(offset, offset + count):
+        state = State.objects.create(
+            name=f'State {index}', code=f'S{index}', region='West'
+        )
+        breed = Breed.objects.create(
+            breed_id=f'breed_{index}',
+            name=f'Breed {index}',
+            animal_type='cattle' if index % 2 else 'buffalo',
+        )
+        breed.native_states.add(state, State.objects.get(code='S0'))
+        for number in range(2):
+            BreedResource.objects.create(
+                breed=breed,
+                title=f'Guide {number}',
+                resource_type='article',
+                url=f'https://example.com/{index}/{number}',
+            )
+        breeds.append(breed)
+    return breeds
+
+
+@override_settings(QUERY_METRICS=ENFORCED)
+class QueryBudgetTests(TestCase):
+    """
+    Every budgeted view, run with budgets enforced
+
+    A view over its budget raises QueryBudgetExceeded out of the test
+    client, so an N+1 introduced in any of them fails here.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.breeds = create_catalog(6)
+        cls.user = User.objects.create_user(email='farmer@example.com', password='pass12345')
+        cls.admin = User.objects.create_superuser(email='admin@example.com', password='pass12345')
+        for breed in cls.breeds:
+            Prediction.objects.create(
+                user=cls.user,
+                animal_type=breed.animal_type,
+                animal_type_confidence=0.9,
+                predicted_breed=breed,
+                predicted_breed_name=breed.name,
+                breed_confidence=0.8,
+                user_feedback='correct',
+            )
+            UserFavoriteBreed.objects.create(user=cls.user, breed=breed)
+            UserActivity.objects.create(user=cls.user, activity_type='view_breed', breed=breed)
+        for first, second in zip(cls.breeds, cls.breeds[1:]):
+            BreedComparison.objects.create(breed_1=first, breed_2=second, comparison_count=3)
+            UserComparison.objects.create(user=cls.user, breed_1=first, breed_2=second)
+        cls.prediction = Prediction.objects.filter(user=cls.user).first()
+
+    def setUp(self):
+        # Snapshots and map layers are cached; measure the cold path
+        cache.clear()
+        self.anonymous = APIClient()
+        self.member = APIClient()
+        self.member.force_authenticate(self.user)
+        self.staff = APIClient()
+        self.staff.force_authenticate(self.admin)
+
+    def assertWithinBudget(self, response):
+        self.assertLess(response.status_code, 400, response.content[:200])
+        self.assertIn('X-Query-Budget', response)
+        self.assertLessEqual(int(response['X-Query-Count']), int(response['X-Query-Budget']))
+
+    def test_breed_views(self):
+        breed = self.breeds[0]
+        for url in [
+            '/api/v1/breeds/',
+            f'/api/v1/breeds/{breed.breed_id}/',
+            f'/api/v1/breeds/id/{breed.pk}/',
+            '/api/v1/breeds/popular-comparisons/',
+            '/api/v1/breeds/stats/',
+            '/api/v1/breeds/by-state/State 0/',
+        ]:
+            with self.subTest(url=url):
+                self.assertWithinBudget(self.anonymous.get(url))
+
+    def test_breed_compare(self):
+        response = self.anonymous.post(
+            '/api/v1/breeds/compare/',
+            {'breed_ids': [breed.breed_id for breed in self.breeds[:3]]},
+            format='json'
+        )
+        self.assertWithinBudget(response)
+
+    def test_prediction_views(self):
+        self.assertWithinBudget(self.anonymous.get(f'/api/v1/predict/{self.prediction.public_id}/'))
+        self.assertWithinBudget(self.member.get('/api/v1/predict/history/'))
+
+    def test_user_views(self):
+        for url in ['/api/v1/users/favorites/', '/api/v1/users/comparisons/', '/api/v1/users/stats/']:
+            with self.subTest(url=url):
+                self.assertWithinBudget(self.member.get(url))
+
+    def test_analytics_views(self):
+        for client, url in [
+            (self.anonymous, '/api/v1/analytics/dashboard/'),
+            (self.anonymous, '/api/v1/analytics/breeds/'),
+            (self.anonymous, f'/api/v1/analytics/breeds/{self.breeds[0].breed_id}/'),
+            (self.anonymous, '/api/v1/analytics/popular/?period=30'),
+            (self.anonymous, '/api/v1/analytics/recent/'),
+            (self.anonymous, '/api/v1/analytics/map-layers/?zoom=detail'),
+            (self.member, '/api/v1/analytics/engagement/'),
+            (self.staff, '/api/v1/analytics/admin/'),
+        ]:
+            with self.subTest(url=url):
+                self.assertWithinBudget(client.get(url))
+
+    def test_list_queries_do_not_grow_with_rows(self):
+        before = int(self.anonymous.get('/api/v1/breeds/')['X-Query-Count'])
+        create_catalog(6, offset=6)
+        self.assertEqual(int(self.anonymous.get('/api/v1/breeds/')['X-Query-Count']), before)
+
+    def test_over_budget_raises(self):
+        with mock.patch.object(BreedListView, 'query_budget', 1):
+            with self.assertRaises(QueryBudgetExceeded), self.assertLogs('django.request', 'ERROR'):
+                self.anonymous.get('/api/v1/breeds/')
+
+    @override_settings(QUERY_METRICS={**ENFORCED, 'ENFORCE_BUDGETS': False})
+    def test_over_budget_only_warns_when_not_enforced(self):
+        with mock.patch.object(BreedListView, 'query_budget', 1):
+            response = self.anonymous.get('/api/v1/breeds/')
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(int(response['X-Query-Count']), 1)
+
+
+class QueryMetricsMiddlewareTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        create_catalog(3)
+
+    @override_settings(QUERY_METRICS=ENFORCED)
+    def test_headers(self):
+        response = APIClient().get('/api/v1/breeds/')
+        self.assertEqual(response['X-Query-Budget'], str(BreedListView.query_budget))
+        self.assertGreater(int(response['X-Query-Count']), 0)
+        self.assertGreaterEqual(int(response['X-Query-Duplicates']), 0)
+        self.assertGreaterEqual(float(response['X-Query-Time-Ms']), 0)
+
+    @override_settings(QUERY_METRICS={**ENFORCED, 'HEADERS': False})
+    def test_headers_off(self):
+        response = APIClient().get('/api/v1/breeds/')
+        self.assertNotIn('X-Query-Count', response)
+        self.assertNotIn('X-Query-Budget', response)
+
+    @override_settings(QUERY_METRICS={**ENFORCED, 'ENABLED': False})
+    def test_disabled(self):
+        self.assertNotIn('X-Query-Count', APIClient().get('/api/v1/breeds/'))
+
+    @override_settings(QUERY_METRICS=ENFORCED)
+    def test_unbudgeted_view_has_no_budget_header(self):
+        response = APIClient().get('/api/v1/states/')
+        self.assertIn('X-Query-Count', response)
+        self.assertNotIn('X-Query-Budget', response)
+
+
+class QueryShapeTests(SimpleTestCase):
+
+    def test_in_lists_fold(self):
+        self.assertEqual(
+            query_shape('SELECT * FROM t WHERE id IN (%s, %s, %s)'),
+            query_shape('SELECT * FROM t WHERE id IN (%s, %s)'),
+        )
+        self.assertEqual(query_shape('SELECT * FROM t WHERE id IN (%s,%s)'), 'SELECT * FROM t WHERE id IN (...)')
+
+    def test_values_rows_fold(self):
+        self.assertEqual(
+            query_shape('INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s), (%s, %s)'),
+            'INSERT INTO t (a, b) VALUES (...)',
+        )
+
+    def test_distinct_queries_keep_their_shape(self):
+        self.assertNotEqual(
+            query_shape('SELECT * FROM t WHERE id = %s'),
+            query_shape('SELECT * FROM u WHERE id = %s'),
+        )
+
+    def test_recorder_groups_duplicates(self):
+        recorder = QueryRecorder()
+        execute = mock.Mock(return_value=None)
+        for sql in [
+            'SELECT * FROM t WHERE id = %s',
+            'SELECT * FROM t WHERE id = %s',
+            'SELECT * FROM t WHERE id = %s',
+            'SELECT * FROM t WHERE id IN (%s, %s)',
+            'SELECT * FROM t WHERE id IN (%s, %s, %s)',
+            'SELECT * FROM u',
+        ]:
+            recorder(execute, sql, (), False, {})
+        self.assertEqual(recorder.count, 6)
+        self.assertEqual(recorder.duplicates, 3)
+        self.assertEqual(recorder.repeated(), [
+            '3x SELECT * FROM t WHERE id = %s',
+            '2x SELECT * FROM t WHERE id IN (...)',
+        ])
+
+    def test_budget(self):
+        recorder = QueryRecorder()
+        recorder.count = 3
+        self.assertFalse(recorder.over_budget)
+        recorder.budget = 3
+        self.assertFalse(recorder.over_budget)
+        recorder.budget = 2
+        self.assertTrue(recorder.over_budget)
+
+
+class SyncViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.open_scheme = GovernmentScheme.objects.create(
+            name='Open', description='Open scheme', scheme_type='financial', benefits='Subsidy'
+        )
+        cls.closed_scheme = GovernmentScheme.objects.create(
+            name='Closed', description='Closed scheme', scheme_type='insurance', benefits='Cover'
+        )
+
+    def sync(self, since=''):
+        return APIClient().get('/api/v1/sync/', {'since': since}).json()
+
+    def test_full_sync_serves_only_active_schemes(self):
+        self.closed_scheme.status = 'discontinued'
+        self.closed_scheme.save()
+        names = [scheme['name'] for scheme in self.sync()['schemes']]
+        self.assertEqual(names, ['Open'])
+
+    def test_closed_scheme_gets_a_tombstone(self):
+        token = self.sync()['token']
+        self.closed_scheme.status = 'discontinued'
+        self.closed_scheme.save()
+        delta = self.sync(token)
+        self.assertFalse(delta['full'])
+        self.assertEqual(delta['schemes'], [])
+        self.assertEqual(
+            [(entry['kind'], entry['id']) for entry in delta['deleted']],
+            [('scheme', str(self.closed_scheme.pk))],
+        )
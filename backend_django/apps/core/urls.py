@@ -12,4 +12,6 @@ urlpatterns = [
     path('schemes/<int:pk>/', views.GovernmentSchemeDetailView.as_view(), name='scheme-detail'),
     path('states/', views.StateListView.as_view(), name='state-list'),
     path('feedback/', views.FeedbackCreateView.as_view(), name='feedback-create'),
+    path('sync/', views.SyncView.as_view(), name='sync'),
+    path('query-metrics/', views.QueryMetricsView.as_view(), name='query-metrics'),
 ]
@@ -2,13 +2,17 @@
 Core app views
 """
 
-from rest_framework import generics, status
+from rest_framework import generics, status, views
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticatedOrReadOnly
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from django.conf import settings
+from django.db.models import Max
 
-from .models import GovernmentScheme, State, Feedback
+from .models import GovernmentScheme, State, Feedback, SyncChange
+from .query_metrics import endpoint_metrics
+from .renderers import MSGPACK_AVAILABLE, MessagePackRenderer
 from .serializers import (
     GovernmentSchemeSerializer,
     GovernmentSchemeListSerializer,
@@ -35,6 +39,7 @@ def api_root(request):
             'compare': '/api/v1/breeds/compare/',
             'schemes': '/api/v1/schemes/',
             'analytics': '/api/v1/analytics/',
+            'sync': '/api/v1/sync/',
             'auth': '/api/v1/users/',
         },
         'features': [
@@ -115,3 +120,79 @@ class FeedbackCreateView(generics.CreateAPIView):
     queryset = Feedback.objects.all()
     serializer_class = FeedbackSerializer
     permission_classes = [AllowAny]
+
+
+class SyncView(views.APIView):
+    """
+    Delta sync of breeds and government schemes for offline clients
+    
+    Send the token from the previous response as ?since=; only records
+    changed after it are returned, plus tombstones for deleted ones. A
+    missing or unknown token returns everything ("full": true). Send
+    Accept: application/msgpack for a compact binary body.
+    """
+    permission_classes = [AllowAny]
+    renderer_classes = [JSONRenderer] + ([MessagePackRenderer] if MSGPACK_AVAILABLE else [])
+    
+    def get(self, request):
+        from apps.breeds.models import Breed
+        from apps.breeds.serializers import BreedDetailSerializer
+        
+        token = SyncChange.objects.aggregate(last=Max('id'))['last'] or 0
+        since = request.query_params.get('since', '')
+        full = not since.isdigit() or int(since) > token
+        
+        breeds = Breed.objects.filter(is_active=True).prefetch_related('native_states', 'resources')
+        schemes = GovernmentScheme.objects.filter(status='active')
+        deleted = []
+        
+        if not full:
+            changed = {'breed': {}, 'scheme': {}}
+            for change in SyncChange.objects.filter(id__gt=int(since)):
+                if change.deleted:
+                    deleted.append({'kind': change.kind, 'id': change.record_id, 'version': change.id})
+                else:
+                    changed[change.kind][change.record_id] = change.id
+            
+            breeds = breeds.filter(breed_id__in=changed['breed'])
+            schemes = schemes.filter(pk__in=[int(pk) for pk in changed['scheme'] if pk.isdigit()])
+            
+            # Deactivated breeds and closed or inactive schemes disappear for
+            # clients just like deleted ones, matching the online list views
+            active = set(breeds.values_list('breed_id', flat=True))
+            for breed_id, version in changed['breed'].items():
+                if breed_id not in active:
+                    deleted.append({'kind': 'breed', 'id': breed_id, 'version': version})
+            active = {str(pk) for pk in schemes.values_list('pk', flat=True)}
+            for scheme_id, version in changed['scheme'].items():
+                if scheme_id not in active:
+                    deleted.append({'kind': 'scheme', 'id': scheme_id, 'version': version})
+        
+        return Response({
+            'token': str(token),
+            'full': full,
+            'breeds': BreedDetailSerializer(breeds, many=True).data,
+            'schemes': GovernmentSchemeSerializer(schemes, many=True).data,
+            'deleted': deleted
+        })
+
+
+class QueryMetricsView(views.APIView):
+    """
+    SQL query totals per endpoint
+    
+    Totals are shared through the Django cache, so with the default
+    process-local LocMemCache they cover only the worker serving this call;
+    use a shared backend (Redis) for fleet-wide numbers.
+    
+    Averages per request of query count, SQL time and repeated query shapes
+    (N+1 lookups), next to each view's declared budget. DELETE resets them.
+    """
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request):
+        return Response({'endpoints': endpoint_metrics.summary()})
+    
+    def delete(self, request):
+        endpoint_metrics.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
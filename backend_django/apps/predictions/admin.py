@@ -1,16 +1,19 @@
 from django.contrib import admin
-from .models import Prediction, PredictionSession, ModelVersion
+from apps.core.columns import ListColumnsAdminMixin
+from .models import Prediction, PredictionRollup, PredictionSession, ModelVersion
 
 
 @admin.register(Prediction)
-class PredictionAdmin(admin.ModelAdmin):
+class PredictionAdmin(ListColumnsAdminMixin, admin.ModelAdmin):
     list_display = [
         'id', 'user', 'animal_type', 'predicted_breed_name',
         'breed_confidence', 'user_feedback', 'created_at'
     ]
+    # Filtered lists skip the second, unfiltered COUNT(*)
+    show_full_result_count = False
     list_filter = ['animal_type', 'user_feedback', 'created_at', 'gradcam_enabled']
     search_fields = ['predicted_breed_name', 'user__email']
-    readonly_fields = ['created_at', 'processing_time_ms', 'image_hash']
+    readonly_fields = ['public_id', 'created_at', 'processing_time_ms', 'image_hash', 'gradcam_digest']
     raw_id_fields = ['user', 'predicted_breed', 'user_corrected_breed']
     
     fieldsets = (
@@ -19,7 +22,8 @@ class PredictionAdmin(admin.ModelAdmin):
                       'predicted_breed_name', 'breed_confidence', 'top_predictions')
         }),
         ('Image', {
-            'fields': ('image', 'image_hash', 'gradcam_enabled')
+            'fields': ('image', 'training_image', 'thumbnail', 'image_hash',
+                      'gradcam_enabled', 'gradcam_digest')
         }),
         ('User Info', {
             'fields': ('user', 'ip_address', 'user_agent')
@@ -34,6 +38,13 @@ class PredictionAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(PredictionRollup)
+class PredictionRollupAdmin(admin.ModelAdmin):
+    list_display = ['date', 'animal_type', 'breed_name', 'feedback', 'predictions', 'confidence_sum']
+    list_filter = ['animal_type', 'feedback', 'date']
+    search_fields = ['breed_name']
+
+
 @admin.register(PredictionSession)
 class PredictionSessionAdmin(admin.ModelAdmin):
     list_display = ['session_id', 'user', 'predictions_count', 'started_at', 'last_activity']
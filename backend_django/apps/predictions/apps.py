@@ -1,7 +1,22 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
 
 
 class PredictionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.predictions'
     verbose_name = 'Predictions'
+
+    def ready(self):
+        import apps.predictions.signals  # noqa
+        # Replay spooled rows once this process serves requests, so migrate
+        # and other management commands never start the writer thread
+        request_started.connect(replay_spool, dispatch_uid='prediction-buffer-replay')
+
+
+def replay_spool(**kwargs):
+    """Start the buffer on a server's first request if a previous process spooled rows"""
+    request_started.disconnect(dispatch_uid='prediction-buffer-replay')
+    from .buffer import prediction_buffer
+    if prediction_buffer.has_spool():
+        prediction_buffer.start()
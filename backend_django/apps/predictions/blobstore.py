@@ -0,0 +1,74 @@
+"""
+Content-addressed blob storage
+Immutable files named by the SHA-256 of their bytes on any Django storage
+"""
+
+import hashlib
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.files.base import ContentFile, File
+from django.core.files.storage import Storage, default_storage
+from django.utils.module_loading import import_string
+
+
+class BlobStore:
+    """
+    Write-once store keyed by content digest
+
+    Blobs live at ``<prefix>ab/cd/<digest><suffix>`` on the wrapped storage, so equal
+    content is written once and a digest alone is enough to find it again.
+    Any Django storage works; the local filesystem is the default.
+    """
+
+    def __init__(self, storage: Storage, suffix: str = '', prefix: str = ''):
+        self.storage = storage
+        self.suffix = suffix
+        self.prefix = prefix
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def name(self, digest: str, suffix: Optional[str] = None) -> str:
+        suffix = self.suffix if suffix is None else suffix
+        return f'{self.prefix}{digest[:2]}/{digest[2:4]}/{digest}{suffix}'
+
+    def exists(self, digest: str) -> bool:
+        return self.storage.exists(self.name(digest))
+
+    def put(self, data: bytes) -> str:
+        """Store data if it is new; returns its digest"""
+        digest = self.digest(data)
+        self.save(digest, ContentFile(data))
+        return digest
+
+    def save(self, digest: str, content: File, suffix: Optional[str] = None) -> str:
+        """Store content already known to hash to digest; returns its storage name"""
+        name = self.name(digest, suffix)
+        if not self.storage.exists(name):
+            saved = self.storage.save(name, content)
+            if saved != name:
+                # Another writer won the race with identical bytes
+                self.storage.delete(saved)
+        return name
+
+    def get(self, digest: str) -> Optional[bytes]:
+        name = self.name(digest)
+        try:
+            with self.storage.open(name, 'rb') as f:
+                return f.read()
+        except (FileNotFoundError, OSError):
+            return None
+
+
+def _storage_from_settings(config: Dict[str, Any]) -> Storage:
+    backend = import_string(config['BACKEND'])
+    return backend(**config.get('OPTIONS', {}))
+
+
+# Grad-CAM heatmaps, referenced from Prediction.gradcam_digest
+gradcam_store = BlobStore(_storage_from_settings(settings.GRADCAM_STORAGE), suffix='.png')
+
+# Uploaded images on the media storage, so Prediction.image can point at them
+upload_store = BlobStore(default_storage, prefix='predictions/sha256/')
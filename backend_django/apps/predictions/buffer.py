@@ -0,0 +1,287 @@
+"""
+Prediction write buffer
+Write-behind batching of Prediction rows off the request path
+"""
+
+import atexit
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import serializers
+from django.db import InterfaceError, OperationalError, close_old_connections, transaction
+from django.db.models import F
+
+from .models import Prediction
+from .rollups import record_predictions
+
+
+class PredictionBuffer:
+    """
+    Collects unsaved predictions and persists them in batches
+
+    ``add`` only appends to an in-memory list; a background thread writes
+    the pending rows with one ``bulk_create`` every ``flush_interval``
+    seconds, or sooner once ``batch_size`` rows are waiting. User
+    prediction counters are applied in the same transaction as one
+    ``F()`` update per distinct increment, and the stats rollups are
+    bumped alongside. Pending rows are flushed at
+    interpreter exit, so a graceful worker shutdown does not drop them; if
+    the database is unreachable then, they are spooled to ``spool_dir`` and
+    written by the next buffer that starts.
+
+    A batch that fails is retried row by row. Rows that still fail are
+    moved to ``spool_dir/quarantine`` so one bad row cannot block every
+    later flush. While the database is unreachable, rows are kept, but at
+    most ``max_pending`` in memory; the oldest are spooled beyond that.
+    """
+
+    # Errors that mean the database is unavailable, not that a row is bad
+    CONNECTION_ERRORS = (OperationalError, InterfaceError)
+
+    def __init__(
+        self,
+        batch_size: int = 50,
+        flush_interval: float = 2.0,
+        enabled: bool = True,
+        spool_dir: Optional[Path] = None,
+        max_pending: int = 10000
+    ):
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.enabled = enabled
+        self.spool_dir = spool_dir
+        self.max_pending = max(self.batch_size, max_pending)
+        self._pending: List[Prediction] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, prediction: Prediction) -> None:
+        """Queue an unsaved prediction; written synchronously when buffering is off"""
+        if not self.enabled or self._stopped:
+            self._write([prediction])
+            return
+        with self._lock:
+            self._pending.append(prediction)
+            full = len(self._pending) >= self.batch_size
+            self._start()
+        if full:
+            self._wakeup.set()
+        self._enforce_cap()
+
+    def start(self) -> None:
+        """Start the background writer, e.g. to replay a spool at startup"""
+        if self.enabled:
+            with self._lock:
+                self._start()
+
+    def _start(self) -> None:
+        # Caller holds self._lock
+        if self._thread is None and not self._stopped:
+            self._thread = threading.Thread(
+                target=self._run, name='prediction-buffer', daemon=True
+            )
+            self._thread.start()
+
+    def has_spool(self) -> bool:
+        return self.spool_dir is not None and any(self.spool_dir.glob('*.json'))
+
+    def is_pending(self, public_id: UUID) -> bool:
+        with self._lock:
+            return any(p.public_id == public_id for p in self._pending)
+
+    def find(self, image_hash: str, model_version: str) -> Optional[Prediction]:
+        """Oldest queued prediction of the same image by the same model"""
+        with self._lock:
+            return next(
+                (p for p in self._pending
+                 if p.image_hash == image_hash and p.model_version == model_version),
+                None
+            )
+
+    def flush(self) -> int:
+        """
+        Write every pending prediction now; returns how many were written
+
+        Raises the database error when it is unreachable; the rows stay
+        queued for the next attempt.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            try:
+                self._write(batch)
+                return len(batch)
+            except self.CONNECTION_ERRORS:
+                self._requeue(batch)
+                raise
+            except Exception as e:
+                print(f"Prediction batch of {len(batch)} failed ({e}); retrying row by row")
+            return self._write_rows(batch)
+
+    def _write_rows(self, batch: List[Prediction]) -> int:
+        """Write rows one at a time, quarantining the ones that still fail"""
+        written = 0
+        failed = []
+        for i, prediction in enumerate(batch):
+            _reset(prediction)
+            try:
+                self._write([prediction])
+                written += 1
+            except self.CONNECTION_ERRORS:
+                self._requeue(batch[i:])
+                if failed:
+                    self._quarantine(failed)
+                raise
+            except Exception as e:
+                print(f"Prediction {prediction.public_id} could not be written: {e}")
+                failed.append(prediction)
+        if failed:
+            self._quarantine(failed)
+        return written
+
+    def _requeue(self, batch: List[Prediction]) -> None:
+        """Put rows back for the next attempt, ahead of newer ones"""
+        for prediction in batch:
+            _reset(prediction)
+        with self._lock:
+            self._pending[:0] = batch
+        self._enforce_cap()
+
+    def _enforce_cap(self) -> None:
+        """Move the oldest rows beyond max_pending out of memory"""
+        with self._lock:
+            if len(self._pending) <= self.max_pending:
+                return
+            # Spill a batch's worth of headroom, not one file per new row
+            excess = len(self._pending) - (self.max_pending - self.batch_size)
+            overflow, self._pending = self._pending[:excess], self._pending[excess:]
+        if self.spool_dir is None:
+            print(f"Prediction buffer full; dropped {len(overflow)} rows")
+            return
+        path = self._spool(overflow)
+        print(f"Prediction buffer full; spooled {len(overflow)} rows to {path}")
+
+    def _quarantine(self, batch: List[Prediction]) -> None:
+        if self.spool_dir is None:
+            print(f"Dropped {len(batch)} predictions that could not be written")
+            return
+        path = self._spool(batch, self.spool_dir / 'quarantine')
+        print(f"Quarantined {len(batch)} predictions that could not be written to {path}")
+
+    def _write(self, batch: List[Prediction]) -> None:
+        per_user = Counter(p.user_id for p in batch if p.user_id is not None)
+        by_increment: Dict[int, List[int]] = defaultdict(list)
+        for user_id, count in per_user.items():
+            by_increment[count].append(user_id)
+
+        with transaction.atomic():
+            Prediction.objects.bulk_create(batch, batch_size=self.batch_size)
+            User = get_user_model()
+            for increment, user_ids in by_increment.items():
+                User.objects.filter(pk__in=user_ids).update(
+                    total_predictions=F('total_predictions') + increment
+                )
+            record_predictions(batch)
+
+    def _spool(self, batch: List[Prediction], directory: Optional[Path] = None) -> Path:
+        directory = directory or self.spool_dir
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f'{os.getpid()}-{time.time_ns()}.json'
+        path.write_text(serializers.serialize('json', batch), encoding='utf-8')
+        return path
+
+    def _recover_spool(self) -> None:
+        """Requeue spooled predictions while there is room for them"""
+        if self.spool_dir is None or not self.spool_dir.is_dir():
+            return
+        for path in sorted(self.spool_dir.glob('*.json')):
+            with self._lock:
+                if len(self._pending) >= self.max_pending:
+                    return
+            # Claim by rename so concurrent workers never replay a file twice
+            claimed = path.with_name(f'{path.name}.{os.getpid()}.claimed')
+            try:
+                os.rename(path, claimed)
+            except OSError:
+                continue
+            try:
+                restored = [
+                    obj.object
+                    for obj in serializers.deserialize('json', claimed.read_text(encoding='utf-8'))
+                ]
+            except Exception as e:
+                print(f"Unreadable prediction spool {claimed}: {e}")
+                continue
+            with self._lock:
+                self._pending[:0] = restored
+            claimed.unlink()
+            print(f"Recovered {len(restored)} spooled predictions from {path.name}")
+
+    def _run(self) -> None:
+        self._recover_spool()
+        while not self._stopped:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Prediction buffer flush failed, will retry: {e}")
+                continue
+            # Database is reachable: replay rows spooled by overflow or shutdown
+            if self.has_spool():
+                self._recover_spool()
+                self._wakeup.set()
+
+    def close(self) -> None:
+        """Stop the background writer and flush whatever is left"""
+        self._stopped = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+        try:
+            self.flush()
+        except Exception as e:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+            if self.spool_dir is None:
+                print(f"Prediction buffer lost {len(batch)} rows at shutdown: {e}")
+                return
+            path = self._spool(batch)
+            print(f"Database unavailable at shutdown ({e}); spooled {len(batch)} predictions to {path}")
+
+
+def _reset(prediction: Prediction) -> None:
+    """Undo the primary key a rolled-back bulk_create may have assigned"""
+    prediction.pk = None
+    prediction._state.adding = True
+
+
+_buffer_settings = settings.PREDICTION_BUFFER
+
+# Shared buffer for prediction views
+prediction_buffer = PredictionBuffer(
+    batch_size=_buffer_settings['BATCH_SIZE'],
+    flush_interval=_buffer_settings['FLUSH_INTERVAL'],
+    enabled=_buffer_settings['ENABLED'],
+    spool_dir=_buffer_settings['SPOOL_DIR'],
+    max_pending=_buffer_settings.get('MAX_PENDING', 10000),
+)
+atexit.register(prediction_buffer.close)
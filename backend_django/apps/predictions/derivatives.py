@@ -0,0 +1,117 @@
+"""
+Prediction image derivatives
+Small training and thumbnail copies of uploads, with optional originals
+"""
+
+import io
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image
+
+from .blobstore import BlobStore, upload_store
+
+_image_settings = settings.PREDICTION_IMAGES
+
+# Derivative name -> (longest side in pixels, JPEG quality)
+DERIVATIVES = {
+    'training': (_image_settings['TRAINING_SIZE'], 90),
+    'thumbnail': (_image_settings['THUMBNAIL_SIZE'], 75),
+}
+
+# Derivatives are a pure function of the upload, so they share its digest
+derivative_store = BlobStore(default_storage, prefix='predictions/derived/')
+
+
+def _suffix(size: int) -> str:
+    return f'-{size}.jpg'
+
+
+def derivative_names(image_hash: str) -> Dict[str, str]:
+    """Storage names the derivatives of an upload have, or will have"""
+    return {
+        name: derivative_store.name(image_hash, _suffix(size))
+        for name, (size, _) in DERIVATIVES.items()
+    }
+
+
+def derivatives_stored(image_hash: str) -> bool:
+    """Whether every derivative of an upload exists in storage"""
+    return all(derivative_store.storage.exists(name) for name in derivative_names(image_hash).values())
+
+
+def original_name(image_hash: str, suffix: str) -> Optional[str]:
+    """Storage name of a kept original, or None when only derivatives are kept"""
+    if not _image_settings['KEEP_ORIGINALS']:
+        return None
+    return upload_store.name(image_hash, suffix)
+
+
+def stage_upload(image_hash: str, upload, suffix: str) -> str:
+    """
+    Park an upload on local disk for the image task
+
+    Uploads Django spooled to a temporary file are hard-linked (or copied
+    across devices); small in-memory ones are written out.
+    """
+    staging_dir = Path(_image_settings['STAGING_DIR'])
+    staging_dir.mkdir(parents=True, exist_ok=True)
+    target = staging_dir / f'{image_hash}{suffix}'
+    if target.exists():
+        return str(target)
+
+    partial = staging_dir / f'{image_hash}{suffix}.{os.getpid()}.part'
+    if hasattr(upload, 'temporary_file_path'):
+        try:
+            os.link(upload.temporary_file_path(), partial)
+        except OSError:
+            shutil.copyfile(upload.temporary_file_path(), partial)
+    else:
+        upload.seek(0)
+        with open(partial, 'wb') as f:
+            for chunk in upload.chunks():
+                f.write(chunk)
+    os.replace(partial, target)
+    return str(target)
+
+
+def _render(image: Image.Image, size: int, quality: int) -> bytes:
+    copy = image.convert('RGB')
+    copy.thumbnail((size, size), Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    copy.save(buffer, format='JPEG', quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+def persist_staged_upload(image_hash: str, suffix: str, staged_path: str) -> None:
+    """Write derivatives (and the original, if kept) of a staged upload, then drop it"""
+    staged = Path(staged_path)
+    names = derivative_names(image_hash)
+    missing = {
+        name: DERIVATIVES[name] for name, target in names.items()
+        if not derivative_store.storage.exists(target)
+    }
+    keep_original = original_name(image_hash, suffix)
+
+    if not staged.exists():
+        if missing:
+            raise FileNotFoundError(f'Staged upload {staged} is gone and derivatives are missing')
+        return
+
+    if missing:
+        with Image.open(staged) as image:
+            image.load()
+            for name, (size, quality) in missing.items():
+                derivative_store.save(
+                    image_hash, ContentFile(_render(image, size, quality)), suffix=_suffix(size)
+                )
+    if keep_original:
+        with open(staged, 'rb') as f:
+            upload_store.save(image_hash, File(f), suffix=suffix)
+    staged.unlink(missing_ok=True)
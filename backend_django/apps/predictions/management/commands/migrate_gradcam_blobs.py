@@ -0,0 +1,71 @@
+"""
+Django management command to move inline Grad-CAM images into the blob store
+"""
+
+import base64
+import binascii
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.predictions.blobstore import gradcam_store
+from apps.predictions.models import Prediction
+
+
+class Command(BaseCommand):
+    help = 'Move base64 Grad-CAM images from Prediction rows into the content-addressed blob store'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Rows loaded and updated per batch'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Count rows to move without writing anything'
+        )
+    
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        pending = Prediction.objects.exclude(gradcam_image='')
+        
+        if options['dry_run']:
+            self.stdout.write(f'{pending.count()} predictions have inline Grad-CAM images')
+            return
+        
+        moved = 0
+        invalid = 0
+        last_pk = 0
+        while True:
+            # Keyset pagination: each batch starts after the last primary key
+            batch = list(
+                pending.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .only('id', 'gradcam_image', 'gradcam_digest')[:batch_size]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            
+            for prediction in batch:
+                try:
+                    png = base64.b64decode(prediction.gradcam_image, validate=True)
+                except (binascii.Error, ValueError):
+                    invalid += 1
+                    prediction.gradcam_digest = ''
+                else:
+                    prediction.gradcam_digest = gradcam_store.put(png)
+                    moved += 1
+                prediction.gradcam_image = ''
+            
+            # Blobs are written first, so a crash here only repeats work
+            with transaction.atomic():
+                Prediction.objects.bulk_update(batch, ['gradcam_digest', 'gradcam_image'])
+            self.stdout.write(f'Moved {moved} heatmaps (up to prediction {last_pk})')
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'Done: {moved} heatmaps moved, {invalid} unreadable cleared')
+        )
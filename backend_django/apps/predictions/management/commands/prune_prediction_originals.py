@@ -0,0 +1,73 @@
+"""
+Django management command to delete original prediction uploads past retention
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.predictions.models import Prediction
+
+
+class Command(BaseCommand):
+    help = 'Delete original prediction images older than the retention period, keeping derivatives'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=None,
+            help='Retention in days (default: PREDICTION_IMAGES ORIGINAL_RETENTION_DAYS)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Rows cleared per batch'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report what would be deleted without deleting'
+        )
+    
+    def handle(self, *args, **options):
+        days = options['days']
+        if days is None:
+            days = settings.PREDICTION_IMAGES['ORIGINAL_RETENTION_DAYS']
+        cutoff = timezone.now() - timedelta(days=days)
+        batch_size = max(1, options['batch_size'])
+        
+        # Only rows whose training copy exists lose their original
+        expired = Prediction.objects.filter(created_at__lt=cutoff).exclude(image='').exclude(training_image='')
+        if options['dry_run']:
+            self.stdout.write(f'{expired.count()} predictions have originals older than {days} days')
+            return
+        
+        cleared = 0
+        deleted = 0
+        while True:
+            batch = list(expired.order_by('pk').values_list('pk', 'image')[:batch_size])
+            if not batch:
+                break
+            Prediction.objects.filter(pk__in=[pk for pk, _ in batch]).update(image='')
+            cleared += len(batch)
+            
+            # Identical uploads share one file; keep it while a newer row uses it
+            names = {name for _, name in batch}
+            still_used = set(
+                Prediction.objects.filter(image__in=names).values_list('image', flat=True)
+            )
+            for name in names - still_used:
+                if default_storage.exists(name):
+                    default_storage.delete(name)
+                    deleted += 1
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Cleared {cleared} expired originals, deleted {deleted} files (retention {days} days)'
+            )
+        )
@@ -0,0 +1,77 @@
+"""
+Django management command to rebuild prediction rollups from the Prediction table
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+from apps.predictions.models import Prediction, PredictionRollup
+from apps.predictions.rollups import KEY_FIELDS
+
+
+class Command(BaseCommand):
+    help = 'Recount the prediction statistics rollups from scratch (run when traffic is low)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rollup rows inserted per batch'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report how many rollup cells have drifted without rewriting them'
+        )
+    
+    def handle(self, *args, **options):
+        fresh = {
+            (row['day'], row['animal_type'], row['predicted_breed_name'], row['user_feedback']):
+                (row['count'], row['confidence_sum'] or 0.0)
+            for row in Prediction.objects.order_by().annotate(
+                day=TruncDate('created_at')
+            ).values(
+                'day', 'animal_type', 'predicted_breed_name', 'user_feedback'
+            ).annotate(
+                count=Count('id'),
+                confidence_sum=Sum('breed_confidence')
+            )
+        }
+        
+        if options['dry_run']:
+            current = {
+                tuple(row[:4]): (row[4], row[5])
+                for row in PredictionRollup.objects.filter(predictions__gt=0).values_list(
+                    *KEY_FIELDS, 'predictions', 'confidence_sum'
+                )
+            }
+            drifted = sum(
+                1 for key in fresh.keys() | current.keys()
+                if key not in fresh or key not in current
+                or fresh[key][0] != current[key][0]
+                or abs(fresh[key][1] - current[key][1]) > 1e-6
+            )
+            self.stdout.write(f'{drifted} of {len(fresh)} rollup cells differ from the Prediction table')
+            return
+        
+        with transaction.atomic():
+            PredictionRollup.objects.all().delete()
+            PredictionRollup.objects.bulk_create(
+                [
+                    PredictionRollup(
+                        **dict(zip(KEY_FIELDS, key)),
+                        predictions=count,
+                        confidence_sum=confidence_sum
+                    )
+                    for key, (count, confidence_sum) in fresh.items()
+                ],
+                batch_size=max(1, options['batch_size'])
+            )
+        
+        total = sum(count for count, _ in fresh.values())
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt {len(fresh)} rollup cells covering {total} predictions')
+        )
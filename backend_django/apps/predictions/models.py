@@ -2,14 +2,21 @@
 Prediction models for storing ML prediction results
 """
 
+import uuid
+
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
 class Prediction(models.Model):
     """Store prediction history"""
     
+    # Assigned at request time; rows are written in batches, so the
+    # integer primary key does not exist yet when the client is answered
+    public_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    
     # User association (optional for anonymous predictions)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -36,13 +43,17 @@ class Prediction(models.Model):
     # Top predictions (stored as JSON)
     top_predictions = models.JSONField(default=list)
     
-    # Image data
-    image = models.ImageField(upload_to='predictions/%Y/%m/%d/')
-    image_hash = models.CharField(max_length=64, blank=True)  # For duplicate detection
+    # Image data: derivatives are always stored, the original per retention policy
+    image = models.ImageField(upload_to='predictions/%Y/%m/%d/', blank=True)
+    training_image = models.ImageField(upload_to='predictions/derived/', blank=True)
+    thumbnail = models.ImageField(upload_to='predictions/derived/', blank=True)
+    image_hash = models.CharField(max_length=64, blank=True)  # SHA-256 of the uploaded bytes
     
-    # Grad-CAM
-    gradcam_image = models.TextField(blank=True)  # Base64 encoded
+    # Grad-CAM: SHA-256 of the heatmap PNG in the blob store
+    gradcam_digest = models.CharField(max_length=64, blank=True)
     gradcam_enabled = models.BooleanField(default=False)
+    # Legacy inline base64 heatmaps, emptied by migrate_gradcam_blobs
+    gradcam_image = models.TextField(blank=True)
     
     # User feedback
     user_feedback = models.CharField(
@@ -66,26 +77,56 @@ class Prediction(models.Model):
     # Processing info
     processing_time_ms = models.IntegerField(default=0)
     model_version = models.CharField(max_length=50, default='1.0.0')
+    # Result copied from an earlier prediction of the same image and model
+    reused = models.BooleanField(default=False)
     
     # Metadata
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Not auto_now_add: bulk inserts happen after the request
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     
     class Meta:
         ordering = ['-created_at']
         verbose_name = _('Prediction')
         verbose_name_plural = _('Predictions')
         indexes = [
-            models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['user', '-created_at', '-id']),
             models.Index(fields=['predicted_breed', '-created_at']),
             models.Index(fields=['animal_type', '-created_at']),
+            models.Index(fields=['image_hash', 'model_version']),
         ]
     
     def __str__(self):
         return f"{self.predicted_breed_name} ({self.breed_confidence:.1%}) - {self.created_at}"
 
 
+class PredictionRollup(models.Model):
+    """
+    Running prediction counts per day, animal type, breed and feedback
+    
+    Maintained incrementally as predictions are written or deleted and
+    feedback changes; rebuilt from Prediction by rebuild_prediction_rollups.
+    """
+    
+    date = models.DateField()
+    animal_type = models.CharField(max_length=20)
+    breed_name = models.CharField(max_length=100)
+    feedback = models.CharField(max_length=20, blank=True)
+    
+    predictions = models.IntegerField(default=0)
+    confidence_sum = models.FloatField(default=0)
+    
+    class Meta:
+        ordering = ['-date']
+        verbose_name = _('Prediction Rollup')
+        verbose_name_plural = _('Prediction Rollups')
+        unique_together = ['date', 'animal_type', 'breed_name', 'feedback']
+    
+    def __str__(self):
+        return f"{self.date} {self.breed_name} ({self.predictions})"
+
+
 class PredictionSession(models.Model):
     """Track prediction sessions for analytics"""
     
@@ -0,0 +1,116 @@
+"""
+Prediction rollups
+Incremental counters behind the prediction statistics endpoint
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.db.models import F, Q, Sum
+from django.utils import timezone
+
+from .models import Prediction, PredictionRollup
+
+# (date, animal_type, breed_name, feedback)
+RollupKey = Tuple[date, str, str, str]
+
+KEY_FIELDS = ('date', 'animal_type', 'breed_name', 'feedback')
+
+
+def rollup_key(prediction: Prediction, feedback: Optional[str] = None) -> RollupKey:
+    """Rollup cell a prediction is counted in, optionally under other feedback"""
+    return (
+        timezone.localdate(prediction.created_at),
+        prediction.animal_type,
+        prediction.predicted_breed_name,
+        prediction.user_feedback if feedback is None else feedback,
+    )
+
+
+def apply_deltas(deltas: Dict[RollupKey, List[float]]) -> None:
+    """
+    Add ``[count, confidence_sum]`` deltas to their rollup cells
+
+    Missing cells are inserted empty first, then every cell gets one
+    ``F()`` update, so concurrent writers never overwrite each other.
+    Call inside the transaction that writes the underlying change.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta[0] or delta[1]}
+    if not deltas:
+        return
+    PredictionRollup.objects.bulk_create(
+        [PredictionRollup(**dict(zip(KEY_FIELDS, key))) for key in deltas],
+        ignore_conflicts=True
+    )
+    for key, (count, confidence) in deltas.items():
+        PredictionRollup.objects.filter(**dict(zip(KEY_FIELDS, key))).update(
+            predictions=F('predictions') + int(count),
+            confidence_sum=F('confidence_sum') + confidence
+        )
+
+
+def record_predictions(predictions: Iterable[Prediction]) -> None:
+    """Count newly inserted predictions"""
+    deltas: Dict[RollupKey, List[float]] = defaultdict(lambda: [0, 0.0])
+    for prediction in predictions:
+        delta = deltas[rollup_key(prediction)]
+        delta[0] += 1
+        delta[1] += prediction.breed_confidence
+    apply_deltas(deltas)
+
+
+def record_feedback_change(prediction: Prediction, old_feedback: str) -> None:
+    """Move a prediction from its old feedback cell to its current one"""
+    if old_feedback == prediction.user_feedback:
+        return
+    confidence = prediction.breed_confidence
+    apply_deltas({
+        rollup_key(prediction, old_feedback): [-1, -confidence],
+        rollup_key(prediction): [1, confidence],
+    })
+
+
+def record_deletion(prediction: Prediction) -> None:
+    """Uncount a deleted prediction from the cell it was counted in"""
+    apply_deltas({rollup_key(prediction): [-1, -prediction.breed_confidence]})
+
+
+def prediction_stats(days: int = 30) -> Dict[str, Any]:
+    """Totals, feedback, top breeds and a daily series, read from the rollups"""
+    rollups = PredictionRollup.objects.all()
+
+    totals = rollups.aggregate(
+        total=Sum('predictions'),
+        cattle=Sum('predictions', filter=Q(animal_type='cattle')),
+        buffalo=Sum('predictions', filter=Q(animal_type='buffalo')),
+        confidence=Sum('confidence_sum'),
+    )
+    total = totals['total'] or 0
+
+    feedback_stats = dict(
+        rollups.values('feedback').annotate(count=Sum('predictions'))
+        .filter(count__gt=0).values_list('feedback', 'count')
+    )
+
+    top_breeds = [
+        {'predicted_breed_name': name, 'count': count}
+        for name, count in rollups.values('breed_name').annotate(count=Sum('predictions'))
+        .filter(count__gt=0).order_by('-count').values_list('breed_name', 'count')[:10]
+    ]
+
+    since = timezone.localdate() - timedelta(days=days)
+    predictions_by_date = list(
+        rollups.filter(date__gte=since).values('date').annotate(count=Sum('predictions'))
+        .filter(count__gt=0).order_by('date')
+    )
+
+    return {
+        'total_predictions': total,
+        'cattle_predictions': totals['cattle'] or 0,
+        'buffalo_predictions': totals['buffalo'] or 0,
+        'average_confidence': (totals['confidence'] or 0) / total if total else 0,
+        'feedback_stats': feedback_stats,
+        'top_predicted_breeds': top_breeds,
+        'predictions_over_time': predictions_by_date,
+    }
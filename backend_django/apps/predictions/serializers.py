@@ -2,6 +2,7 @@
 Prediction serializers
 """
 
+from django.urls import reverse
 from rest_framework import serializers
 from .models import Prediction, PredictionSession
 
@@ -10,24 +11,36 @@ class PredictionSerializer(serializers.ModelSerializer):
     """Full prediction serializer"""
     
     breed_info = serializers.SerializerMethodField()
+    gradcam_url = serializers.SerializerMethodField()
     
     class Meta:
         model = Prediction
         fields = [
-            'id', 'animal_type', 'animal_type_confidence',
+            'id', 'public_id', 'animal_type', 'animal_type_confidence',
             'predicted_breed_name', 'breed_confidence',
-            'top_predictions', 'gradcam_image', 'gradcam_enabled',
+            'top_predictions', 'thumbnail', 'gradcam_url', 'gradcam_enabled',
             'user_feedback', 'feedback_notes',
             'processing_time_ms', 'model_version',
             'created_at', 'breed_info'
         ]
-        read_only_fields = ['id', 'created_at']
+        read_only_fields = ['id', 'public_id', 'created_at']
+        # Attributes the method fields read, for column pruning in list views
+        column_sources = {
+            'breed_info': ['predicted_breed'],
+            'gradcam_url': ['public_id'],
+        }
     
     def get_breed_info(self, obj):
         if obj.predicted_breed:
             from apps.breeds.serializers import BreedListSerializer
             return BreedListSerializer(obj.predicted_breed).data
         return None
+    
+    def get_gradcam_url(self, obj):
+        # Heatmaps are rendered on first request to this URL
+        url = reverse('prediction-gradcam', kwargs={'public_id': obj.public_id})
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
 
 
 class PredictionCreateSerializer(serializers.Serializer):
@@ -52,8 +65,8 @@ class PredictionHistorySerializer(serializers.ModelSerializer):
     class Meta:
         model = Prediction
         fields = [
-            'id', 'animal_type', 'predicted_breed_name',
-            'breed_confidence', 'user_feedback', 'created_at'
+            'id', 'public_id', 'animal_type', 'predicted_breed_name',
+            'breed_confidence', 'thumbnail', 'user_feedback', 'created_at'
         ]
 
 
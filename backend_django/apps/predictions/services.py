@@ -15,9 +15,12 @@ from pathlib import Path
 from typing import Dict, List, Tuple, Any, Optional
 import json
 import time
-import hashlib
 import io
 import base64
+import copy
+import math
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
 from django.conf import settings
 
@@ -42,6 +45,11 @@ class ModelService:
         self.stage2_cattle_model = None
         self.stage2_buffalo_model = None
         self.is_loaded = False
+        self.version = settings.ML_SETTINGS['MODEL_VERSION']
+        # Grad-CAM hooks see every forward pass of a module, so each stage-2
+        # model gets a private copy for Grad-CAM, used by one thread at a time
+        self._gradcam_models: Dict[int, Tuple[nn.Module, threading.Lock, nn.Module]] = {}
+        self._gradcam_models_lock = threading.Lock()
         
         # Image preprocessing
         self.transform = transforms.Compose([
@@ -152,6 +160,15 @@ class ModelService:
         tensor = self.transform(image)
         return tensor.unsqueeze(0).to(self.device)
     
+    def _stage2_for(self, animal_type: str) -> Tuple[nn.Module, List[str]]:
+        """Breed classifier and its class labels for an animal type"""
+        if animal_type == "cattle" and self.stage2_cattle_model:
+            return self.stage2_cattle_model, self.cattle_breeds
+        if animal_type == "buffalo" and self.stage2_buffalo_model:
+            return self.stage2_buffalo_model, self.buffalo_breeds
+        breed_classes = self.cattle_breeds if animal_type == "cattle" else self.buffalo_breeds
+        return self.stage2_cattle_model or self.stage2_buffalo_model, breed_classes
+    
     def predict(self, image: Image.Image, include_gradcam: bool = False) -> Dict[str, Any]:
         """Perform two-stage prediction"""
         start_time = time.time()
@@ -169,15 +186,7 @@ class ModelService:
         animal_type = self.animal_classes[animal_idx]
         
         # Stage 2: Breed classification
-        if animal_type == "cattle" and self.stage2_cattle_model:
-            stage2_model = self.stage2_cattle_model
-            breed_classes = self.cattle_breeds
-        elif animal_type == "buffalo" and self.stage2_buffalo_model:
-            stage2_model = self.stage2_buffalo_model
-            breed_classes = self.buffalo_breeds
-        else:
-            breed_classes = self.cattle_breeds if animal_type == "cattle" else self.buffalo_breeds
-            stage2_model = self.stage2_cattle_model or self.stage2_buffalo_model
+        stage2_model, breed_classes = self._stage2_for(animal_type)
         
         with torch.no_grad():
             stage2_output = stage2_model(input_tensor)
@@ -208,36 +217,67 @@ class ModelService:
             "breed_confidence": breed_confidence,
             "top_predictions": top_predictions,
             "processing_time_ms": processing_time,
-            "gradcam_image": None
+            "gradcam_image": None,
+            "gradcam_png": None
         }
         
         # Generate Grad-CAM if requested
         if include_gradcam:
             try:
-                gradcam_image = self._generate_gradcam(image, input_tensor, stage2_model, breed_idx)
-                result["gradcam_image"] = gradcam_image
+                gradcam_png = self._generate_gradcam(image, input_tensor, stage2_model, breed_idx)
+                if gradcam_png:
+                    result["gradcam_png"] = gradcam_png
+                    result["gradcam_image"] = base64.b64encode(gradcam_png).decode('utf-8')
             except Exception as e:
                 print(f"Grad-CAM generation failed: {e}")
         
         return result
     
+    def gradcam(self, image: Image.Image, animal_type: str, breed: str) -> Optional[bytes]:
+        """Grad-CAM PNG for an earlier prediction of breed on image"""
+        model, breed_classes = self._stage2_for(animal_type)
+        if breed not in breed_classes:
+            return None
+        input_tensor = self.preprocess(image)
+        return self._generate_gradcam(
+            image.convert('RGB'), input_tensor, model, breed_classes.index(breed)
+        )
+    
+    def _gradcam_model(self, model: nn.Module) -> Tuple[nn.Module, threading.Lock]:
+        """Private copy of a stage-2 model for Grad-CAM, and the lock guarding it"""
+        with self._gradcam_models_lock:
+            entry = self._gradcam_models.get(id(model))
+            if entry is None or entry[2] is not model:
+                entry = (copy.deepcopy(model).eval(), threading.Lock(), model)
+                self._gradcam_models[id(model)] = entry
+            return entry[0], entry[1]
+    
     def _generate_gradcam(self, original_image: Image.Image, input_tensor: torch.Tensor, 
-                          model: nn.Module, target_class: int) -> Optional[str]:
-        """Generate Grad-CAM visualization"""
+                          model: nn.Module, target_class: int) -> Optional[bytes]:
+        """Generate Grad-CAM visualization as PNG bytes"""
         try:
             from pytorch_grad_cam import GradCAM
+            from pytorch_grad_cam.utils.model_targets import ClassifierOutputTarget
             from pytorch_grad_cam.utils.image import show_cam_on_image
             
+            # Predictions keep using the shared model without taking the lock
+            cam_model, lock = self._gradcam_model(model)
+            
             # Get target layer
-            if hasattr(model, 'features'):
-                target_layers = [model.features[-1]]
+            if hasattr(cam_model, 'features'):
+                target_layers = [cam_model.features[-1]]
             else:
-                target_layers = [model.layer4[-1]]
-            
-            cam = GradCAM(model=model, target_layers=target_layers)
+                target_layers = [cam_model.layer4[-1]]
             
-            targets = None
-            grayscale_cam = cam(input_tensor=input_tensor, targets=targets)
+            with lock:
+                cam = GradCAM(model=cam_model, target_layers=target_layers)
+                try:
+                    grayscale_cam = cam(
+                        input_tensor=input_tensor, targets=[ClassifierOutputTarget(target_class)]
+                    )
+                finally:
+                    # Remove the hooks before the next caller attaches its own
+                    cam.activations_and_grads.release()
             grayscale_cam = grayscale_cam[0, :]
             
             # Resize original image
@@ -247,13 +287,10 @@ class ModelService:
             # Create visualization
             visualization = show_cam_on_image(rgb_img, grayscale_cam, use_rgb=True)
             
-            # Convert to base64
             pil_img = Image.fromarray(visualization)
             buffer = io.BytesIO()
             pil_img.save(buffer, format='PNG')
-            buffer.seek(0)
-            
-            return base64.b64encode(buffer.read()).decode('utf-8')
+            return buffer.getvalue()
             
         except ImportError:
             print("pytorch-grad-cam not installed")
@@ -261,14 +298,93 @@ class ModelService:
         except Exception as e:
             print(f"Grad-CAM error: {e}")
             return None
-    
-    @staticmethod
-    def compute_image_hash(image: Image.Image) -> str:
-        """Compute hash for duplicate detection"""
-        buffer = io.BytesIO()
-        image.save(buffer, format='PNG')
-        return hashlib.md5(buffer.getvalue()).hexdigest()
 
 
 # Global model service instance
 model_service = ModelService()
+
+
+class InferenceUnavailable(Exception):
+    """Raised when the inference pool cannot take or finish a request in time"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class InferenceExecutor:
+    """
+    Bounded thread pool for model inference
+
+    At most ``workers`` predictions run at once and ``queue_size`` more may
+    wait for a slot; anything beyond that is rejected immediately instead of
+    holding a request thread. Callers wait up to ``timeout`` seconds for their
+    result. Retry hints are derived from a moving average of recent
+    inference durations.
+    """
+
+    def __init__(self, workers: int, queue_size: int, timeout: float):
+        self.workers = max(1, workers)
+        self.capacity = self.workers + max(0, queue_size)
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='inference')
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._avg_seconds = 1.0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely to free up"""
+        waves = max(1, self._pending) / self.workers
+        return max(1, math.ceil(waves * self._avg_seconds))
+
+    def _run(self, fn, args, kwargs):
+        start = time.monotonic()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.monotonic() - start
+            with self._lock:
+                self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * elapsed
+
+    def _release(self, _future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """Queue fn on the pool, or raise InferenceUnavailable when it is full"""
+        if not self._slots.acquire(blocking=False):
+            raise InferenceUnavailable('Inference queue is full', self.retry_after())
+        with self._lock:
+            self._pending += 1
+        try:
+            future = self._pool.submit(self._run, fn, args, kwargs)
+        except Exception:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def run(self, fn, *args, **kwargs):
+        """Submit fn and wait for its result up to the configured timeout"""
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # Drops the work if it has not started; a running call finishes
+            # in the background and frees its slot then
+            future.cancel()
+            raise InferenceUnavailable('Inference timed out', self.retry_after())
+
+
+# Shared inference pool for prediction views
+inference_executor = InferenceExecutor(
+    workers=settings.ML_SETTINGS['INFERENCE_WORKERS'],
+    queue_size=settings.ML_SETTINGS['INFERENCE_QUEUE_SIZE'],
+    timeout=settings.ML_SETTINGS['INFERENCE_TIMEOUT'],
+)
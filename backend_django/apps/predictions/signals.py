@@ -0,0 +1,17 @@
+"""
+Prediction signals
+Keep the prediction rollups in step with deleted rows
+"""
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Prediction
+from .rollups import record_deletion
+
+
+# Fires per row for admin, queryset and cascade (e.g. user) deletes alike,
+# inside the deleting transaction
+@receiver(post_delete, sender=Prediction)
+def uncount_prediction_deleted(sender, instance, **kwargs):
+    record_deletion(instance)
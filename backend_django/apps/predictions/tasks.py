@@ -0,0 +1,84 @@
+"""
+Prediction background tasks
+Image persistence and Grad-CAM rendering after the response is sent
+"""
+
+from typing import Optional
+from uuid import UUID
+
+from PIL import Image
+
+from apps.core.task_queue import RetryLater, task
+from .blobstore import gradcam_store
+from .buffer import prediction_buffer
+from .derivatives import persist_staged_upload
+from .models import Prediction
+from .services import InferenceUnavailable, inference_executor, model_service
+
+
+def get_written_prediction(public_id: str, *fields: str) -> Prediction:
+    """
+    Load a prediction that may still sit in the write buffer
+
+    Flushes the buffer when the row is pending in this process; otherwise
+    asks the task backend to retry once the owning process has flushed it.
+    """
+    queryset = Prediction.objects.filter(public_id=public_id)
+    if fields:
+        queryset = queryset.only('id', *fields)
+    prediction = queryset.first()
+    if prediction is None and prediction_buffer.is_pending(UUID(public_id)):
+        prediction_buffer.flush()
+        prediction = queryset.first()
+    if prediction is None:
+        raise RetryLater(f'Prediction {public_id} is not written yet')
+    return prediction
+
+
+def render_gradcam_png(prediction: Prediction) -> Optional[bytes]:
+    """Grad-CAM for a stored prediction, rendered on the inference pool"""
+    # The training copy is already at model resolution and always kept
+    stored = prediction.training_image or prediction.image
+    if not stored:
+        return None
+    try:
+        with stored.open('rb') as f:
+            image = Image.open(f).convert('RGB')
+    except FileNotFoundError:
+        raise InferenceUnavailable('Prediction images are still being processed', 2)
+    except OSError:
+        return None
+    return inference_executor.run(
+        model_service.gradcam, image, prediction.animal_type, prediction.predicted_breed_name
+    )
+
+
+@task()
+def render_prediction_gradcam(public_id: str) -> None:
+    prediction = get_written_prediction(
+        public_id, 'image', 'training_image', 'animal_type', 'predicted_breed_name', 'gradcam_digest'
+    )
+    if prediction.gradcam_digest:
+        return
+    try:
+        png = render_gradcam_png(prediction)
+    except InferenceUnavailable as e:
+        raise RetryLater(str(e), e.retry_after)
+    if png is None:
+        return
+    Prediction.objects.filter(pk=prediction.pk).update(
+        gradcam_digest=gradcam_store.put(png), gradcam_enabled=True
+    )
+
+
+@task()
+def process_prediction_images(
+    image_hash: str,
+    suffix: str,
+    staged_path: str,
+    gradcam_for: Optional[str] = None
+) -> None:
+    """Store derivatives and the kept original, then render Grad-CAM if asked"""
+    persist_staged_upload(image_hash, suffix, staged_path)
+    if gradcam_for:
+        render_prediction_gradcam.delay(gradcam_for)
@@ -0,0 +1,68 @@
+"""
+Prediction upload handling
+Hash uploads while they stream in and find earlier results for the same bytes
+"""
+
+import hashlib
+from typing import Optional
+
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+
+from .buffer import prediction_buffer
+from .models import Prediction
+
+
+class HashingUploadHandler(FileUploadHandler):
+    """
+    SHA-256 of each uploaded file, computed chunk by chunk as it arrives
+
+    Sits in front of Django's regular handlers and passes every chunk on
+    unchanged, so the bytes are hashed without a second pass over the file.
+    Digests end up in ``request.upload_digests`` keyed by form field name.
+    """
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self._hash = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self._hash.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        if not hasattr(self.request, 'upload_digests'):
+            self.request.upload_digests = {}
+        self.request.upload_digests[self.field_name] = self._hash.hexdigest()
+        # Let the next handler build the actual file object
+        return None
+
+
+def upload_digest(request, field_name: str, upload: UploadedFile) -> str:
+    """Streamed digest of an upload, hashing the file now if the handler missed it"""
+    digest = getattr(request, 'upload_digests', {}).get(field_name)
+    if digest:
+        return digest
+    hasher = hashlib.sha256()
+    for chunk in upload.chunks():
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+REUSE_FIELDS = (
+    'public_id', 'image', 'training_image', 'thumbnail', 'image_hash', 'model_version', 'animal_type', 'animal_type_confidence',
+    'predicted_breed_name', 'breed_confidence', 'top_predictions', 'gradcam_digest',
+)
+
+
+def find_reusable_prediction(image_hash: str, model_version: str) -> Optional[Prediction]:
+    """Earliest prediction of the same image bytes by the same model, if any"""
+    pending = prediction_buffer.find(image_hash, model_version)
+    if pending is not None:
+        return pending
+    return (
+        Prediction.objects.filter(image_hash=image_hash, model_version=model_version)
+        .only(*REUSE_FIELDS)
+        .order_by('pk')
+        .first()
+    )
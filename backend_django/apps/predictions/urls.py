@@ -12,4 +12,7 @@ urlpatterns = [
     path('model-info/', views.ModelInfoView.as_view(), name='model-info'),
     path('<int:pk>/', views.PredictionDetailView.as_view(), name='prediction-detail'),
     path('<int:pk>/feedback/', views.PredictionFeedbackView.as_view(), name='prediction-feedback'),
+    path('<uuid:public_id>/', views.PredictionDetailView.as_view(), name='prediction-detail-public'),
+    path('<uuid:public_id>/feedback/', views.PredictionFeedbackView.as_view(), name='prediction-feedback-public'),
+    path('<uuid:public_id>/gradcam/', views.PredictionGradCamView.as_view(), name='prediction-gradcam'),
 ]
@@ -8,21 +8,36 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.throttling import UserRateThrottle
-from django.db.models import Avg, Count
-from django.db.models.functions import TruncDate
+from django.db import transaction
 from django.conf import settings
+from django.urls import reverse
+from django.http import Http404, HttpResponse
 from PIL import Image
+import base64
 import io
 
+from .blobstore import gradcam_store
+from .buffer import prediction_buffer
+from .derivatives import derivative_names, derivatives_stored, original_name, stage_upload
 from .models import Prediction
+from .rollups import prediction_stats, record_feedback_change
 from .serializers import (
     PredictionSerializer,
     PredictionCreateSerializer,
     PredictionFeedbackSerializer,
     PredictionHistorySerializer
 )
-from .services import ModelService, model_service
-from apps.breeds.models import Breed
+from .services import InferenceUnavailable, ModelService, inference_executor, model_service
+from .tasks import (
+    process_prediction_images,
+    render_gradcam_png,
+    render_prediction_gradcam,
+)
+from .uploads import HashingUploadHandler, find_reusable_prediction, upload_digest
+from apps.analytics.tasks import log_user_activity
+from apps.breeds.services import breed_resolver
+from apps.core.columns import SerializerColumnsMixin
+from apps.core.pagination import KeysetPagination
 
 
 class PredictionThrottle(UserRateThrottle):
@@ -37,12 +52,20 @@ class PredictView(views.APIView):
     1. Animal type (cattle vs buffalo)
     2. Specific breed identification
     
-    Optionally includes Grad-CAM visualization
+    Optionally queues a Grad-CAM visualization. Uploads are hashed as they
+    stream in; an image already predicted by the current model reuses that
+    result instead of running inference again. Image storage, Grad-CAM and
+    analytics run as background tasks after the response.
     """
     parser_classes = [MultiPartParser, FormParser]
     permission_classes = [AllowAny]
     throttle_classes = [PredictionThrottle]
     
+    def initial(self, request, *args, **kwargs):
+        # Must be installed before anything reads the request body
+        request.upload_handlers.insert(0, HashingUploadHandler(request._request))
+        super().initial(request, *args, **kwargs)
+    
     def post(self, request):
         serializer = PredictionCreateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -66,78 +89,139 @@ class PredictView(views.APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        try:
-            # Open image
-            image = Image.open(image_file).convert('RGB')
-        except Exception:
-            return Response(
-                {'error': 'Invalid image file'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        image_hash = upload_digest(request, 'image', image_file)
+        source = find_reusable_prediction(image_hash, model_service.version)
         
-        # Run prediction
-        try:
-            result = model_service.predict(image, include_gradcam=include_gradcam)
-        except Exception as e:
-            return Response(
-                {'error': f'Prediction failed: {str(e)}'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+        if source is not None:
+            result = self._reused_result(source)
+        else:
+            try:
+                # Open image
+                image = Image.open(image_file).convert('RGB')
+            except Exception:
+                return Response(
+                    {'error': 'Invalid image file'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            # Run prediction on the bounded inference pool
+            try:
+                result = inference_executor.run(model_service.predict, image)
+            except InferenceUnavailable as e:
+                response = Response(
+                    {'error': f'{e}, please retry shortly', 'retry_after': e.retry_after},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE
+                )
+                response['Retry-After'] = str(e.retry_after)
+                return response
+            except Exception as e:
+                return Response(
+                    {'error': f'Prediction failed: {str(e)}'},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
         
-        # Try to find breed in database
-        breed = Breed.objects.filter(
-            name__iexact=result['breed']
-        ).first() or Breed.objects.filter(
-            breed_id__iexact=result['breed'].lower().replace(' ', '_')
-        ).first()
+        # Resolve the predicted label against the in-process breed table
+        resolved = breed_resolver.resolve(result['breed'])
+        breed_pk, breed_info = resolved if resolved else (None, None)
+        if not include_breed_info:
+            breed_info = None
         
-        # Get breed info if requested
-        breed_info = None
-        if include_breed_info and breed:
-            from apps.breeds.serializers import BreedDetailSerializer
-            breed_info = BreedDetailSerializer(breed).data
+        # Images are written by a background task; their names are known now.
+        # A reused row shares the source's files, unless the source's image
+        # task never produced them; then this upload's bytes are processed.
+        suffix = self._suffix(image_file)
+        process_images = source is None or not derivatives_stored(image_hash)
+        if process_images:
+            image_name = (source.image.name if source else '') or original_name(image_hash, suffix) or ''
+            derived = derivative_names(image_hash)
+        else:
+            image_name = source.image.name
+            derived = {'training': source.training_image.name, 'thumbnail': source.thumbnail.name}
+        gradcam_digest = result.get('gradcam_digest', '')
         
-        # Save prediction
-        prediction = Prediction.objects.create(
+        prediction = Prediction(
             user=request.user if request.user.is_authenticated else None,
             animal_type=result['animal_type'],
             animal_type_confidence=result['animal_type_confidence'],
-            predicted_breed=breed,
+            predicted_breed_id=breed_pk,
             predicted_breed_name=result['breed'],
             breed_confidence=result['breed_confidence'],
             top_predictions=result['top_predictions'],
-            image=image_file,
-            gradcam_image=result.get('gradcam_image', ''),
-            gradcam_enabled=include_gradcam,
+            image=image_name,
+            training_image=derived['training'],
+            thumbnail=derived['thumbnail'],
+            image_hash=image_hash,
+            gradcam_digest=gradcam_digest,
+            gradcam_enabled=bool(gradcam_digest),
             processing_time_ms=result['processing_time_ms'],
+            model_version=model_service.version,
+            reused=source is not None,
             ip_address=self._get_client_ip(request),
             user_agent=request.META.get('HTTP_USER_AGENT', '')[:500]
         )
-        
-        # Update user prediction count
-        if request.user.is_authenticated:
-            request.user.total_predictions += 1
-            request.user.save(update_fields=['total_predictions'])
+        prediction_buffer.add(prediction)
+        self._schedule_tasks(request, prediction, image_file, suffix, process_images, include_gradcam)
         
         response_data = {
             'success': True,
-            'prediction_id': prediction.id,
+            'prediction_id': str(prediction.public_id),
             'animal_type': result['animal_type'],
             'animal_type_confidence': result['animal_type_confidence'],
             'breed': result['breed'],
             'breed_confidence': result['breed_confidence'],
             'top_predictions': result['top_predictions'],
             'processing_time_ms': result['processing_time_ms'],
+            'reused': source is not None,
+            # Rendered in the background when requested, otherwise on first fetch
+            'gradcam_url': request.build_absolute_uri(
+                reverse('prediction-gradcam', kwargs={'public_id': prediction.public_id})
+            ),
         }
         
-        if include_gradcam and result.get('gradcam_image'):
-            response_data['gradcam_image'] = result['gradcam_image']
-        
         if breed_info:
             response_data['breed_info'] = breed_info
         
         return Response(response_data)
     
+    @staticmethod
+    def _reused_result(source):
+        """Prediction result of an earlier row, shaped like model_service.predict"""
+        return {
+            'animal_type': source.animal_type,
+            'animal_type_confidence': source.animal_type_confidence,
+            'breed': source.predicted_breed_name,
+            'breed_confidence': source.breed_confidence,
+            'top_predictions': source.top_predictions,
+            'processing_time_ms': 0,
+            'gradcam_digest': source.gradcam_digest,
+        }
+    
+    def _schedule_tasks(self, request, prediction, image_file, suffix, process_images, include_gradcam):
+        public_id = str(prediction.public_id)
+        gradcam_for = public_id if include_gradcam and not prediction.gradcam_digest else None
+        if process_images:
+            staged_path = stage_upload(prediction.image_hash, image_file, suffix)
+            process_prediction_images.delay(prediction.image_hash, suffix, staged_path, gradcam_for)
+        elif gradcam_for:
+            render_prediction_gradcam.delay(gradcam_for)
+        
+        if request.user.is_authenticated:
+            log_user_activity.delay(
+                request.user.pk,
+                'prediction',
+                prediction_public_id=public_id,
+                breed_id=prediction.predicted_breed_id,
+                metadata={'breed': prediction.predicted_breed_name, 'reused': prediction.reused}
+            )
+    
+    @staticmethod
+    def _suffix(image_file):
+        return {
+            'image/jpeg': '.jpg',
+            'image/png': '.png',
+            'image/webp': '.webp',
+        }.get(image_file.content_type, '')
+    
     def _get_client_ip(self, request):
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
         if x_forwarded_for:
@@ -145,34 +229,135 @@ class PredictView(views.APIView):
         return request.META.get('REMOTE_ADDR')
 
 
-class PredictionDetailView(generics.RetrieveAPIView):
+class PredictionLookupMixin:
+    """
+    Look predictions up by integer id or public UUID
+
+    A prediction that is still waiting in the write buffer is flushed
+    first, so clients can use the id from the predict response right away.
+    The buffer is per process: with several workers, a lookup served by
+    another worker than the predict request can 404 until the row is
+    flushed, for up to PREDICTION_BUFFER FLUSH_INTERVAL seconds.
+    """
+    
+    def get_object(self):
+        if 'public_id' in self.kwargs:
+            self.lookup_field = 'public_id'
+        try:
+            return super().get_object()
+        except Http404:
+            public_id = self.kwargs.get('public_id')
+            if public_id is None or not prediction_buffer.is_pending(public_id):
+                raise
+            prediction_buffer.flush()
+            return super().get_object()
+
+
+class PredictionDetailView(PredictionLookupMixin, SerializerColumnsMixin, generics.RetrieveAPIView):
     """
     Get details of a specific prediction
     """
-    queryset = Prediction.objects.all()
+    queryset = Prediction.objects.prefetch_related('predicted_breed__native_states')
     serializer_class = PredictionSerializer
     permission_classes = [AllowAny]
+    query_budget = 4
 
 
-class PredictionFeedbackView(generics.UpdateAPIView):
+class PredictionFeedbackView(PredictionLookupMixin, generics.UpdateAPIView):
     """
     Submit feedback for a prediction
     """
-    queryset = Prediction.objects.all()
+    queryset = Prediction.objects.defer('gradcam_image')
     serializer_class = PredictionFeedbackSerializer
     permission_classes = [AllowAny]
     http_method_names = ['patch']
+    
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            # Lock the row so concurrent feedback moves the rollups once each
+            old_feedback = Prediction.objects.select_for_update().filter(
+                pk=serializer.instance.pk
+            ).values_list('user_feedback', flat=True).get()
+            prediction = serializer.save()
+            record_feedback_change(prediction, old_feedback)
+        if self.request.user.is_authenticated:
+            log_user_activity.delay(
+                self.request.user.pk,
+                'feedback',
+                prediction_public_id=str(prediction.public_id),
+                metadata={'feedback': prediction.user_feedback}
+            )
 
 
-class UserPredictionHistoryView(generics.ListAPIView):
+class PredictionGradCamView(PredictionLookupMixin, generics.GenericAPIView):
+    """
+    Grad-CAM heatmap PNG for a prediction
+    
+    Rendered from the stored upload on first request and kept in the
+    content-addressed blob store; later requests only read the blob.
+    """
+    queryset = Prediction.objects.only(
+        'id', 'public_id', 'image', 'training_image', 'animal_type',
+        'predicted_breed_name', 'gradcam_digest'
+    )
+    permission_classes = [AllowAny]
+    
+    def get(self, request, *args, **kwargs):
+        prediction = self.get_object()
+        digest = prediction.gradcam_digest
+        
+        if digest and f'"{digest}"' in request.META.get('HTTP_IF_NONE_MATCH', ''):
+            response = HttpResponse(status=304)
+        else:
+            png = gradcam_store.get(digest) if digest else None
+            if png is None:
+                try:
+                    png = self._legacy_or_render(prediction)
+                except InferenceUnavailable as e:
+                    response = Response(
+                        {'error': f'{e}, please retry shortly', 'retry_after': e.retry_after},
+                        status=status.HTTP_503_SERVICE_UNAVAILABLE
+                    )
+                    response['Retry-After'] = str(e.retry_after)
+                    return response
+                if png is None:
+                    return Response(
+                        {'error': 'Grad-CAM is not available for this prediction'},
+                        status=status.HTTP_404_NOT_FOUND
+                    )
+                digest = gradcam_store.put(png)
+                Prediction.objects.filter(pk=prediction.pk).update(
+                    gradcam_digest=digest, gradcam_image='', gradcam_enabled=True
+                )
+            response = HttpResponse(png, content_type='image/png')
+        
+        # Content-addressed: a digest never changes its bytes
+        response['ETag'] = f'"{digest}"'
+        response['Cache-Control'] = 'public, max-age=31536000, immutable'
+        return response
+    
+    def _legacy_or_render(self, prediction):
+        if prediction.gradcam_image:
+            # Row not yet moved by migrate_gradcam_blobs
+            return base64.b64decode(prediction.gradcam_image)
+        return render_gradcam_png(prediction)
+
+
+class UserPredictionHistoryView(SerializerColumnsMixin, generics.ListAPIView):
     """
     Get prediction history for the authenticated user
+    
+    Cursor-paginated newest first, so deep pages cost the same as the first
+    one; pass the ``next`` link back to continue.
     """
+    queryset = Prediction.objects.all()
     serializer_class = PredictionHistorySerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    query_budget = 3
     
     def get_queryset(self):
-        return Prediction.objects.filter(user=self.request.user)
+        return super().get_queryset().filter(user=self.request.user)
 
 
 class PredictionStatsView(views.APIView):
@@ -182,46 +367,8 @@ class PredictionStatsView(views.APIView):
     permission_classes = [AllowAny]
     
     def get(self, request):
-        predictions = Prediction.objects.all()
-        
-        # Basic stats
-        total = predictions.count()
-        cattle_count = predictions.filter(animal_type='cattle').count()
-        buffalo_count = predictions.filter(animal_type='buffalo').count()
-        avg_confidence = predictions.aggregate(avg=Avg('breed_confidence'))['avg'] or 0
-        
-        # Feedback stats
-        feedback_stats = dict(predictions.values('user_feedback').annotate(
-            count=Count('id')
-        ).values_list('user_feedback', 'count'))
-        
-        # Top predicted breeds
-        top_breeds = list(predictions.values('predicted_breed_name').annotate(
-            count=Count('id')
-        ).order_by('-count')[:10])
-        
-        # Predictions over time (last 30 days)
-        from django.utils import timezone
-        from datetime import timedelta
-        
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        predictions_by_date = predictions.filter(
-            created_at__gte=thirty_days_ago
-        ).annotate(
-            date=TruncDate('created_at')
-        ).values('date').annotate(
-            count=Count('id')
-        ).order_by('date')
-        
-        return Response({
-            'total_predictions': total,
-            'cattle_predictions': cattle_count,
-            'buffalo_predictions': buffalo_count,
-            'average_confidence': avg_confidence,
-            'feedback_stats': feedback_stats,
-            'top_predicted_breeds': top_breeds,
-            'predictions_over_time': list(predictions_by_date)
-        })
+        # Served from the rollup table, so cost grows with days, not rows
+        return Response(prediction_stats(days=30))
 
 
 class ModelInfoView(views.APIView):
@@ -237,7 +384,12 @@ class ModelInfoView(views.APIView):
             'animal_classes': model_service.animal_classes,
             'cattle_breeds': model_service.cattle_breeds,
             'buffalo_breeds': model_service.buffalo_breeds,
-            'version': '2.0.0',
+            'inference': {
+                'workers': inference_executor.workers,
+                'capacity': inference_executor.capacity,
+                'pending': inference_executor.pending,
+            },
+            'version': model_service.version,
             'features': [
                 'Two-stage classification',
                 'Grad-CAM visualization',
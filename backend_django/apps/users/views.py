@@ -115,9 +115,10 @@ class FavoriteBreedListView(generics.ListCreateAPIView):
     """
     serializer_class = UserFavoriteBreedSerializer
     permission_classes = [IsAuthenticated]
+    query_budget = 5
     
     def get_queryset(self):
-        return UserFavoriteBreed.objects.filter(user=self.request.user)
+        return UserFavoriteBreed.objects.filter(user=self.request.user).select_related('breed')
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -131,7 +132,7 @@ class FavoriteBreedDetailView(generics.RetrieveDestroyAPIView):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        return UserFavoriteBreed.objects.filter(user=self.request.user)
+        return UserFavoriteBreed.objects.filter(user=self.request.user).select_related('breed')
 
 
 class SavedComparisonListView(generics.ListCreateAPIView):
@@ -140,9 +141,10 @@ class SavedComparisonListView(generics.ListCreateAPIView):
     """
     serializer_class = UserComparisonSerializer
     permission_classes = [IsAuthenticated]
+    query_budget = 5
     
     def get_queryset(self):
-        return UserComparison.objects.filter(user=self.request.user)
+        return UserComparison.objects.filter(user=self.request.user).select_related('breed_1', 'breed_2')
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -156,7 +158,7 @@ class SavedComparisonDetailView(generics.RetrieveDestroyAPIView):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        return UserComparison.objects.filter(user=self.request.user)
+        return UserComparison.objects.filter(user=self.request.user).select_related('breed_1', 'breed_2')
 
 
 class UserStatsView(views.APIView):
@@ -164,6 +166,7 @@ class UserStatsView(views.APIView):
     Get user statistics
     """
     permission_classes = [IsAuthenticated]
+    query_budget = 8
     
     def get(self, request):
         user = request.user
@@ -183,9 +186,9 @@ class UserStatsView(views.APIView):
             'total_predictions': predictions.count(),
             'total_favorites': favorites.count(),
             'total_comparisons': comparisons.count(),
-            'recent_predictions': predictions[:5].values(
-                'id', 'predicted_breed__name', 'confidence', 'created_at'
-            ),
+            'recent_predictions': list(predictions[:5].values(
+                'id', 'predicted_breed__name', 'breed_confidence', 'created_at'
+            )),
             'top_predicted_breeds': list(breed_counts),
             'member_since': user.date_joined,
         })
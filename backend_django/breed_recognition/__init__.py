@@ -1 +1,9 @@
 # Indian Cattle & Buffalo Breed Recognition - Django Backend
+
+# Celery is optional; tasks fall back to local queues without it
+try:
+    from .celery import app as celery_app
+except ImportError:
+    celery_app = None
+
+__all__ = ('celery_app',)
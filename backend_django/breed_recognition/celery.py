@@ -0,0 +1,16 @@
+"""
+Celery application for the Django backend
+
+Only used when TASK_QUEUE BACKEND is 'celery'; start workers with
+``celery -A breed_recognition worker``.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'breed_recognition.settings')
+
+app = Celery('breed_recognition')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
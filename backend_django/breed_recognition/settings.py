@@ -42,6 +42,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'apps.core.query_metrics.QueryMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -128,6 +129,15 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Content-addressed Grad-CAM heatmaps; any Django storage backend works
+GRADCAM_STORAGE = {
+    'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    'OPTIONS': {
+        'location': MEDIA_ROOT / 'gradcam',
+        'base_url': MEDIA_URL + 'gradcam/',
+    },
+}
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -192,6 +202,7 @@ SPECTACULAR_SETTINGS = {
 # ML Model Settings
 ML_MODELS_PATH = BASE_DIR.parent / 'backend' / 'ml_models'
 BREED_DATA_PATH = BASE_DIR.parent / 'data' / 'breed_info.json'
+REGION_CENTROIDS_PATH = BASE_DIR.parent / 'data' / 'region_centroids.json'
 
 ML_SETTINGS = {
     'STAGE1_MODEL': 'cattle_buffalo_classifier.pth',
@@ -200,9 +211,39 @@ ML_SETTINGS = {
     'IMAGE_SIZE': (224, 224),
     'MAX_IMAGE_SIZE': 10 * 1024 * 1024,  # 10MB
     'ALLOWED_EXTENSIONS': ['jpg', 'jpeg', 'png', 'webp'],
+    # Recorded on predictions; identical uploads reuse results per version
+    'MODEL_VERSION': os.environ.get('MODEL_VERSION', '2.0.0'),
+    # Bounded inference pool: requests beyond workers + queue get a 503
+    'INFERENCE_WORKERS': int(os.environ.get('INFERENCE_WORKERS', 2)),
+    'INFERENCE_QUEUE_SIZE': int(os.environ.get('INFERENCE_QUEUE_SIZE', 8)),
+    'INFERENCE_TIMEOUT': float(os.environ.get('INFERENCE_TIMEOUT', 30)),
+}
+
+# Stored copies of prediction uploads: a training-size image and a thumbnail
+# are always kept, the original only when KEEP_ORIGINALS is on and for
+# ORIGINAL_RETENTION_DAYS (see prune_prediction_originals)
+PREDICTION_IMAGES = {
+    'TRAINING_SIZE': 256,
+    'THUMBNAIL_SIZE': 96,
+    'KEEP_ORIGINALS': os.environ.get('PREDICTION_KEEP_ORIGINALS', 'False').lower() == 'true',
+    'ORIGINAL_RETENTION_DAYS': int(os.environ.get('PREDICTION_ORIGINAL_RETENTION_DAYS', 30)),
+    # Uploads wait here for the image task; Celery workers must share it
+    'STAGING_DIR': BASE_DIR / 'spool' / 'uploads',
 }
 
-# Caching
+# Predictions are persisted in batches off the request path
+PREDICTION_BUFFER = {
+    'ENABLED': os.environ.get('PREDICTION_BUFFER_ENABLED', 'True').lower() == 'true',
+    'BATCH_SIZE': int(os.environ.get('PREDICTION_BUFFER_BATCH_SIZE', 50)),
+    'FLUSH_INTERVAL': float(os.environ.get('PREDICTION_BUFFER_FLUSH_INTERVAL', 2.0)),
+    # Rows kept in memory while the database is down; older ones are spooled
+    'MAX_PENDING': int(os.environ.get('PREDICTION_BUFFER_MAX_PENDING', 10000)),
+    'SPOOL_DIR': BASE_DIR / 'spool' / 'predictions',
+}
+
+# Caching. LocMemCache is private to each process: analytics snapshot locks
+# and query metric totals are then per worker. Run several workers with a
+# shared backend (Redis, below); `manage.py check --deploy` warns otherwise
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
@@ -210,6 +251,22 @@ CACHES = {
     }
 }
 
+# Rendered map layer blobs are keyed by data version; this only bounds memory use
+MAP_LAYERS_CACHE_TIMEOUT = int(os.environ.get('MAP_LAYERS_CACHE_TIMEOUT', 3600))
+
+# Hours a day's analytics stay open for late-written predictions before
+# its DailyStats row is final
+ANALYTICS_SETTLE_HOURS = int(os.environ.get('ANALYTICS_SETTLE_HOURS', 48))
+
+# Public analytics responses: fresh for TTL seconds, then served stale for
+# up to STALE_TTL more while one background task recomputes them. "One" holds
+# across processes only with a shared cache; with LocMemCache every worker
+# computes each missing or stale snapshot itself
+ANALYTICS_SNAPSHOTS = {
+    'TTL': int(os.environ.get('ANALYTICS_SNAPSHOT_TTL', 60)),
+    'STALE_TTL': int(os.environ.get('ANALYTICS_SNAPSHOT_STALE_TTL', 600)),
+}
+
 # For production, use Redis:
 # CACHES = {
 #     'default': {
@@ -218,6 +275,28 @@ CACHES = {
 #     }
 # }
 
+# SQL query metrics: X-Query-* headers (debug by default), per-endpoint
+# totals at /api/v1/query-metrics/ (summed across workers only with a shared
+# cache; otherwise each reflects the worker that served it), and view query
+# budgets. Tests turn
+# ENFORCE_BUDGETS on so a view over its budget fails instead of warning
+QUERY_METRICS = {
+    'ENABLED': os.environ.get('QUERY_METRICS_ENABLED', 'True').lower() == 'true',
+    'HEADERS': os.environ.get('QUERY_METRICS_HEADERS', str(DEBUG)).lower() == 'true',
+    'ENFORCE_BUDGETS': os.environ.get('QUERY_BUDGETS_ENFORCE', 'False').lower() == 'true',
+    'FLUSH_INTERVAL': float(os.environ.get('QUERY_METRICS_FLUSH_INTERVAL', 10.0)),
+}
+
+# Background tasks: 'thread' (in-process), 'database' (QueuedTask table,
+# also served by `manage.py run_tasks`), 'celery' or 'eager' (inline, tests)
+TASK_QUEUE = {
+    'BACKEND': os.environ.get('TASK_BACKEND', 'thread'),
+    'WORKERS': int(os.environ.get('TASK_WORKERS', 2)),
+    'POLL_INTERVAL': float(os.environ.get('TASK_POLL_INTERVAL', 1.0)),
+    # Seconds before a 'database' job left running by a dead worker is retried
+    'LEASE_TIMEOUT': float(os.environ.get('TASK_LEASE_TIMEOUT', 600)),
+}
+
 # Celery Configuration (for async tasks)
 CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
@@ -226,6 +305,15 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# Periodic jobs for `celery -A breed_recognition beat`; without Celery,
+# run `python manage.py aggregate_stats` from cron at the same interval
+CELERY_BEAT_SCHEDULE = {
+    'aggregate-analytics': {
+        'task': 'apps.analytics.tasks.aggregate_recent_stats',
+        'schedule': float(os.environ.get('ANALYTICS_AGGREGATE_INTERVAL', 900)),
+    },
+}
+
 # Logging
 LOGGING = {
     'version': 1,
@@ -29,9 +29,13 @@ export default function ResultCard({ result, imagePreview }) {
     breed_hindi,
     top_predictions,
     gradcam_image,
+    gradcam_url,
     breed_info
   } = result;
 
+  // Inline base64 from older APIs; otherwise the URL renders on first fetch
+  const gradcamSrc = gradcam_image || gradcam_url;
+
   const speakResult = () => {
     const lang = i18n.language;
     let text;
@@ -96,12 +100,13 @@ export default function ResultCard({ result, imagePreview }) {
         {/* Image with Grad-CAM toggle */}
         <div className="relative mb-6 rounded-xl overflow-hidden">
           <img
-            src={showGradcam && gradcam_image ? gradcam_image : imagePreview}
+            src={showGradcam && gradcamSrc ? gradcamSrc : imagePreview}
             alt="Analyzed"
+            onError={() => setShowGradcam(false)}
             className="w-full h-48 md:h-64 object-cover"
           />
           
-          {gradcam_image && (
+          {gradcamSrc && (
             <button
               onClick={() => setShowGradcam(!showGradcam)}
               className="absolute bottom-3 right-3 flex items-center space-x-2 px-3 py-2 bg-black/70 text-white rounded-lg text-sm hover:bg-black/80 transition-colors"